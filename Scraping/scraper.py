@@ -0,0 +1,621 @@
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+import pandas as pd
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+except ImportError:  # lxml opsional, fallback ke BeautifulSoup
+    lxml = None
+
+SELECTOR_LISTING = "article.listing"
+KOLOM = ["Judul", "Harga", "Tahun", "Link"]
+KOLOM_INKREMENTAL = KOLOM + ["First_Seen", "Last_Seen", "Status"]
+
+
+# ====== Parsing halaman ======
+# Cek cepat sebelum parsing: <article> dengan kelas "listing" (atribut class boleh dikutip atau tidak)
+_ADA_LISTING = re.compile(
+    r"<article\b[^>]*\bclass\s*=\s*(?:[\"'][^\"']*?)?(?<![\w-])listing(?![\w-])", re.IGNORECASE
+)
+_XPATH_KELAS = "contains(concat(' ', normalize-space(@class), ' '), ' {} ')"
+
+
+def _teks(el):
+    # Sama dengan get_text(strip=True) milik BeautifulSoup: tiap potongan teks di-strip lalu digabung
+    return "".join(t.strip() for t in el.itertext())
+
+
+def _buat_row(title, link, price):
+    # Tahun dari judul
+    match = re.match(r"(\d{4})", title)
+    tahun = match.group(1) if match else "N/A"
+    return {
+        "Judul": title,
+        "Harga": price,
+        "Tahun": tahun,
+        "Link": link
+    }
+
+
+def _parse_lxml(html):
+    root = lxml.html.fromstring(html)
+    rows = []
+    for article in root.xpath("//article[" + _XPATH_KELAS.format("listing") + "]"):
+        title_tag = article.xpath(".//h2[" + _XPATH_KELAS.format("listing__title") + "]")
+        a_tag = title_tag[0].xpath(".//a") if title_tag else []
+        a_tag = a_tag[0] if a_tag else None
+
+        # Judul & Link
+        title = _teks(a_tag) if a_tag is not None else "N/A"
+        link = a_tag.get("href") if a_tag is not None and a_tag.get("href") is not None else "N/A"
+
+        # Harga
+        price_tag = article.xpath(".//div[" + _XPATH_KELAS.format("listing__price") + "]")
+        price = _teks(price_tag[0]) if price_tag else "N/A"
+
+        rows.append(_buat_row(title, link, price))
+    return rows
+
+
+def _parse_bs4(html):
+    # Hanya elemen <article class="listing"> yang di-parse, sisa halaman dilewati
+    soup = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("article"))
+    articles = soup.find_all("article", class_="listing")
+
+    rows = []
+    for article in articles:
+        title_tag = article.find("h2", class_="listing__title")
+        a_tag = title_tag.find("a") if title_tag else None
+
+        # Judul & Link
+        title = a_tag.get_text(strip=True) if a_tag else "N/A"
+        link = a_tag["href"] if a_tag and a_tag.has_attr("href") else "N/A"
+
+        # Harga
+        price_tag = article.find("div", class_="listing__price")
+        price = price_tag.get_text(strip=True) if price_tag else "N/A"
+
+        rows.append(_buat_row(title, link, price))
+    return rows
+
+
+def parse_listing(html):
+    if not _ADA_LISTING.search(html):
+        return []
+    if lxml is not None:
+        return _parse_lxml(html)
+    return _parse_bs4(html)
+
+
+# ====== Fetcher Selenium ======
+class SeleniumFetcher:
+    # Satu browser headless per worker. Menunggu selector listing muncul, bukan sleep tetap.
+    def __init__(self, wait_timeout=15):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+
+        options = Options()
+        options.add_argument("--headless")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("user-agent=Mozilla/5.0")
+
+        self.driver = webdriver.Chrome(service=Service(), options=options)
+        self.wait_timeout = wait_timeout
+
+    def fetch(self, url):
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        self.driver.get(url)
+        try:
+            WebDriverWait(self.driver, self.wait_timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, SELECTOR_LISTING))
+            )
+        except TimeoutException:
+            # Halaman tanpa listing (mis. melewati halaman terakhir) tetap dikembalikan apa adanya;
+            # crawl menganggap halaman kosong sebelum halaman terakhir sebagai gagal dan mencobanya lagi
+            pass
+        return self.driver.page_source
+
+    def close(self):
+        self.driver.quit()
+
+
+# ====== Fetcher HTTP ======
+class HTTPFetcher:
+    # Session requests dengan koneksi keep-alive yang dipakai ulang antar halaman
+    def __init__(self, timeout=20, pool_size=8):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "User-Agent": "Mozilla/5.0",
+            "Accept": "text/html,application/xhtml+xml",
+            "Accept-Language": "id-ID,id;q=0.9,en;q=0.8",
+        })
+        self.timeout = timeout
+
+    def fetch(self, url):
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def close(self):
+        self.session.close()
+
+
+class AutoFetcher:
+    # HTTP biasa lebih dulu; browser hanya dipakai jika HTML mentah tidak berisi listing
+    # (halaman yang butuh JavaScript). Browser dibuat saat pertama kali dibutuhkan.
+    def __init__(self, selenium_factory=SeleniumFetcher, **http_kwargs):
+        self.http = HTTPFetcher(**http_kwargs)
+        self.selenium_factory = selenium_factory
+        self.selenium = None
+        self.fallback = 0
+
+    def fetch(self, url):
+        html = self.http.fetch(url)
+        if _ADA_LISTING.search(html):
+            return html
+        if self.selenium is None:
+            self.selenium = self.selenium_factory()
+        self.fallback += 1
+        return self.selenium.fetch(url)
+
+    def close(self):
+        self.http.close()
+        if self.selenium is not None:
+            self.selenium.close()
+
+
+FETCHER = {
+    "auto": AutoFetcher,
+    "http": HTTPFetcher,
+    "selenium": SeleniumFetcher,
+}
+
+
+# ====== Checkpoint per halaman ======
+class Checkpoint:
+    # File JSONL append-only: satu baris per halaman yang rows-nya sudah ditulis ke chunk,
+    # sehingga crash di tengah jalan bisa dilanjutkan tanpa mengulang halaman yang sudah berhasil.
+    def __init__(self, path):
+        self.path = path
+        self.pages = {}
+        # Checkpoint format lama menyimpan rows langsung di dalamnya
+        self.legacy = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        item = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Baris terakhir bisa terpotong jika proses mati saat menulis
+                        continue
+                    if "rows" in item:
+                        self.legacy[item["page"]] = item["rows"]
+                    else:
+                        self.pages[item["page"]] = item["chunk"]
+
+    def done(self, page):
+        return page in self.pages or page in self.legacy
+
+    def save(self, pages, chunk):
+        with self._lock:
+            baris = []
+            for page in pages:
+                self.pages[page] = chunk
+                baris.append(json.dumps({"page": page, "chunk": chunk}) + "\n")
+            if self.path:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.writelines(baris)
+
+    def chunks(self):
+        return {chunk for chunk in self.pages.values() if chunk}
+
+
+# ====== Output per chunk ======
+FORMAT_CHUNK = ("csv", "parquet")
+
+
+def _baca_chunk(path):
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    # dtype=str + tanpa NA default agar nilai seperti "N/A" tetap apa adanya
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def _tulis_atomik(df, path, tulis):
+    tmp = path + ".tmp"
+    tulis(df, tmp)
+    os.replace(tmp, path)
+
+
+class ChunkWriter:
+    # Rows ditampung per batch lalu ditulis sebagai file chunk baru (append-only) di folder
+    # <output>.parts/. Halaman baru dicatat di checkpoint setelah chunk-nya selesai ditulis,
+    # jadi memori terbatas pada satu batch dan crash hanya kehilangan batch yang belum ditulis.
+    def __init__(self, folder, checkpoint, batch_rows=1000, format="csv"):
+        if format not in FORMAT_CHUNK:
+            raise ValueError(f"Format chunk tidak dikenal: {format}")
+        self.folder = folder
+        self.checkpoint = checkpoint
+        self.batch_rows = batch_rows
+        self.format = format
+        self.buffer = []
+        self.buffer_pages = []
+        self.rows_written = 0
+        self._lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+        _hapus_chunk_yatim(folder, checkpoint)
+        nomor = [int(m.group(1)) for m in map(_NAMA_CHUNK.match, os.listdir(folder)) if m]
+        self.nomor = max(nomor, default=0)
+
+    def add(self, page, rows):
+        with self._lock:
+            self.buffer.extend({**row, "_page": page} for row in rows)
+            self.buffer_pages.append(page)
+            if len(self.buffer) >= self.batch_rows:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self.buffer_pages:
+            return
+        chunk = None
+        if self.buffer:
+            self.nomor += 1
+            chunk = f"part-{self.nomor:05d}.{self.format}"
+            df = pd.DataFrame(self.buffer, columns=KOLOM + ["_page"])
+            if self.format == "parquet":
+                _tulis_atomik(df, os.path.join(self.folder, chunk), lambda d, p: d.to_parquet(p, index=False))
+            else:
+                _tulis_atomik(df, os.path.join(self.folder, chunk), lambda d, p: d.to_csv(p, index=False))
+        self.checkpoint.save(self.buffer_pages, chunk)
+        self.rows_written += len(self.buffer)
+        self.buffer = []
+        self.buffer_pages = []
+
+
+_NAMA_CHUNK = re.compile(r"part-(\d+)\.(?:csv|parquet)$")
+
+
+def _hapus_chunk_yatim(folder, checkpoint):
+    # Chunk yang sudah ditulis tetapi halamannya belum tercatat di checkpoint (proses mati di
+    # antara keduanya) dibuang, karena halaman tersebut akan diambil ulang.
+    dipakai = checkpoint.chunks()
+    for nama in os.listdir(folder):
+        if nama.endswith(".tmp") or (_NAMA_CHUNK.match(nama) and nama not in dipakai):
+            os.remove(os.path.join(folder, nama))
+
+
+def merge_chunks(output, folder=None, checkpoint_path=None):
+    # Gabungkan semua chunk menjadi dataset final, urut per halaman seperti hasil scraping berurutan
+    folder = folder or output + ".parts"
+    checkpoint = Checkpoint(checkpoint_path if checkpoint_path is not None else output + ".checkpoint.jsonl")
+    if not os.path.isdir(folder):
+        df = pd.DataFrame(columns=KOLOM)
+    else:
+        if checkpoint.pages:
+            _hapus_chunk_yatim(folder, checkpoint)
+        files = sorted(nama for nama in os.listdir(folder) if _NAMA_CHUNK.match(nama))
+        frames = [_baca_chunk(os.path.join(folder, nama)) for nama in files]
+        if frames:
+            df = pd.concat(frames, ignore_index=True)
+            # Sort stabil: rows satu halaman selalu berada di chunk yang sama dan sudah berurutan
+            df["_page"] = df["_page"].astype(int)
+            df = df.sort_values("_page", kind="stable")[KOLOM].reset_index(drop=True)
+        else:
+            df = pd.DataFrame(columns=KOLOM)
+    _tulis_atomik(df, output, lambda d, p: d.to_csv(p, index=False))
+    return df
+
+
+class _Throughput:
+    # Laju scraping (halaman/detik, listing/detik) sejak crawl dimulai
+    def __init__(self):
+        self.mulai = time.perf_counter()
+        self.pages = 0
+        self.rows = 0
+        self._lock = threading.Lock()
+
+    def tambah(self, rows):
+        with self._lock:
+            self.pages += 1
+            self.rows += rows
+
+    def durasi(self):
+        return max(time.perf_counter() - self.mulai, 1e-9)
+
+    def teks(self):
+        durasi = self.durasi()
+        return f"{self.pages / durasi:.2f} halaman/detik, {self.rows / durasi:.1f} listing/detik"
+
+
+# ====== Engine ======
+class _FetcherPool:
+    # Satu fetcher per thread worker, dibuat saat pertama kali dibutuhkan
+    def __init__(self, fetcher_factory):
+        self.fetcher_factory = fetcher_factory
+        self.local = threading.local()
+        self.fetchers = []
+        self.lock = threading.Lock()
+
+    def get(self):
+        if not hasattr(self.local, "fetcher"):
+            self.local.fetcher = self.fetcher_factory()
+            with self.lock:
+                self.fetchers.append(self.local.fetcher)
+        return self.local.fetcher
+
+    def close(self):
+        for fetcher in self.fetchers:
+            try:
+                fetcher.close()
+            except Exception:
+                pass
+
+
+class HalamanKosong(Exception):
+    pass
+
+
+def _fetch_rows(pool, url, max_retries, backoff, wajib_ada=False):
+    # wajib_ada: halaman tanpa listing (mis. browser timeout menunggu selector) dianggap gagal
+    for percobaan in range(1, max_retries + 1):
+        try:
+            rows = parse_listing(pool.get().fetch(url))
+            if wajib_ada and not rows:
+                raise HalamanKosong(f"tidak ada listing di {url}")
+            return rows
+        except Exception:
+            if percobaan == max_retries:
+                raise
+            # Backoff eksponensial + jitter sebelum mencoba lagi
+            time.sleep(backoff * (2 ** (percobaan - 1)) * (1 + random.random()))
+
+
+def crawl(base_url, total_pages, output, workers=4, checkpoint_path=None, max_retries=3,
+          backoff=2.0, fetcher_factory=SeleniumFetcher, start_page=1, batch_rows=1000,
+          chunk_format="csv", chunk_dir=None):
+    checkpoint = Checkpoint(checkpoint_path if checkpoint_path is not None else output + ".checkpoint.jsonl")
+    chunk_dir = chunk_dir or output + ".parts"
+    writer = ChunkWriter(chunk_dir, checkpoint, batch_rows=batch_rows, format=chunk_format)
+    if checkpoint.legacy:
+        # Rows dari checkpoint format lama dipindahkan ke chunk
+        for page in sorted(checkpoint.legacy):
+            writer.add(page, checkpoint.legacy[page])
+        writer.flush()
+    pages = [p for p in range(start_page, total_pages + 1) if not checkpoint.done(p)]
+    if len(pages) < total_pages - start_page + 1:
+        print(f"Melanjutkan dari checkpoint: {total_pages - start_page + 1 - len(pages)} halaman sudah selesai")
+
+    fetchers = _FetcherPool(fetcher_factory)
+    laju = _Throughput()
+
+    def proses(page):
+        try:
+            # Hanya halaman terakhir yang boleh kosong; halaman kosong lainnya tidak masuk checkpoint
+            rows = _fetch_rows(fetchers, base_url + str(page), max_retries, backoff,
+                               wajib_ada=page < total_pages)
+        except Exception as e:
+            return page, e
+        writer.add(page, rows)
+        laju.tambah(len(rows))
+        print(f"Halaman {page} selesai ({len(rows)} listing, {laju.teks()})")
+        return page, None
+
+    gagal = {}
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(proses, page) for page in pages]
+            for future in as_completed(futures):
+                page, err = future.result()
+                if err is not None:
+                    gagal[page] = err
+                    print(f"Gagal memproses halaman {page} setelah {max_retries} percobaan: {err}")
+    finally:
+        # Batch terakhir tetap ditulis walaupun crawl terhenti
+        writer.flush()
+        fetchers.close()
+    print(f"Scraping: {laju.pages} halaman, {laju.rows} listing dalam {laju.durasi():.1f} detik ({laju.teks()}); "
+          f"{writer.rows_written} listing ditulis ke chunk ({writer.rows_written / laju.durasi():.1f} listing/detik)")
+
+    # Halaman yang gagal tidak masuk checkpoint, jadi akan dicoba lagi pada run berikutnya
+    mulai = time.perf_counter()
+    df = merge_chunks(output, chunk_dir, checkpoint.path)
+    durasi = max(time.perf_counter() - mulai, 1e-9)
+    print(f"Selesai! {len(df)} listing digabung ke '{output}' ({len(df) / durasi:.0f} listing/detik)")
+    if gagal:
+        print(f"{len(gagal)} halaman gagal: {sorted(gagal)}. Jalankan ulang untuk mencoba lagi.")
+    else:
+        # Semua halaman berhasil, run berikutnya mulai dari awal lagi
+        if checkpoint.path and os.path.exists(checkpoint.path):
+            os.remove(checkpoint.path)
+        shutil.rmtree(chunk_dir, ignore_errors=True)
+    return df, gagal
+
+
+# ====== Crawl inkremental ======
+def _load_state(output):
+    # CSV hasil run sebelumnya menjadi state. Hasil crawl penuh versi lama (tanpa kolom
+    # First_Seen/Last_Seen/Status) dianggap aktif dan terakhir terlihat saat file itu ditulis.
+    if not os.path.exists(output):
+        return pd.DataFrame(columns=KOLOM_INKREMENTAL)
+    # Sama dengan _baca_chunk: "N/A" tetap string agar listing yang tidak berubah tidak dianggap berubah
+    df = pd.read_csv(output, dtype=str, keep_default_na=False)
+    waktu_file = datetime.fromtimestamp(os.path.getmtime(output), timezone.utc).isoformat(timespec="seconds")
+    for kolom, default in [("First_Seen", waktu_file), ("Last_Seen", waktu_file), ("Status", "aktif")]:
+        if kolom not in df.columns:
+            df[kolom] = default
+    df = df[~df["Link"].isin(["", "N/A"])]
+    return df.drop_duplicates("Link", keep="last")[KOLOM_INKREMENTAL]
+
+
+def crawl_incremental(base_url, total_pages, output, workers=4, stop_after=2, full=False,
+                      hapus_setelah_hari=None, max_retries=3, backoff=2.0,
+                      fetcher_factory=SeleniumFetcher, start_page=1):
+    # Delta crawl berdasarkan Link. Halaman diambil berurutan (per batch sebanyak `workers`)
+    # dan berhenti setelah `stop_after` halaman berturut-turut hanya berisi listing lama.
+    # Listing yang tidak terlihat lagi ditandai "dihapus": pada mode full (semua halaman
+    # dikunjungi), atau jika tidak terlihat selama `hapus_setelah_hari` hari.
+    sekarang = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    state = _load_state(output).set_index("Link", drop=False)
+    dikenal = set(state.index)
+    terlihat = set()
+    baru = []
+    berubah = 0
+
+    fetchers = _FetcherPool(fetcher_factory)
+    laju = _Throughput()
+    gagal = {}
+    halaman_diproses = 0
+    streak_lama = 0
+    habis = False
+
+    def proses(page):
+        try:
+            return page, _fetch_rows(fetchers, base_url + str(page), max_retries, backoff), None
+        except Exception as e:
+            return page, None, e
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            page = start_page
+            while page <= total_pages and not habis:
+                batch = range(page, min(page + workers, total_pages + 1))
+                for p, rows, err in pool.map(proses, batch):
+                    if err is not None:
+                        gagal[p] = err
+                        streak_lama = 0
+                        print(f"Gagal memproses halaman {p} setelah {max_retries} percobaan: {err}")
+                        continue
+                    halaman_diproses += 1
+                    laju.tambah(len(rows))
+                    if not rows:
+                        # Melewati halaman terakhir
+                        habis = True
+                        continue
+
+                    ada_baru = False
+                    for row in rows:
+                        link = row["Link"]
+                        if link == "N/A" or link in terlihat:
+                            continue
+                        terlihat.add(link)
+                        if link in dikenal:
+                            lama = state.loc[link]
+                            if lama["Harga"] != row["Harga"] or lama["Judul"] != row["Judul"]:
+                                state.loc[link, ["Judul", "Harga", "Tahun"]] = [row["Judul"], row["Harga"], row["Tahun"]]
+                                berubah += 1
+                            state.loc[link, ["Last_Seen", "Status"]] = [sekarang, "aktif"]
+                        else:
+                            ada_baru = True
+                            baru.append({**row, "First_Seen": sekarang, "Last_Seen": sekarang, "Status": "aktif"})
+
+                    streak_lama = 0 if ada_baru else streak_lama + 1
+                    print(f"Halaman {p} selesai ({len(rows)} listing, baru: {'ya' if ada_baru else 'tidak'})")
+
+                if not full and stop_after and streak_lama >= stop_after:
+                    break
+                page += workers
+    finally:
+        fetchers.close()
+
+    if baru:
+        state = pd.concat([pd.DataFrame(baru, columns=KOLOM_INKREMENTAL), state], ignore_index=True)
+    state = state.reset_index(drop=True)
+
+    aktif = state["Status"] == "aktif"
+    if full and not gagal:
+        hilang = aktif & ~state["Link"].isin(terlihat)
+    elif hapus_setelah_hari:
+        batas = pd.Timestamp(sekarang) - pd.Timedelta(days=hapus_setelah_hari)
+        hilang = aktif & (pd.to_datetime(state["Last_Seen"], utc=True) < batas)
+    else:
+        hilang = pd.Series(False, index=state.index)
+    state.loc[hilang, "Status"] = "dihapus"
+
+    # Tulis ke file sementara dulu agar CSV lama tidak rusak jika proses mati saat menulis
+    tmp = output + ".tmp"
+    state[KOLOM_INKREMENTAL].to_csv(tmp, index=False)
+    os.replace(tmp, output)
+
+    ringkasan = {
+        "halaman": halaman_diproses,
+        "baru": len(baru),
+        "berubah": berubah,
+        "dihapus": int(hilang.sum()),
+        "total_aktif": int((state["Status"] == "aktif").sum()),
+        "gagal": sorted(gagal),
+    }
+    print(f"Selesai! {ringkasan['halaman']} halaman diproses: {ringkasan['baru']} listing baru, "
+          f"{ringkasan['berubah']} berubah, {ringkasan['dihapus']} ditandai dihapus ({laju.teks()}). "
+          f"Disimpan ke '{output}'")
+    return state, ringkasan
+
+
+def main(base_url, total_pages, output):
+    parser = argparse.ArgumentParser(description=f"Scraping listing mobil123 ke '{output}'.")
+    parser.add_argument("--base-url", default=base_url, help="URL tanpa nomor halaman (bisa server lokal untuk uji offline)")
+    parser.add_argument("--pages", type=int, default=total_pages)
+    parser.add_argument("--output", default=output)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--fetch", choices=list(FETCHER), default="auto",
+                        help="auto: HTTP + parser cepat, browser hanya jika halaman butuh JavaScript")
+    parser.add_argument("--checkpoint", default=None, help="Default: <output>.checkpoint.jsonl")
+    parser.add_argument("--batch-rows", type=int, default=1000,
+                        help="Jumlah listing per file chunk di <output>.parts/")
+    parser.add_argument("--chunk-format", choices=FORMAT_CHUNK, default="csv",
+                        help="parquet membutuhkan pyarrow")
+    parser.add_argument("--merge", action="store_true",
+                        help="Hanya gabungkan chunk yang sudah ada menjadi <output>, tanpa scraping")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Hanya ambil listing baru/berubah berdasarkan Link dan perbarui CSV yang ada")
+    parser.add_argument("--stop-after", type=int, default=2,
+                        help="Mode inkremental: berhenti setelah N halaman berturut-turut tanpa listing baru")
+    parser.add_argument("--full", action="store_true",
+                        help="Mode inkremental: kunjungi semua halaman dan tandai listing yang hilang sebagai dihapus")
+    parser.add_argument("--hapus-setelah-hari", type=float, default=None,
+                        help="Mode inkremental: tandai dihapus jika tidak terlihat selama N hari")
+    args = parser.parse_args()
+
+    if args.merge:
+        df = merge_chunks(args.output, checkpoint_path=args.checkpoint)
+        print(f"Selesai! {len(df)} listing digabung ke '{args.output}'")
+        return df
+    if args.incremental:
+        return crawl_incremental(args.base_url, args.pages, args.output, workers=args.workers,
+                                 stop_after=args.stop_after, full=args.full,
+                                 hapus_setelah_hari=args.hapus_setelah_hari, max_retries=args.retries,
+                                 fetcher_factory=FETCHER[args.fetch])
+    return crawl(args.base_url, args.pages, args.output, workers=args.workers,
+                 checkpoint_path=args.checkpoint, max_retries=args.retries,
+                 fetcher_factory=FETCHER[args.fetch], batch_rows=args.batch_rows,
+                 chunk_format=args.chunk_format)
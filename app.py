@@ -1,22 +1,16 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import joblib
-import requests
-import json
 import re
-from fuzzywuzzy import process
-
-# Load model dan scaler
-model = joblib.load('model_prediksi_harga.pkl')
-scaler_X = joblib.load('scaler_X.pkl')
-scaler_y = joblib.load('scaler_y.pkl')
-feature_columns = joblib.load('feature_columns.pkl')
-nama_mobil_list = joblib.load('nama_mobil_list.pkl')
-df_depresiasi_tahun = joblib.load('df_depresiasi_tahun.pkl')
-df_bekas = joblib.load('df_bekas.pkl')
-df_baru = joblib.load('df_baru.pkl')
+from artifacts import load_artifact
+from encoder import get_encoder
+from micro_batch import predict_one
+from prediksi import MobilTidakDikenal
+
+# Library berat (matplotlib, fuzzywuzzy, requests) dan artefak besar (df_bekas, df_baru)
+# baru dimuat di tab yang membutuhkannya. Model dan scaler dimuat oleh prediksi.py saat
+# prediksi pertama (model_fused.npz, tanpa TensorFlow).
+nama_mobil_list = load_artifact('nama_mobil_list.pkl')
 
 # ============ TAMPILAN HEADER ============ #
 st.set_page_config(page_title="Prediksi Harga Mobil Bekas", layout="wide", page_icon="🚗")
@@ -53,29 +47,20 @@ if st.button('🔮 Prediksi Harga Bekas'):
     if not nama_mobil or not tahun or harga_baru is None:
         st.error("❗ Semua kolom wajib diisi.")
     else:
-        umur = 2025 - tahun
-        input_df = pd.DataFrame({
-            'Mobil_Bekas': [nama_mobil.strip()],
-            'Tahun': [tahun],
-            'Harga_Baru': [harga_baru],
-            'Umur_Mobil': [umur]
-        })
-
-        input_df = pd.get_dummies(input_df, columns=['Mobil_Bekas'], drop_first=False)
-        input_df = input_df.reindex(columns=feature_columns, fill_value=0)
-
-        input_scaled = scaler_X.transform(input_df)
-        pred_scaled = model.predict(input_scaled)
-        pred_rp = scaler_y.inverse_transform(pred_scaled)
-
-        if pred_rp[0][0] > harga_baru:
+        try:
+            pred_rp = predict_one(nama_mobil, tahun, harga_baru)
+        except MobilTidakDikenal:
+            st.error(f"❌ Mobil '{nama_mobil}' tidak dikenal oleh model.")
+            st.stop()
+
+        if pred_rp > harga_baru:
             st.warning( f"⚠️ **Perhatian! Harga Baru Tidak Masuk Akal!**\n\n"
                 f"Harga baru yang Anda masukkan **Rp {harga_baru:,.2f}** lebih rendah dari harga bekas yang wajar.\n"
                 f"Misalnya, harga bekas mobil {nama_mobil} tahun {tahun} pada data kami adalah sekitar **Rp 160.000.000** namun Anda masukkan dengan harga **Rp 100.000.000**.\n\n"
                 "Harap pastikan harga baru yang dimasukkan sesuai dengan kisaran harga pasar mobil tersebut.\n"
                 "Harga baru yang terlalu rendah dapat menyebabkan prediksi yang tidak realistis.")
         else:
-            st.success(f"💰 **Prediksi Harga Bekas: Rp {pred_rp[0][0]:,.2f}**")
+            st.success(f"💰 **Prediksi Harga Bekas: Rp {pred_rp:,.2f}**")
 
 st.markdown("---")
 
@@ -105,6 +90,12 @@ st.markdown("---")
 
 # Menampilkan konten berdasarkan tab yang dipilih
 if st.session_state.tab == 'Visualisasi':
+    from artifacts import artifact_version
+    from grafik import grafik_depresiasi
+
+    df_depresiasi_tahun = load_artifact('df_depresiasi_tahun.pkl')
+    versi_depresiasi = artifact_version('df_depresiasi_tahun.pkl')
+
     # ============ VISUALISASI DEPRESIASI ============ #
     st.header("📉 Visualisasi Depresiasi Harga Mobil")
     st.markdown("""
@@ -122,39 +113,12 @@ if st.session_state.tab == 'Visualisasi':
         (df_depresiasi_tahun['Tahun'] >= range_tahun[0]) & 
         (df_depresiasi_tahun['Tahun'] <= range_tahun[1])
     ].copy()
-    df_filtered_reversed = df_filtered[::-1].reset_index(drop=True)
-
-    # Fungsi umum plotting untuk diagram garis dengan nilai pada setiap titik dan penyesuaian otomatis posisi nilai
-    def plot_depresiasi(df, col, title, ylabel, color='blue', value_color='black'):
-        fig, ax = plt.subplots(figsize=(10, 5))
 
-        # Plot garis dengan penajaman warna garis
-        ax.plot(df['Tahun'], df[col], marker='o', color=color, linestyle='-', linewidth=2, markersize=6, label=col)
-
-        # Menambahkan nilai pada setiap titik di sepanjang garis dengan jarak yang cukup antara titik dan nilai
-        for i, val in enumerate(df[col]):
-            if i > 0 and abs(df[col].iloc[i] - df[col].iloc[i-1]) < 5:
-                ax.annotate(f'{val:.2f}', (df['Tahun'].iloc[i], val), textcoords="offset points", xytext=(0, -12), ha='center', fontsize=10, color=value_color, fontweight='bold')
-            else:
-                ax.annotate(f'{val:.2f}', (df['Tahun'].iloc[i], val), textcoords="offset points", xytext=(0, 10), ha='center', fontsize=10, color=value_color, fontweight='bold')
-
-        # Menambahkan judul, label dan grid
-        ax.set_title(title, fontsize=16, fontweight='bold', color='navy')
-        ax.set_xlabel('Tahun', fontsize=14, fontweight='bold')
-        ax.set_ylabel(ylabel, fontsize=14, fontweight='bold')
-        ax.grid(True, linestyle='--', alpha=0.7)
-
-        # Menambahkan sumbu X yang terbalik dan label tahun secara jelas
-        ax.set_xticks(df['Tahun'])
-        ax.set_xticklabels([str(i) for i in df['Tahun']], rotation=45, ha='right', fontsize=12)
-        ax.invert_xaxis()  # Membalikkan sumbu X agar dimulai dari 2025 ke 2005
-
-        # Menambahkan garis grid horizontal untuk keterbacaan yang lebih baik
-        ax.yaxis.grid(True, linestyle='--', alpha=0.7)
-
-        ax.legend(fontsize=12)
-        plt.tight_layout()
-        return fig
+    # Grafik di-render sekali per (kolom, rentang tahun) lalu disimpan sebagai PNG (lihat grafik.py)
+    def tampilkan_grafik(col, title, ylabel, color, value_color):
+        png = grafik_depresiasi(df_depresiasi_tahun, versi_depresiasi, range_tahun, col, title, ylabel,
+                                color=color, value_color=value_color)
+        st.image(png, width='stretch')
 
     # Tiga grafik yang ditampilkan dalam bentuk garis dengan desain profesional dan nilai di setiap titik
     st.subheader("📊 Grafik Depresiasi")
@@ -164,7 +128,7 @@ if st.session_state.tab == 'Visualisasi':
     """)
 
     # Grafik pertama
-    st.pyplot(plot_depresiasi(df_filtered_reversed, 'Depresiasi_%', 'Depresiasi (%) per Tahun', 'Depresiasi (%)', color='royalblue', value_color='darkblue'))
+    tampilkan_grafik('Depresiasi_%', 'Depresiasi (%) per Tahun', 'Depresiasi (%)', color='royalblue', value_color='darkblue')
     with st.expander("🔎 Deskripsi Grafik Depresiasi (%) per Tahun"):
         st.write("""
             Grafik ini menunjukkan bagaimana persentase depresiasi harga mobil bekas per tahun. Depresiasi harga adalah penurunan nilai mobil seiring bertambahnya umur.
@@ -173,7 +137,7 @@ if st.session_state.tab == 'Visualisasi':
         """)
 
     # Grafik kedua
-    st.pyplot(plot_depresiasi(df_filtered_reversed, 'Perbedaan_Depresiasi', 'Perbedaan Nilai Depresiasi per Tahun', 'Nilai', color='mediumseagreen', value_color='darkgreen'))
+    tampilkan_grafik('Perbedaan_Depresiasi', 'Perbedaan Nilai Depresiasi per Tahun', 'Nilai', color='mediumseagreen', value_color='darkgreen')
     with st.expander("🔎 Deskripsi Grafik Perbedaan Nilai Depresiasi per Tahun"):
         st.write("""
             Grafik ini menunjukkan selisih nilai depresiasi setiap tahun. Perbedaan nilai ini membantu Anda untuk memahami lebih dalam seberapa cepat nilai mobil bekas menurun 
@@ -181,7 +145,7 @@ if st.session_state.tab == 'Visualisasi':
         """)
 
     # Grafik ketiga
-    st.pyplot(plot_depresiasi(df_filtered_reversed, 'Peningkatan_Depresiasi_%', 'Peningkatan Depresiasi (%) per Tahun', 'Peningkatan (%)', color='orangered', value_color='darkred'))
+    tampilkan_grafik('Peningkatan_Depresiasi_%', 'Peningkatan Depresiasi (%) per Tahun', 'Peningkatan (%)', color='orangered', value_color='darkred')
     with st.expander("🔎 Deskripsi Grafik Peningkatan Depresiasi (%) per Tahun"):
         st.write("""
             Grafik ini menampilkan persentase peningkatan depresiasi per tahun. Ini berguna untuk mengetahui tren depresiasi dari tahun ke tahun.
@@ -206,6 +170,24 @@ if st.session_state.tab == 'Visualisasi':
     st.warning(f"📈 **Rata-rata Peningkatan Depresiasi Tiap Tahun:** {rata2_peningkatan:.2f}%")
 
 elif st.session_state.tab == 'Tentang':
+    import json
+
+    from grafik import histogram_tahun
+
+    # Pembagian data dan MAPE dari model_manifest.json (ditulis latih_model.py), jika ada
+    def baca_manifest(path):
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    try:
+        manifest = load_artifact('model_manifest.json', loader=baca_manifest)
+    except FileNotFoundError:
+        manifest = {}
+    n_train = f"{manifest.get('n_train', 21236):,}".replace(',', '.')
+    n_test = f"{manifest.get('n_test', 5309):,}".replace(',', '.')
+    n_features = manifest.get('n_features', 310)
+    mape = manifest.get('metrik', {}).get('mape', 5.82)
+
     # Menampilkan konten Tentang Data dan Model
     st.header("ℹ️ Tentang Data dan Model")
     st.markdown("""
@@ -223,15 +205,7 @@ elif st.session_state.tab == 'Tentang':
     """)
 
     # Grafik Persebaran Data Mobil Bekas
-    plt.figure(figsize=(10,5))
-    df_bekas['Tahun'].value_counts().sort_index().plot(kind='bar', color='cornflowerblue')
-    plt.title('Persebaran Data Mobil Bekas berdasarkan Tahun')
-    plt.xlabel('Tahun')
-    plt.ylabel('Jumlah Mobil')
-    plt.xticks(rotation=45)
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-    plt.tight_layout()
-    st.pyplot(plt)
+    st.image(histogram_tahun('df_bekas', 'Persebaran Data Mobil Bekas berdasarkan Tahun'), width='stretch')
 
     # Persebaran Data Mobil Baru berdasarkan Tahun
     st.subheader("📊 Persebaran Data Mobil Baru berdasarkan Tahun")
@@ -241,26 +215,18 @@ elif st.session_state.tab == 'Tentang':
     """)
 
     # Grafik Persebaran Data Mobil Baru
-    plt.figure(figsize=(10,5))
-    df_baru['Tahun'].value_counts().sort_index().plot(kind='bar', color='cornflowerblue')
-    plt.title('Persebaran Data Mobil Baru berdasarkan Tahun')
-    plt.xlabel('Tahun')
-    plt.ylabel('Jumlah Mobil')
-    plt.xticks(rotation=45)
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-    plt.tight_layout()
-    st.pyplot(plt)
+    st.image(histogram_tahun('df_baru', 'Persebaran Data Mobil Baru berdasarkan Tahun'), width='stretch')
 
-    st.markdown("""
+    st.markdown(f"""
     ### 🧠 Persiapan Data untuk Model
 
     - **Fitur (Input)**: Umur mobil, nama mobil (one-hot encoding), harga baru.
     - **Target (Output)**: Harga bekas mobil.
     - **Pembagian data**:
-        - X_train shape: (21.236, 310)
-        - X_test shape : (5.309, 310)
-        - y_train shape: (21.236, 1)
-        - y_test shape : (5.309, 1)
+        - X_train shape: ({n_train}, {n_features})
+        - X_test shape : ({n_test}, {n_features})
+        - y_train shape: ({n_train}, 1)
+        - y_test shape : ({n_test}, 1)
     """)
 
     st.markdown("""
@@ -280,11 +246,11 @@ elif st.session_state.tab == 'Tentang':
 
     """)
 
-    st.markdown("""
+    st.markdown(f"""
     ### 📈 Evaluasi Model
 
     - Akurasi model diukur menggunakan MAPE (Mean Absolute Percentage Error).
-    - Hasil: **MAPE = 5.82%** – menunjukkan model cukup akurat dalam memprediksi harga mobil bekas.
+    - Hasil: **MAPE = {mape:.2f}%** – menunjukkan model cukup akurat dalam memprediksi harga mobil bekas.
 
     """)
 
@@ -326,37 +292,56 @@ elif st.session_state.tab == 'Tentang':
     """)
 
 elif st.session_state.tab == 'Chatbot':
+    from artifacts import artifact_version
+    from cache import fuzzy_cache, prediksi_cache
+    from encoder import normalisasi_nama
+    from kolumnar import load_dataframe
+    from konteks_prompt import KONTEKS_TOKEN_BUDGET, get_konteks_index
+    from llm_cache import buat_kunci, get_llm_cache
+    from name_index import get_name_index
+    from openrouter import OPENROUTER_BASE_URL, OpenRouterError, get_client, pesan
+    from statistik import load_statistik
+
     # ====== Konfigurasi ======
     OPENROUTER_API_KEY = st.secrets["OPENROUTER_API_KEY"]  # Ganti dengan punyamu
     MODEL_NAME = "microsoft/mai-ds-r1:free"
+    # Client (Session keep-alive + timeout + retry) dibagi ke semua sesi; base URL bisa diarahkan ke server mock
+    client = get_client(OPENROUTER_API_KEY, st.secrets.get("OPENROUTER_BASE_URL", OPENROUTER_BASE_URL), MODEL_NAME)
+    # Jawaban LLM disimpan di SQLite (bertahan walau app restart) agar pertanyaan berulang tidak memakai kuota
+    llm_cache = get_llm_cache()
 
     # ====== Load data ======
     st.title("🚗 Chatbot Data Mobil Bekas Toyota")
 
     try:
-        df = pd.read_csv("data_mobil.csv")
-        df['Mobil_Bekas'] = df['Mobil_Bekas'].str.lower().str.strip()
+        # Sudah dinormalisasi (lowercase + strip) saat konversi ke format kolumnar
+        df = load_dataframe('data_mobil')
         st.success("✅ Data berhasil dimuat!")
     except:
         st.error("❌ Gagal memuat data CSV.")
         st.stop()
+    # Versi data ikut menjadi kunci cache, sehingga cache otomatis basi jika CSV diganti
+    versi_data = artifact_version("data_mobil.csv")
+    # Statistik harga per (mobil, tahun), dibangun sekali per versi data dan disimpan ke statistik_mobil.pkl
+    statistik = load_statistik(df)
     with st.expander("📌 Catatan Tentang Chatbot"):
-        st.markdown("""
+        st.markdown(f"""
         **Catatan Penggunaan Chatbot**  
         Chatbot bekerja berdasarkan hal berikut:
 
         ```python
-        data_text = df.head(100).to_string(index=False) 
-        prompt_awal_data = f"Saya memiliki data mobil bekas sebagai berikut:\\n\\n{data_text}\\n\\nSilakan jawab pertanyaan saya berdasarkan data di atas."
-        🔹 Hanya 100 data teratas yang dibaca untuk menghindari performa lambat atau error, karena model memiliki batas jumlah token.
-        🔹 Meski hanya membaca 100 data, pertanyaan tetap bebas karena chatbot mampu memprediksi dan mengestimasi jawaban berdasarkan pola.
+        data_text = konteks_index.konteks(pertanyaan)
+        prompt_awal_data = f"Saya memiliki data mobil bekas sebagai berikut:\\n\\n{{data_text}}\\n\\nSilakan jawab pertanyaan saya berdasarkan data di atas."
+        ```
+        🔹 Data yang dikirim ke chatbot dipilih sesuai pertanyaan (nama mobil, tahun, dan rentang harga yang disebut), dibatasi sekitar {KONTEKS_TOKEN_BUDGET} token agar tetap cepat dan tidak melebihi batas token model.
+        🔹 Pertanyaan tetap bebas karena chatbot mampu memprediksi dan mengestimasi jawaban berdasarkan pola.
 
         🔸 Model chatbot yang digunakan adalah microsoft/mai-ds-r1:free dari openrouter.ai.
         🔸 Model ini memiliki batas penggunaan harian. Jika chatbot error dan muncul pesan seperti "choice", berarti batas harian sudah tercapai dan bisa digunakan lagi keesokan harinya.
 
         🤖 Chatbot terhubung dengan model prediksi tambahan yang telah dilatih menggunakan seluruh data (26.000 baris) di Google Colab.
         Model tambahan tersebut adalah model yang sama dengan model yang digunakan pada fitur prediksi diatas.          
-        Jika pertanyaan berkaitan dengan mobil yang tidak terdapat dalam 100 data teratas, chatbot akan mengirim input ke model prediksi dan menggunakan hasilnya sebagai jawaban.
+        Jika pertanyaan berkaitan dengan mobil yang tidak terdapat dalam data, chatbot akan mengirim input ke model prediksi dan menggunakan hasilnya sebagai jawaban.
 
         💬 Chatbot dapat menjawab berbagai pertanyaan, seperti:
 
@@ -374,71 +359,67 @@ elif st.session_state.tab == 'Chatbot':
     with st.expander("📊 Lihat Data Mobil"):
         st.dataframe(df)
 
+    with st.expander("📈 Statistik Cache"):
+        for nama_cache, c in [("Prediksi harga", prediksi_cache), ("Fuzzy matching", fuzzy_cache), ("Jawaban LLM", llm_cache)]:
+            info = c.stats()
+            st.caption(f"{nama_cache}: {info['hits']} hit / {info['misses']} miss "
+                       f"({info['hit_rate']:.0%}), {info['size']}/{info['maxsize']} entri, TTL {info['ttl']:.0f} detik")
+
     # ====== Load model & fitur ======
     try:
-        model = joblib.load("model_prediksi_harga.pkl")
-        feature_columns = joblib.load("feature_columns.pkl")
-        scaler_X = joblib.load("scaler_X.pkl")
-        scaler_y = joblib.load("scaler_y.pkl")
+        get_encoder()
     except:
         st.error("❌ Gagal memuat model atau scaler.")
         st.stop()
 
     # ====== Fungsi prediksi ======
     def predict_price(mobil, tahun, harga_baru_override=None):
+        key = (normalisasi_nama(mobil), int(tahun), harga_baru_override, versi_data)
+        hasil = prediksi_cache.get(key)
+        if hasil is None:
+            hasil = _predict_price(mobil, tahun, harga_baru_override)
+            if not (hasil[1] or '').startswith("ERROR_MODEL"):
+                prediksi_cache.set(key, hasil)
+        return hasil
+
+    def _predict_price(mobil, tahun, harga_baru_override=None):
         mobil = mobil.lower().strip()
-        df_filtered = df[df['Mobil_Bekas'] == mobil]
+        stat_mobil = statistik.mobil(mobil)
 
-        if df_filtered.empty:
+        if stat_mobil is None:
             return None, "TIDAK_ADA_MOBIL"
 
-        harga_baru_rata2 = harga_baru_override if harga_baru_override else df_filtered['Harga_Baru'].mean()
-        umur = 2025 - tahun
-
-        df_input = pd.DataFrame({
-            'Mobil_Bekas': [mobil],
-            'Tahun': [tahun],
-            'Harga_Baru': [harga_baru_rata2],
-            'Umur_Mobil': [umur]
-        })
-
-        # Encoding
-        df_input = pd.get_dummies(df_input, columns=['Mobil_Bekas'], drop_first=False)
-        df_input = df_input.reindex(columns=feature_columns, fill_value=0)
+        harga_baru_rata2 = harga_baru_override if harga_baru_override else stat_mobil['Harga_Baru_mean']
 
         try:
-            input_scaled = scaler_X.transform(df_input)
-            pred_scaled = model.predict(input_scaled)
-            harga = scaler_y.inverse_transform(pred_scaled)[0][0]
+            harga = predict_one(mobil, tahun, harga_baru_rata2)
             return harga, None
+        except MobilTidakDikenal:
+            return None, "TIDAK_ADA_MOBIL"
         except Exception as e:
             return None, f"ERROR_MODEL: {str(e)}"
 
     # ====== Fungsi OpenRouter ======
+    # Kunci cache: prompt yang dinormalisasi + model + versi data; error tidak ikut disimpan
     def ask_openrouter(prompt_awal, pertanyaan):
-        headers = {
-            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "https://your-site.com",
-            "X-Title": "Chatbot Mobil Bekas",
-        }
-        data = {
-            "model": MODEL_NAME,
-            "messages": [
-                {"role": "system", "content": prompt_awal},
-                {"role": "user", "content": pertanyaan}
-            ]
-        }
-        response = requests.post("https://openrouter.ai/api/v1/chat/completions", headers=headers, data=json.dumps(data))
-        if response.status_code == 200:
-            return response.json()['choices'][0]['message']['content']
-        else:
-            return f"❌ Error: {response.status_code} - {response.text}"
+        key = buat_kunci(MODEL_NAME, versi_data, prompt_awal, pertanyaan)
+        try:
+            return llm_cache.get_or_compute(key, lambda: client.chat(pesan(prompt_awal, pertanyaan)))
+        except OpenRouterError as e:
+            return f"❌ Error: {e}"
+
+    def stream_openrouter(prompt_awal, pertanyaan):
+        # Potongan jawaban ditampilkan begitu diterima, tidak menunggu seluruh jawaban selesai
+        key = buat_kunci(MODEL_NAME, versi_data, prompt_awal, pertanyaan)
+        try:
+            yield from llm_cache.stream_or_compute(key, lambda: client.stream(pesan(prompt_awal, pertanyaan)))
+        except OpenRouterError as e:
+            yield f"\n\n❌ Error: {e}"
 
     # ====== Estimasi harga baru menggunakan OpenRouter ======
     def estimasi_harga_baru_dari_openrouter(nama_mobil, tahun):
         prompt_estimasi = (
-            f"Berdasarkan data berikut:\n\n{data_text}\n\n"
+            f"Berdasarkan data berikut:\n\n{konteks_index.konteks(f'{nama_mobil} {tahun}')}\n\n"
             f"Tolong perkirakan *harga baru* dari mobil bekas '{nama_mobil}' tahun {tahun} "
             f"berdasarkan tren harga mobil serupa dalam data tersebut. Berikan hanya angka tanpa penjelasan tambahan."
         )
@@ -452,13 +433,21 @@ elif st.session_state.tab == 'Chatbot':
             return None
 
     # ====== Prompt awal ======
-    data_text = df.head(100).to_string(index=False)
-    prompt_awal_data = f"Saya memiliki data mobil bekas sebagai berikut:\n\n{data_text}\n\nSilakan jawab pertanyaan saya berdasarkan data di atas."
+    # Index dibangun sekali per versi data; yang dikirim hanya baris yang relevan dengan pertanyaan
+    konteks_index = get_konteks_index(versi_data, lambda: df)
+
+    def buat_prompt_awal(pertanyaan):
+        data_text = konteks_index.konteks(pertanyaan)
+        return f"Saya memiliki data mobil bekas sebagai berikut:\n\n{data_text}\n\nSilakan jawab pertanyaan saya berdasarkan data di atas."
 
     # ====== Fungsi fuzzy matching ======
     def fuzzy_match_mobil(mobil_name):
-        choices = df['Mobil_Bekas'].unique()
-        best_match = process.extractOne(mobil_name, choices, score_cutoff=80)
+        return fuzzy_cache.get_or_set((mobil_name.lower().strip(), versi_data), lambda: _fuzzy_match_mobil(mobil_name))
+
+    def _fuzzy_match_mobil(mobil_name):
+        # Index nama dibangun sekali per versi data, bukan df.unique() + scan linear tiap pertanyaan
+        index_nama = get_name_index(versi_data, lambda: df['Mobil_Bekas'].unique())
+        best_match = index_nama.extract_one(mobil_name, score_cutoff=80)
         if best_match:
             return best_match[0]
         return None
@@ -481,16 +470,16 @@ elif st.session_state.tab == 'Chatbot':
                 tahun = int(match.group(3))
 
                 nama_mobil_matched = fuzzy_match_mobil(nama_mobil) or nama_mobil
-                df_matched = df[(df['Mobil_Bekas'] == nama_mobil_matched.lower()) & (df['Tahun'] == tahun)]
+                stat_matched = statistik.get(nama_mobil_matched, tahun)
 
-                if not df_matched.empty:
+                if stat_matched is not None:
                     if harga_type == "baru":
                         # Jika yang ditanyakan adalah harga baru
-                        harga_baru = df_matched['Harga_Baru'].mean()
+                        harga_baru = stat_matched['Harga_Baru_mean']
                         st.success(f"📊 Berdasarkan data, *{nama_mobil_matched.title()}* tahun {tahun} memiliki harga baru sekitar **Rp {harga_baru:,.0f}**.")
                     else:
                         # Jika yang ditanyakan adalah harga bekas
-                        harga_langsung = df_matched['Harga_Bekas'].mean()
+                        harga_langsung = stat_matched['Harga_Bekas_mean']
                         st.success(f"📊 Berdasarkan data, *{nama_mobil_matched.title()}* tahun {tahun} memiliki harga bekas rata-rata sekitar **Rp {harga_langsung:,.0f}**.")
                 else:
                     # Jika data tidak ditemukan di dataset
@@ -525,6 +514,5 @@ elif st.session_state.tab == 'Chatbot':
 
                 else:
                     # Case 5 & 6: Nama mobil tidak dikenali
-                    jawaban = ask_openrouter(prompt_awal_data, pertanyaan)
                     st.markdown("### 💡 Jawaban")
-                    st.write(jawaban)
+                    st.write_stream(stream_openrouter(buat_prompt_awal(pertanyaan), pertanyaan))
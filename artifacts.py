@@ -0,0 +1,108 @@
+import hashlib
+import os
+import threading
+
+import joblib
+
+# Folder tempat semua artefak (.pkl) disimpan, yaitu folder aplikasi ini
+ARTIFACT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _hash_file(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class _Entry:
+    __slots__ = ('stat_key', 'digest', 'obj')
+
+    def __init__(self, stat_key, digest, obj):
+        self.stat_key = stat_key
+        self.digest = digest
+        self.obj = obj
+
+
+class ArtifactRegistry:
+    """Memuat setiap artefak satu kali per proses dan dibagi ke semua sesi.
+
+    File hanya dimuat ulang jika mtime/ukurannya berubah DAN isinya (hash)
+    memang berbeda dari versi yang sedang dipakai.
+    """
+
+    def __init__(self, base_dir=ARTIFACT_DIR, loader=joblib.load):
+        self.base_dir = base_dir
+        self.loader = loader
+        self._entries = {}
+        self._digests = {}
+        self._locks = {}
+        self._global_lock = threading.Lock()
+
+    def _path(self, nama):
+        return nama if os.path.isabs(nama) else os.path.join(self.base_dir, nama)
+
+    def _lock_for(self, nama):
+        with self._global_lock:
+            return self._locks.setdefault(nama, threading.Lock())
+
+    def get(self, nama, loader=None):
+        path = self._path(nama)
+        st = os.stat(path)
+        stat_key = (st.st_mtime_ns, st.st_size)
+
+        entry = self._entries.get(nama)
+        if entry is not None and entry.stat_key == stat_key:
+            return entry.obj
+
+        # Hanya satu sesi yang memuat file yang sama, sesi lain menunggu hasilnya
+        with self._lock_for(nama):
+            entry = self._entries.get(nama)
+            if entry is not None and entry.stat_key == stat_key:
+                return entry.obj
+
+            digest = _hash_file(path)
+            if entry is not None and entry.digest == digest:
+                # File disentuh (mtime berubah) tapi isinya sama, tidak perlu unpickle ulang
+                entry.stat_key = stat_key
+                return entry.obj
+
+            obj = (loader or self.loader)(path)
+            self._entries[nama] = _Entry(stat_key, digest, obj)
+            return obj
+
+    def version(self, nama):
+        # Hash isi file, berguna sebagai kunci cache yang bergantung pada artefak
+        path = self._path(nama)
+        st = os.stat(path)
+        stat_key = (st.st_mtime_ns, st.st_size)
+        entry = self._entries.get(nama)
+        if entry is not None and entry.stat_key == stat_key:
+            return entry.digest
+        # File yang tidak dimuat lewat registry (mis. CSV) tetap di-hash sekali per versi
+        cached = self._digests.get(path)
+        if cached is None or cached[0] != stat_key:
+            cached = (stat_key, _hash_file(path))
+            self._digests[path] = cached
+        return cached[1]
+
+    def preload(self, *nama_list):
+        return [self.get(nama) for nama in nama_list]
+
+    def clear(self):
+        with self._global_lock:
+            self._entries.clear()
+            self._digests.clear()
+
+
+# Registry bersama untuk seluruh proses (Streamlit mengimpor modul ini sekali saja)
+registry = ArtifactRegistry()
+
+
+def load_artifact(nama, loader=None):
+    return registry.get(nama, loader=loader)
+
+
+def artifact_version(nama):
+    return registry.version(nama)
@@ -0,0 +1,401 @@
+import argparse
+import gc
+import glob
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+import warnings
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from artifacts import ARTIFACT_DIR, artifact_version
+
+# Benchmark jalur-jalur utama (prediksi, chatbot, grafik, artefak, scraper), semuanya offline:
+# LLM diganti server chat completions tiruan di localhost. Hasil disimpan sebagai JSON agar
+# bisa dibandingkan antar versi (`python benchmark.py --bandingkan bench_results/lama.json`).
+
+HASIL_DIR = os.path.join(ARTIFACT_DIR, 'bench_results')
+PERSENTIL = (50, 90, 99)
+# Rasio p50 baru / lama di atas ini dianggap regresi
+AMBANG_REGRESI = 1.25
+
+
+def ukur(fungsi, ulang, pemanasan=3, ulang_memori=20):
+    """Latensi per panggilan (persentil, ms), throughput, dan puncak memori Python.
+
+    fungsi(i) dipanggil dengan nomor iterasi sehingga input bisa bervariasi. Memori diukur
+    dengan tracemalloc di putaran terpisah agar overhead-nya tidak ikut ke latensi.
+    """
+    for i in range(pemanasan):
+        fungsi(i)
+
+    gc.collect()
+    tracemalloc.start()
+    for i in range(min(ulang, ulang_memori)):
+        fungsi(i)
+    _, puncak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latensi = np.empty(ulang)
+    mulai_total = time.perf_counter()
+    for i in range(ulang):
+        mulai = time.perf_counter()
+        fungsi(i)
+        latensi[i] = time.perf_counter() - mulai
+    durasi = time.perf_counter() - mulai_total
+
+    hasil = {'n': ulang, 'rata2_ms': float(latensi.mean() * 1000)}
+    for p in PERSENTIL:
+        hasil[f'p{p}_ms'] = float(np.percentile(latensi, p) * 1000)
+    hasil['throughput'] = ulang / durasi
+    hasil['memori_puncak_kb'] = puncak / 1024
+    return hasil
+
+
+# ====== LLM tiruan ======
+class _MockChatHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Header dan body dikirim terpisah; tanpa ini Nagle + delayed ACK menambah ~40 ms per respons
+    disable_nagle_algorithm = True
+    latensi = 0.0
+    jawaban = ['Avanza', ' 2019', ' sekitar', ' Rp 140', ' juta.']
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        time.sleep(self.latensi)
+        if body.get('stream'):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for teks in self.jawaban:
+                self._chunk('data: ' + json.dumps({'choices': [{'delta': {'content': teks}}]}) + '\n\n')
+            self._chunk('data: [DONE]\n\n')
+            self._chunk('')
+            return
+        data = json.dumps({'choices': [{'message': {'content': ''.join(self.jawaban)}}]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _chunk(self, teks):
+        data = teks.encode()
+        self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+
+
+def mulai_mock_llm(latensi=0.0):
+    handler = type('MockChat', (_MockChatHandler,), {'latensi': latensi})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}/v1'
+
+
+# ====== Kasus benchmark ======
+def _sampel(rng, nama, n):
+    return [(nama[rng.integers(len(nama))], int(rng.integers(2005, 2026)), float(rng.uniform(1.5e8, 1.5e9)))
+            for _ in range(n)]
+
+
+def kasus_prediksi(rng, skala):
+    import micro_batch
+    from encoder import get_encoder
+    from prediksi import predict_batch, predict_one
+    from statistik import load_statistik
+
+    nama = list(get_encoder().nama_asli.values())
+    input_ = _sampel(rng, nama, 1000)
+    statistik = load_statistik()
+    batch = list(zip(*_sampel(rng, nama, 1000)))
+
+    def predict_price(i):
+        # Sama dengan _predict_price di tab Chatbot: harga baru rata-rata dari statistik, lalu prediksi
+        mobil, tahun, _ = input_[i % len(input_)]
+        stat_mobil = statistik.mobil(mobil)
+        return micro_batch.predict_one(mobil, tahun, stat_mobil['Harga_Baru_mean'])
+
+    yield 'prediksi_tabel', lambda i: predict_one(*input_[i % len(input_)]), 2000 * skala
+    yield 'prediksi_model', lambda i: predict_one(*input_[i % len(input_)], gunakan_tabel=False), 2000 * skala
+    yield 'prediksi_batch_1000', lambda i: predict_batch(*batch), 100 * skala
+    yield 'predict_price', predict_price, 2000 * skala
+
+
+def kasus_chatbot(rng, skala, latensi_llm):
+    import pandas as pd
+    from fuzzywuzzy import fuzz, process
+
+    from kolumnar import load_dataframe
+    from konteks_prompt import KonteksIndex
+    from llm_cache import LLMCache, buat_kunci
+    from name_index import NameIndex
+    from openrouter import OpenRouterClient, pesan
+    from statistik import load_statistik
+
+    df = load_dataframe('data_mobil')
+    nama = df['Mobil_Bekas'].unique().tolist()
+    index_nama = NameIndex(nama)
+    statistik = load_statistik(df)
+
+    # Query fuzzy: nama asli dengan sebagian kata dibuang, seperti yang biasa diketik pengguna
+    query = []
+    for _ in range(200):
+        kata = nama[rng.integers(len(nama))].split()
+        buang = rng.integers(len(kata))
+        query.append(' '.join(k for j, k in enumerate(kata) if j != buang))
+    pasangan = [(nama[rng.integers(len(nama))], int(rng.integers(2005, 2026))) for _ in range(500)]
+    df_mask = pd.DataFrame({'Mobil_Bekas': df['Mobil_Bekas'].astype(str), 'Tahun': df['Tahun'].to_numpy(),
+                            'Harga_Bekas': df['Harga_Bekas'].to_numpy()})
+
+    def lookup_mask(i):
+        # Cara lama: filter boolean atas seluruh data untuk setiap pertanyaan
+        mobil, tahun = pasangan[i % len(pasangan)]
+        return df_mask[(df_mask['Mobil_Bekas'] == mobil) & (df_mask['Tahun'] == tahun)]['Harga_Bekas'].mean()
+
+    yield 'fuzzy_match_mobil', lambda i: index_nama.extract_one(query[i % len(query)], score_cutoff=80), 2000 * skala
+    yield 'fuzzy_match_linear', lambda i: process.extractOne(query[i % len(query)], nama, scorer=fuzz.WRatio,
+                                                              score_cutoff=80), 100 * skala
+    yield 'lookup_statistik', lambda i: statistik.get(*pasangan[i % len(pasangan)]), 5000 * skala
+    yield 'lookup_mask', lookup_mask, 200 * skala
+
+    konteks = KonteksIndex(df)
+    pertanyaan = [f'berapa harga {m} tahun {t}?' for m, t in pasangan]
+    yield 'konteks_prompt', lambda i: konteks.konteks(pertanyaan[i % len(pertanyaan)]), 1000 * skala
+
+    server, base_url = mulai_mock_llm(latensi_llm)
+    client = OpenRouterClient('bench', base_url=base_url, max_retries=0)
+    cache = LLMCache(':memory:')
+    pesan_llm = pesan(konteks.konteks(pertanyaan[0]), pertanyaan[0])
+
+    def llm_stream_token_pertama(i):
+        stream = client.stream(pesan_llm)
+        next(stream)
+        stream.close()
+
+    def llm_cache_hit(i):
+        key = buat_kunci('mock', 'bench', pertanyaan[0])
+        return cache.get_or_compute(key, lambda: client.chat(pesan_llm))
+
+    yield 'llm_chat_mock', lambda i: client.chat(pesan_llm), 200 * skala
+    yield 'llm_stream_token_pertama_mock', llm_stream_token_pertama, 200 * skala
+    yield 'llm_cache_hit', llm_cache_hit, 2000 * skala
+    server.shutdown()
+
+
+def kasus_grafik(rng, skala):
+    from artifacts import load_artifact
+    from grafik import grafik_cache, grafik_depresiasi, plot_depresiasi, render_png
+
+    df = load_artifact('df_depresiasi_tahun.pkl')
+    tahun = df['Tahun'].to_numpy()
+    rentang = [(int(a), int(b)) for a, b in (sorted(rng.choice(tahun, 2, replace=False)) for _ in range(50))]
+
+    def plot(i):
+        a, b = rentang[i % len(rentang)]
+        potong = df[(df['Tahun'] >= a) & (df['Tahun'] <= b)][::-1].reset_index(drop=True)
+        return render_png(plot_depresiasi(potong, 'Depresiasi_%', 'Depresiasi', 'Depresiasi (%)'))
+
+    def plot_cache(i):
+        return grafik_depresiasi(df, 'bench', rentang[i % 5], 'Depresiasi_%', 'Depresiasi', 'Depresiasi (%)')
+
+    yield 'plot_depresiasi', plot, 10 * skala
+    grafik_cache.clear()
+    yield 'plot_depresiasi_cache', plot_cache, 2000 * skala
+
+
+def kasus_artefak(rng, skala):
+    import joblib
+
+    # Dimuat langsung dengan joblib (tanpa registry artefak) untuk mengukur biaya load sebenarnya.
+    # Ulangan cukup banyak agar p50 stabil untuk cek regresi (noise I/O dan GC).
+    for path in sorted(glob.glob(os.path.join(ARTIFACT_DIR, '*.pkl'))):
+        yield f'joblib_load:{os.path.basename(path)}', lambda i, path=path: joblib.load(path), 30 * skala
+
+
+def kasus_scraper(rng, skala, folder_html=None):
+    sys.path.insert(0, os.path.join(ARTIFACT_DIR, 'Scraping'))
+    import scraper
+
+    if folder_html:
+        halaman = [open(p, encoding='utf-8', errors='replace').read()
+                   for p in sorted(glob.glob(os.path.join(folder_html, '*.html')))]
+        if not halaman:
+            raise SystemExit(f"Tidak ada file .html di '{folder_html}'")
+    else:
+        halaman = [_halaman_sintetis(n) for n in range(20)]
+
+    yield 'scraper_parse_listing', lambda i: scraper.parse_listing(halaman[i % len(halaman)]), 200 * skala
+    yield 'scraper_parse_bs4', lambda i: scraper._parse_bs4(halaman[i % len(halaman)]), 50 * skala
+
+
+def _halaman_sintetis(n, per_halaman=25):
+    # Struktur sama dengan halaman daftar mobil123 (article.listing > h2.listing__title > a, div.listing__price),
+    # dipakai jika tidak ada halaman HTML tersimpan (--html)
+    listing = ''.join(
+        f'<article class="listing listing--card" data-id="{n}{i}"><div class="listing__media"><img src="/img/{i}.jpg">'
+        f'</div><h2 class="listing__title"><a href="https://www.mobil123.com/dijual/toyota-{n}-{i}">'
+        f'20{10 + i % 15} Toyota Avanza 1.3 E MPV - Jakarta</a></h2><div class="listing__price">Rp {100 + i}.000.000'
+        f'</div><ul class="listing__specs">{"<li>spesifikasi</li>" * 6}</ul></article>'
+        for i in range(per_halaman))
+    navigasi = '<nav>' + '<a href="#">menu</a>' * 200 + '</nav>'
+    return f'<html><head><title>Mobil</title>{"<script>var x=1;</script>" * 20}</head><body>{navigasi}{listing}</body></html>'
+
+
+def ukur_cold_start_app(ulang):
+    # app.py dijalankan di proses baru setiap kali (lihat cold_start.py)
+    from cold_start import ukur_cold_start
+
+    hasil = [ukur_cold_start() for _ in range(ulang)]
+    total = np.array([h['total'] for h in hasil])
+    ringkasan = {'n': ulang, 'rata2_ms': float(total.mean() * 1000)}
+    for p in PERSENTIL:
+        ringkasan[f'p{p}_ms'] = float(np.percentile(total, p) * 1000)
+    ringkasan['throughput'] = 1 / total.mean()
+    ringkasan['impor_total_ms'] = float(np.mean([h['impor_total'] for h in hasil]) * 1000)
+    return ringkasan
+
+
+# ====== Runner ======
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ARTIFACT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _dipilih(nama, hanya):
+    # Nama kasus sama persis atau diawali salah satu teks --hanya ("prediksi" tidak ikut
+    # memilih "joblib_load:model_prediksi_harga.pkl")
+    return not hanya or any(nama == h or nama.startswith(h) for h in hanya)
+
+
+def _error(e):
+    return {'error': f'{type(e).__name__}: {e}'}
+
+
+def jalankan(skala=1, hanya=None, folder_html=None, latensi_llm=0.0, cold_start=3, seed=0):
+    # Kasus yang gagal (mis. dependensi tidak terpasang) dicatat sebagai {'error': ...} di JSON,
+    # kasus lain tetap dijalankan
+    rng = np.random.default_rng(seed)
+    grup = [
+        ('prediksi', lambda: kasus_prediksi(rng, skala)),
+        ('chatbot', lambda: kasus_chatbot(rng, skala, latensi_llm)),
+        ('grafik', lambda: kasus_grafik(rng, skala)),
+        ('artefak', lambda: kasus_artefak(rng, skala)),
+        ('scraper', lambda: kasus_scraper(rng, skala, folder_html)),
+    ]
+    hasil = {}
+    for nama_grup, buat in grup:
+        try:
+            for nama, fungsi, ulang in buat():
+                if not _dipilih(nama, hanya):
+                    continue
+                try:
+                    hasil[nama] = ukur(fungsi, max(1, int(ulang)))
+                except Exception as e:
+                    hasil[nama] = _error(e)
+                _cetak(nama, hasil[nama])
+        except Exception as e:
+            # Persiapan grup gagal: kasus grup ini yang belum berjalan dilewati
+            hasil[f'{nama_grup}:persiapan'] = _error(e)
+            _cetak(f'{nama_grup}:persiapan', hasil[f'{nama_grup}:persiapan'])
+    if cold_start and _dipilih('cold_start_app', hanya):
+        try:
+            hasil['cold_start_app'] = ukur_cold_start_app(cold_start)
+        except Exception as e:
+            hasil['cold_start_app'] = _error(e)
+        _cetak('cold_start_app', hasil['cold_start_app'])
+
+    return {
+        'meta': {
+            'waktu': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu': os.cpu_count(),
+            'versi_model': artifact_version('model_prediksi_harga.pkl'),
+            'versi_data': artifact_version('data_mobil.csv'),
+            'html': folder_html or 'sintetis',
+            'latensi_llm_ms': latensi_llm * 1000,
+            # ru_maxrss dalam KB di Linux
+            'rss_puncak_proses_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        },
+        'hasil': hasil,
+    }
+
+
+def _cetak(nama, h):
+    if 'error' in h:
+        print(f"{nama:<42} GAGAL: {h['error']}", flush=True)
+        return
+    memori = f"  mem {h['memori_puncak_kb']:9.1f} KB" if 'memori_puncak_kb' in h else ''
+    print(f"{nama:<42} p50 {h['p50_ms']:9.3f} ms  p99 {h['p99_ms']:9.3f} ms  "
+          f"{h['throughput']:10.1f}/detik{memori}", flush=True)
+
+
+def bandingkan(lama, baru, ambang=AMBANG_REGRESI):
+    # Return daftar kasus yang p50-nya memburuk lebih dari ambang
+    regresi = []
+    print(f"\nPerbandingan p50 dengan {lama['meta'].get('git_commit') or lama['meta']['waktu']}:")
+    for nama, h in baru['hasil'].items():
+        sebelum = lama['hasil'].get(nama)
+        if sebelum is None or 'error' in sebelum:
+            continue
+        if 'error' in h:
+            # Kasus yang sebelumnya berjalan tetapi sekarang gagal juga dihitung regresi
+            print(f"  {nama:<42} {sebelum['p50_ms']:9.3f} -> gagal ({h['error']})  ⚠️ regresi")
+            regresi.append(nama)
+            continue
+        rasio = h['p50_ms'] / sebelum['p50_ms'] if sebelum['p50_ms'] else float('inf')
+        tanda = ''
+        if rasio > ambang:
+            tanda = '  ⚠️ regresi'
+            regresi.append(nama)
+        print(f"  {nama:<42} {sebelum['p50_ms']:9.3f} -> {h['p50_ms']:9.3f} ms  ({rasio:.2f}x){tanda}")
+    return regresi
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark offline jalur utama aplikasi (LLM memakai server tiruan).')
+    parser.add_argument('--output', help='File JSON hasil (default: bench_results/hasil-<waktu>.json)')
+    parser.add_argument('--bandingkan', help='File JSON hasil sebelumnya untuk dibandingkan')
+    parser.add_argument('--ambang', type=float, default=AMBANG_REGRESI, help='Rasio p50 yang dianggap regresi')
+    parser.add_argument('--skala', type=float, default=1, help='Pengali jumlah ulangan (mis. 0.1 untuk cek cepat)')
+    parser.add_argument('--hanya', nargs='+', help='Hanya jalankan kasus yang namanya sama dengan atau diawali teks ini '
+                             '(mis. prediksi, joblib_load:, cold_start_app)')
+    parser.add_argument('--html', help='Folder berisi halaman daftar mobil123 tersimpan (*.html) untuk benchmark parser')
+    parser.add_argument('--latensi-llm-ms', type=float, default=0, help='Latensi buatan server LLM tiruan')
+    parser.add_argument('--cold-start', type=int, default=3, help='Jumlah ulangan cold start app.py (0 = lewati)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    # Peringatan versi scikit-learn/fuzzywuzzy tidak relevan untuk pengukuran
+    warnings.filterwarnings('ignore')
+    laporan = jalankan(args.skala, args.hanya, args.html, args.latensi_llm_ms / 1000, args.cold_start, args.seed)
+
+    output = args.output or os.path.join(HASIL_DIR, f"hasil-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(laporan, f, indent=2)
+    print(f"\nHasil disimpan ke '{output}'")
+
+    if args.bandingkan:
+        with open(args.bandingkan) as f:
+            regresi = bandingkan(json.load(f), laporan, args.ambang)
+        if regresi:
+            print(f"❌ {len(regresi)} kasus lebih lambat dari ambang {args.ambang:.2f}x")
+            sys.exit(1)
+        print("✅ Tidak ada regresi")
@@ -0,0 +1,76 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modul yang tidak boleh ikut terimpor hanya untuk menampilkan halaman pertama
+MODUL_TERLARANG = ['tensorflow', 'keras', 'jax', 'fuzzywuzzy']
+
+# Dijalankan di proses baru agar benar-benar cold start (tanpa cache modul/artefak)
+_SKRIP = r"""
+import json, runpy, sys, time, warnings, logging
+warnings.filterwarnings('ignore')
+logging.disable(logging.WARNING)
+mulai = time.perf_counter()
+import streamlit
+impor_streamlit = time.perf_counter() - mulai
+runpy.run_path('app.py', run_name='__main__')
+total = time.perf_counter() - mulai
+print(json.dumps({'total': total, 'impor_streamlit': impor_streamlit, 'modul': sorted(sys.modules)}))
+"""
+
+
+def _importtime_tingkat_atas(stderr):
+    # Format baris -X importtime: "import time: self [us] | cumulative | imported package"
+    hasil = []
+    for baris in stderr.splitlines():
+        if not baris.startswith('import time:') or 'cumulative' in baris:
+            continue
+        _, kumulatif, nama = baris[len('import time:'):].split('|')
+        # Hanya impor tingkat atas (tanpa indentasi), supaya tidak dihitung dua kali
+        if nama.startswith('  '):
+            continue
+        hasil.append((int(kumulatif), nama.strip()))
+    return sorted(hasil, reverse=True)
+
+
+def ukur_cold_start():
+    proses = subprocess.run([sys.executable, '-X', 'importtime', '-c', _SKRIP],
+                            cwd=APP_DIR, capture_output=True, text=True)
+    if proses.returncode != 0:
+        raise RuntimeError(proses.stderr[-2000:])
+    data = json.loads(proses.stdout.strip().splitlines()[-1])
+    impor = _importtime_tingkat_atas(proses.stderr)
+    data['impor_total'] = sum(us for us, _ in impor) / 1e6
+    data['importtime'] = impor[:10]
+    data['modul_terlarang'] = [m for m in MODUL_TERLARANG if m in data['modul']]
+    del data['modul']
+    return data
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Ukur waktu impor saat cold start app.py terhadap budget.')
+    parser.add_argument('--budget', type=float, default=2.0, help='Budget total waktu impor dalam detik')
+    args = parser.parse_args()
+
+    hasil = ukur_cold_start()
+    print(f"Total impor       : {hasil['impor_total']:.2f} detik (budget {args.budget:.2f} detik)")
+    print(f"Impor streamlit   : {hasil['impor_streamlit']:.2f} detik")
+    print(f"Halaman pertama   : {hasil['total']:.2f} detik (impor + artefak + render)")
+    print("Impor paling lambat (kumulatif):")
+    for us, nama in hasil['importtime']:
+        print(f"  {us / 1e6:6.3f} s  {nama}")
+
+    gagal = False
+    if hasil['modul_terlarang']:
+        print(f"❌ Modul berat ikut terimpor saat startup: {', '.join(hasil['modul_terlarang'])}")
+        gagal = True
+    if hasil['impor_total'] > args.budget:
+        print("❌ Waktu impor melebihi budget")
+        gagal = True
+    if not gagal:
+        print("✅ Cold start sesuai budget")
+    sys.exit(1 if gagal else 0)
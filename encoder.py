@@ -0,0 +1,127 @@
+import numpy as np
+
+from artifacts import load_artifact
+
+TAHUN_SEKARANG = 2025
+PREFIX_MOBIL = 'Mobil_Bekas_'
+KOLOM_NUMERIK = ('Tahun', 'Harga_Baru', 'Umur_Mobil')
+
+
+class MobilTidakDikenal(KeyError):
+    pass
+
+
+def normalisasi_nama(nama):
+    # Huruf kecil + spasi dirapikan, sehingga "Toyota Avanza" dan "toyota  avanza " dianggap sama
+    return ' '.join(str(nama).lower().split())
+
+
+class FeatureEncoder:
+    """Pengganti pd.get_dummies + reindex: menulis fitur langsung ke buffer NumPy.
+
+    Dibangun sekali dari feature_columns.pkl. Kolom numerik boleh muncul lebih dari
+    sekali (Umur_Mobil ada 2x), semua posisinya akan diisi.
+    """
+
+    def __init__(self, feature_columns):
+        self.feature_columns = list(feature_columns)
+        self.n_features = len(self.feature_columns)
+
+        posisi = {col: [] for col in KOLOM_NUMERIK}
+        self.kolom_mobil = {}
+        self.nama_asli = {}
+        for i, col in enumerate(self.feature_columns):
+            if col in posisi:
+                posisi[col].append(i)
+            elif col.startswith(PREFIX_MOBIL):
+                nama = col[len(PREFIX_MOBIL):]
+                key = normalisasi_nama(nama)
+                self.kolom_mobil[key] = i
+                self.nama_asli[key] = nama
+        self.posisi_numerik = {col: np.array(idx, dtype=np.intp) for col, idx in posisi.items()}
+        # Blok dense (semua kolom numerik, urut posisi) untuk representasi indeks + blok dense
+        urutan = sorted((i, col) for col, idx in posisi.items() for i in idx)
+        self.posisi_dense = np.array([i for i, _ in urutan], dtype=np.intp)
+        self.kolom_dense = [col for _, col in urutan]
+
+    def index_of(self, mobil):
+        return self.kolom_mobil.get(normalisasi_nama(mobil), -1)
+
+    def canonical_name(self, mobil):
+        return self.nama_asli.get(normalisasi_nama(mobil))
+
+    def _isi_numerik(self, out, tahun, harga_baru):
+        nilai = {'Tahun': tahun, 'Harga_Baru': harga_baru, 'Umur_Mobil': TAHUN_SEKARANG - tahun}
+        for col, posisi in self.posisi_numerik.items():
+            for i in posisi:
+                out[:, i] = nilai[col]
+
+    def encode_index(self, mobil, tahun, harga_baru):
+        # Return (blok, idx): blok (n, jumlah kolom numerik) + posisi kolom one-hot per baris
+        # (-1 jika tidak dikenal). Memori n x 4 + n, bukan n x 310.
+        tahun = np.asarray(tahun, dtype=np.float64)
+        harga_baru = np.asarray(harga_baru, dtype=np.float64)
+        n = len(tahun)
+        nilai = {'Tahun': tahun, 'Harga_Baru': harga_baru, 'Umur_Mobil': TAHUN_SEKARANG - tahun}
+
+        blok = np.empty((n, len(self.kolom_dense)), dtype=np.float64)
+        for j, col in enumerate(self.kolom_dense):
+            blok[:, j] = nilai[col]
+        idx = np.fromiter((self.index_of(m) for m in mobil), dtype=np.intp, count=n)
+        return blok, idx
+
+    def densify(self, blok, idx, out=None):
+        # Kebalikan encode_index: matriks fitur lengkap (n, n_features)
+        n = len(idx)
+        if out is None:
+            out = np.zeros((n, self.n_features), dtype=np.float64)
+        else:
+            out = out[:n]
+            out.fill(0)
+        out[:, self.posisi_dense] = blok
+        dikenal = np.nonzero(idx >= 0)[0]
+        out[dikenal, idx[dikenal]] = 1.0
+        return out
+
+    def encode(self, mobil, tahun, harga_baru, out=None):
+        # Return (X, idx). idx = posisi kolom one-hot per baris, -1 jika nama tidak dikenal
+        blok, idx = self.encode_index(mobil, tahun, harga_baru)
+        return self.densify(blok, idx, out=out), idx
+
+    def encode_one(self, mobil, tahun, harga_baru):
+        i = self.index_of(mobil)
+        if i < 0:
+            raise MobilTidakDikenal(mobil)
+        out = np.zeros((1, self.n_features), dtype=np.float64)
+        self._isi_numerik(out, float(tahun), float(harga_baru))
+        out[0, i] = 1.0
+        return out
+
+    def to_sparse(self, blok, idx):
+        # Versi CSR dari (blok, idx): hanya kolom numerik + satu bit one-hot yang disimpan per baris
+        from scipy import sparse
+
+        n, k = blok.shape
+        dikenal = idx >= 0
+        rows = np.concatenate([np.repeat(np.arange(n), k), np.nonzero(dikenal)[0]])
+        cols = np.concatenate([np.tile(self.posisi_dense, n), idx[dikenal]])
+        data = np.concatenate([blok.ravel(), np.ones(int(dikenal.sum()))])
+        return sparse.csr_matrix((data, (rows, cols)), shape=(n, self.n_features))
+
+    def encode_sparse(self, mobil, tahun, harga_baru):
+        blok, idx = self.encode_index(mobil, tahun, harga_baru)
+        return self.to_sparse(blok, idx), idx
+
+
+_encoder_cache = {}
+
+
+def get_encoder(feature_columns=None):
+    if feature_columns is None:
+        feature_columns = load_artifact('feature_columns.pkl')
+    # Registry mengembalikan objek yang sama selama file tidak berubah, jadi cukup dicek identitasnya
+    cached = _encoder_cache.get('encoder')
+    if cached is None or cached[0] is not feature_columns:
+        cached = (feature_columns, FeatureEncoder(feature_columns))
+        _encoder_cache['encoder'] = cached
+    return cached[1]
@@ -0,0 +1,144 @@
+import argparse
+import time
+
+import numpy as np
+
+FUSED_MODEL_FILE = 'model_fused.npz'
+
+_AKTIVASI = {
+    'relu': lambda z: np.maximum(z, 0, out=z),
+    'linear': lambda z: z,
+}
+
+
+class FusedPredictor:
+    """Forward pass Dense 64-128-64-1 murni NumPy, tanpa TensorFlow/Keras.
+
+    Standarisasi input (scaler_X) sudah dilipat ke bobot layer pertama dan
+    inverse scaling output (scaler_y) ke layer terakhir, sehingga predict()
+    menerima fitur mentah dan langsung mengembalikan harga dalam Rupiah.
+    """
+
+    def __init__(self, weights, biases, activations, feature_columns=None):
+        self.weights = weights
+        self.biases = biases
+        self.activations = activations
+        self.feature_columns = feature_columns
+
+    @property
+    def n_features(self):
+        return self.weights[0].shape[0]
+
+    def predict(self, X):
+        # X boleh dense atau scipy.sparse (CSR): layer pertama cukup X @ W0
+        if hasattr(X, 'tocsr'):
+            h = _AKTIVASI[self.activations[0]](np.asarray(X.tocsr() @ self.weights[0]) + self.biases[0])
+            return self._lanjut(h)
+        h = np.asarray(X, dtype=np.float64)
+        return self._lanjut(h, mulai=0)
+
+    def predict_index(self, blok, idx, posisi_dense):
+        # Input gaya embedding: blok kolom numerik (n, k) + posisi kolom one-hot per baris.
+        # Layer pertama = blok @ W0[posisi_dense] + W0[idx] + b0, tanpa membentuk matriks n x 310.
+        W0 = self.weights[0]
+        h = np.asarray(blok, dtype=np.float64) @ W0[posisi_dense]
+        h += self.biases[0]
+        dikenal = idx >= 0
+        h[dikenal] += W0[idx[dikenal]]
+        return self._lanjut(_AKTIVASI[self.activations[0]](h))
+
+    def _lanjut(self, h, mulai=1):
+        for W, b, act in zip(self.weights[mulai:], self.biases[mulai:], self.activations[mulai:]):
+            h = _AKTIVASI[act](h @ W + b)
+        return h[:, 0]
+
+    def save(self, path=FUSED_MODEL_FILE):
+        arrays = {'activations': np.array(self.activations)}
+        for i, (W, b) in enumerate(zip(self.weights, self.biases)):
+            arrays[f'W{i}'] = W
+            arrays[f'b{i}'] = b
+        if self.feature_columns is not None:
+            arrays['feature_columns'] = np.array(self.feature_columns)
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path=FUSED_MODEL_FILE):
+        with np.load(path, allow_pickle=False) as data:
+            activations = [str(a) for a in data['activations']]
+            weights = [data[f'W{i}'] for i in range(len(activations))]
+            biases = [data[f'b{i}'] for i in range(len(activations))]
+            feature_columns = [str(c) for c in data['feature_columns']] if 'feature_columns' in data else None
+        return cls(weights, biases, activations, feature_columns)
+
+
+def fuse(model, scaler_X, scaler_y, feature_columns=None):
+    # Ambil layer Dense saja, Dropout tidak aktif saat inferensi
+    weights, biases, activations = [], [], []
+    for layer in model.layers:
+        params = layer.get_weights()
+        if not params:
+            continue
+        act = layer.get_config().get('activation', 'linear')
+        if act not in _AKTIVASI:
+            raise ValueError(f"Aktivasi '{act}' pada layer {layer.name} belum didukung")
+        W, b = params
+        weights.append(np.asarray(W, dtype=np.float64))
+        biases.append(np.asarray(b, dtype=np.float64))
+        activations.append(act)
+
+    # MinMaxScaler: x_scaled = x * scale_ + min_
+    # => (x * s + m) @ W + b = x @ (s[:, None] * W) + (m @ W + b)
+    s_x = np.asarray(scaler_X.scale_, dtype=np.float64)
+    m_x = np.asarray(scaler_X.min_, dtype=np.float64)
+    biases[0] = m_x @ weights[0] + biases[0]
+    weights[0] = s_x[:, None] * weights[0]
+
+    # Inverse scaler_y: y = (o - min_) / scale_, dilipat ke layer output (linear)
+    if activations[-1] != 'linear':
+        raise ValueError("Layer output harus linear agar scaler_y bisa dilipat")
+    s_y = float(scaler_y.scale_[0])
+    m_y = float(scaler_y.min_[0])
+    weights[-1] = weights[-1] / s_y
+    biases[-1] = (biases[-1] - m_y) / s_y
+
+    return FusedPredictor(weights, biases, activations, feature_columns)
+
+
+def export_fused(output=FUSED_MODEL_FILE):
+    from artifacts import load_artifact
+
+    model = load_artifact('model_prediksi_harga.pkl')
+    scaler_X = load_artifact('scaler_X.pkl')
+    scaler_y = load_artifact('scaler_y.pkl')
+    feature_columns = load_artifact('feature_columns.pkl')
+
+    fused = fuse(model, scaler_X, scaler_y, feature_columns)
+    fused.save(output)
+    return fused, selisih_relatif(fused, model, scaler_X, scaler_y)
+
+
+def selisih_relatif(fused, model, scaler_X, scaler_y):
+    # Bandingkan dengan jalur asli (scaler_X -> Keras -> scaler_y) pada sampel acak
+    rng = np.random.default_rng(42)
+    n = 512
+    X = np.zeros((n, fused.n_features))
+    X[:, :] = scaler_X.data_min_ + rng.random((n, fused.n_features)) * scaler_X.data_range_
+    X_scaled = X * scaler_X.scale_ + scaler_X.min_
+    ref = scaler_y.inverse_transform(np.asarray(model.predict(X_scaled, verbose=0)).reshape(-1, 1))[:, 0]
+    return np.max(np.abs(fused.predict(X) - ref) / np.maximum(np.abs(ref), 1.0))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Ekspor model Keras + scaler menjadi predictor NumPy.')
+    parser.add_argument('--output', default=FUSED_MODEL_FILE)
+    args = parser.parse_args()
+
+    fused, selisih = export_fused(args.output)
+    x = np.zeros((1, fused.n_features))
+    mulai = time.perf_counter()
+    for _ in range(1000):
+        fused.predict(x)
+    per_prediksi = (time.perf_counter() - mulai) / 1000 * 1e3
+    print(f"Selesai! Model disimpan ke '{args.output}'")
+    print(f"Selisih relatif maksimum terhadap Keras: {selisih:.2e}")
+    print(f"Waktu satu prediksi: {per_prediksi:.3f} ms")
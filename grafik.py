@@ -0,0 +1,103 @@
+import io
+import os
+
+from cache import LRUCache
+
+# Jumlah gambar grafik yang disimpan (kombinasi kolom x rentang tahun), bisa diatur lewat env
+GRAFIK_CACHE_MAXSIZE = int(os.environ.get('GRAFIK_CACHE_MAXSIZE', 64))
+# Sama dengan pengaturan default st.pyplot
+DPI = 200
+
+# PNG hasil render dibagi ke semua sesi. Kunci selalu memuat versi artefak,
+# sehingga grafik otomatis dibuat ulang jika datanya dibangun ulang.
+grafik_cache = LRUCache(maxsize=GRAFIK_CACHE_MAXSIZE, ttl=None)
+
+
+def render_png(fig, dpi=DPI):
+    # Render figure ke PNG lalu bersihkan figure-nya
+    buf = io.BytesIO()
+    try:
+        fig.savefig(buf, format='png', dpi=dpi, bbox_inches='tight')
+    finally:
+        fig.clear()
+    return buf.getvalue()
+
+
+def plot_depresiasi(df, col, title, ylabel, color='blue', value_color='black'):
+    # Figure dibuat tanpa pyplot: tidak terdaftar di state global, jadi tidak menumpuk
+    # di memori dan aman dipakai beberapa sesi sekaligus
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(10, 5))
+    ax = fig.subplots()
+
+    # Plot garis dengan penajaman warna garis
+    ax.plot(df['Tahun'], df[col], marker='o', color=color, linestyle='-', linewidth=2, markersize=6, label=col)
+
+    # Menambahkan nilai pada setiap titik di sepanjang garis dengan jarak yang cukup antara titik dan nilai
+    for i, val in enumerate(df[col]):
+        if i > 0 and abs(df[col].iloc[i] - df[col].iloc[i-1]) < 5:
+            ax.annotate(f'{val:.2f}', (df['Tahun'].iloc[i], val), textcoords="offset points", xytext=(0, -12), ha='center', fontsize=10, color=value_color, fontweight='bold')
+        else:
+            ax.annotate(f'{val:.2f}', (df['Tahun'].iloc[i], val), textcoords="offset points", xytext=(0, 10), ha='center', fontsize=10, color=value_color, fontweight='bold')
+
+    # Menambahkan judul, label dan grid
+    ax.set_title(title, fontsize=16, fontweight='bold', color='navy')
+    ax.set_xlabel('Tahun', fontsize=14, fontweight='bold')
+    ax.set_ylabel(ylabel, fontsize=14, fontweight='bold')
+    ax.grid(True, linestyle='--', alpha=0.7)
+
+    # Menambahkan sumbu X yang terbalik dan label tahun secara jelas
+    ax.set_xticks(df['Tahun'])
+    ax.set_xticklabels([str(i) for i in df['Tahun']], rotation=45, ha='right', fontsize=12)
+    ax.invert_xaxis()  # Membalikkan sumbu X agar dimulai dari 2025 ke 2005
+
+    # Menambahkan garis grid horizontal untuk keterbacaan yang lebih baik
+    ax.yaxis.grid(True, linestyle='--', alpha=0.7)
+
+    ax.legend(fontsize=12)
+    fig.tight_layout()
+    return fig
+
+
+def grafik_depresiasi(df_depresiasi_tahun, versi, range_tahun, col, title, ylabel, color='blue', value_color='black'):
+    # PNG grafik depresiasi untuk (kolom, rentang tahun); render hanya saat belum ada di cache
+    key = ('depresiasi', versi, col, int(range_tahun[0]), int(range_tahun[1]))
+
+    def render():
+        df = df_depresiasi_tahun[
+            (df_depresiasi_tahun['Tahun'] >= range_tahun[0]) &
+            (df_depresiasi_tahun['Tahun'] <= range_tahun[1])
+        ]
+        df = df[::-1].reset_index(drop=True)
+        return render_png(plot_depresiasi(df, col, title, ylabel, color=color, value_color=value_color))
+
+    return grafik_cache.get_or_set(key, render)
+
+
+def histogram_tahun(nama_tabel, judul):
+    # PNG persebaran data per tahun untuk df_bekas/df_baru. Jumlah per tahun sudah dihitung saat
+    # konversi kolumnar (kolumnar.py), jadi DataFrame-nya sendiri tidak dibaca.
+    from artifacts import artifact_version
+    from kolumnar import SUMBER, load_distribusi
+
+    key = ('histogram', artifact_version(SUMBER[nama_tabel]), nama_tabel, judul)
+
+    def render():
+        from matplotlib.figure import Figure
+
+        counts = load_distribusi(nama_tabel, 'Tahun')
+        fig = Figure(figsize=(10, 5))
+        ax = fig.subplots()
+        posisi = range(len(counts))
+        ax.bar(posisi, counts.to_numpy(), width=0.5, color='cornflowerblue')
+        ax.set_xticks(posisi)
+        ax.set_xticklabels([str(t) for t in counts.index], rotation=45)
+        ax.set_title(judul)
+        ax.set_xlabel('Tahun')
+        ax.set_ylabel('Jumlah Mobil')
+        ax.grid(axis='y', linestyle='--', alpha=0.7)
+        fig.tight_layout()
+        return render_png(fig)
+
+    return grafik_cache.get_or_set(key, render)
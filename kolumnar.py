@@ -0,0 +1,218 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from artifacts import ARTIFACT_DIR, artifact_version, load_artifact
+
+KOLOM_DIR = 'data_kolom'
+META_FILE = '_meta.json'
+# Kolom yang jumlah per nilainya ikut disimpan di meta saat konversi (dipakai histogram tab Tentang)
+KOLOM_DISTRIBUSI = ('Tahun',)
+
+# Nama tabel -> file sumber
+SUMBER = {
+    'df_bekas': 'df_bekas.pkl',
+    'df_baru': 'df_baru.pkl',
+    'data_mobil': 'data_mobil.csv',
+}
+
+
+def _baca_sumber(nama):
+    path = os.path.join(ARTIFACT_DIR, SUMBER[nama])
+    if path.endswith('.csv'):
+        df = pd.read_csv(path)
+    else:
+        df = joblib.load(path)
+    # Normalisasi yang sebelumnya dikerjakan app.py di setiap rerun, sekarang sekali saat konversi
+    if nama == 'data_mobil':
+        df['Mobil_Bekas'] = df['Mobil_Bekas'].str.lower().str.strip()
+    return df
+
+
+def _hitung_distribusi(s):
+    counts = pd.Series(s).value_counts().sort_index()
+    return {'nilai': [x.item() if hasattr(x, 'item') else x for x in counts.index], 'jumlah': counts.tolist()}
+
+
+def simpan_kolumnar(df, folder, versi_sumber=None):
+    # Kolom numerik -> <kolom>.npy. Kolom teks -> kode int32 + kamus string (blob UTF-8 + offset),
+    # semuanya bisa dibaca dengan mmap tanpa unpickle.
+    os.makedirs(folder, exist_ok=True)
+    kolom = []
+    for i, col in enumerate(df.columns):
+        s = df[col]
+        berkas = f'{i:03d}'
+        if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+            np.save(os.path.join(folder, berkas + '.npy'), s.to_numpy())
+            kolom.append({'nama': col, 'tipe': 'numerik', 'berkas': berkas})
+            continue
+
+        codes, kamus = pd.factorize(s.astype('string'), use_na_sentinel=True)
+        encoded = [str(x).encode('utf-8') for x in kamus]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(b) for b in encoded])
+        np.save(os.path.join(folder, berkas + '.codes.npy'), codes.astype(np.int32))
+        np.save(os.path.join(folder, berkas + '.offsets.npy'), offsets)
+        with open(os.path.join(folder, berkas + '.kamus.bin'), 'wb') as f:
+            f.write(b''.join(encoded))
+        kolom.append({'nama': col, 'tipe': 'teks', 'berkas': berkas})
+
+    distribusi = {col: _hitung_distribusi(df[col]) for col in KOLOM_DISTRIBUSI if col in df.columns}
+    meta = {'baris': len(df), 'kolom': kolom, 'versi_sumber': versi_sumber, 'distribusi': distribusi}
+    # Meta ditulis terakhir: folder hanya dianggap valid jika semua kolom sudah selesai ditulis
+    tmp = os.path.join(folder, META_FILE + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp, os.path.join(folder, META_FILE))
+
+
+class TabelKolumnar:
+    """Tabel yang disimpan per kolom; hanya kolom yang diminta yang dibaca (mmap)."""
+
+    def __init__(self, folder, meta):
+        self.folder = folder
+        self.meta = meta
+        self.versi_sumber = meta.get('versi_sumber')
+        self.columns = [k['nama'] for k in meta['kolom']]
+        self._info = {k['nama']: k for k in meta['kolom']}
+        self._cache = {}
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, meta_path):
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        return cls(os.path.dirname(meta_path), meta)
+
+    def __len__(self):
+        return self.meta['baris']
+
+    def _path(self, info, akhiran):
+        return os.path.join(self.folder, info['berkas'] + akhiran)
+
+    def kolom(self, nama):
+        # Numerik: array mmap (zero-copy). Teks: pd.Categorical dari kode mmap + kamus
+        hasil = self._cache.get(nama)
+        if hasil is not None:
+            return hasil
+        with self._lock:
+            info = self._info[nama]
+            if info['tipe'] == 'numerik':
+                hasil = np.load(self._path(info, '.npy'), mmap_mode='r')
+            else:
+                codes = np.load(self._path(info, '.codes.npy'), mmap_mode='r')
+                offsets = np.load(self._path(info, '.offsets.npy'))
+                with open(self._path(info, '.kamus.bin'), 'rb') as f:
+                    blob = f.read()
+                kamus = [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+                hasil = pd.Categorical.from_codes(codes, categories=kamus)
+            self._cache[nama] = hasil
+            return hasil
+
+    def distribusi(self, nama):
+        # Jumlah baris per nilai (urut nilai) sebagai pd.Series. Diambil dari meta jika sudah
+        # dihitung saat konversi, jadi kolomnya tidak perlu dibaca sama sekali.
+        data = self.meta.get('distribusi', {}).get(nama)
+        if data is None:
+            data = _hitung_distribusi(np.asarray(self.kolom(nama)))
+        return pd.Series(data['jumlah'], index=pd.Index(data['nilai'], name=nama), name='count')
+
+    def to_pandas(self, columns=None):
+        # DataFrame dibangun sekali per kombinasi kolom lalu dibagi ke semua rerun/sesi (objek tabel
+        # ini sudah per versi data). Kolom numerik tetap menunjuk ke array mmap (copy=False);
+        # pemanggil tidak boleh mengubah DataFrame ini di tempat.
+        columns = tuple(self.columns if columns is None else columns)
+        df = self._frames.get(columns)
+        if df is None:
+            df = pd.DataFrame({col: self.kolom(col) for col in columns}, columns=list(columns), copy=False)
+            with self._lock:
+                df = self._frames.setdefault(columns, df)
+        return df
+
+
+_lock = threading.Lock()
+
+
+def _tukar_folder(baru, folder):
+    # Folder lama dipindah ke samping dulu (rename), baru folder baru dipasang. Proses yang masih
+    # memetakan file lama (mmap) tetap membaca isi lama sampai selesai; file itu tidak pernah ditimpa.
+    lama = None
+    if os.path.exists(folder):
+        lama = tempfile.mkdtemp(prefix=f'.{os.path.basename(folder)}-lama-', dir=os.path.dirname(folder))
+        os.replace(folder, os.path.join(lama, 'isi'))
+    os.replace(baru, folder)
+    if lama is not None:
+        shutil.rmtree(lama, ignore_errors=True)
+
+
+def konversi(nama):
+    # Ditulis ke folder sementara lalu ditukar utuh, bukan menimpa .npy yang sedang di-mmap
+    # (menimpa file yang dipetakan proses lain bisa berakhir dengan SIGBUS)
+    folder = os.path.join(ARTIFACT_DIR, KOLOM_DIR, nama)
+    os.makedirs(os.path.dirname(folder), exist_ok=True)
+    baru = tempfile.mkdtemp(prefix=f'.{nama}-baru-', dir=os.path.dirname(folder))
+    try:
+        simpan_kolumnar(_baca_sumber(nama), baru, artifact_version(SUMBER[nama]))
+        _tukar_folder(baru, folder)
+    finally:
+        if os.path.exists(baru):
+            shutil.rmtree(baru, ignore_errors=True)
+    return folder
+
+
+def load_tabel(nama):
+    # Tabel kolumnar yang sesuai dengan versi file sumber; dikonversi otomatis jika belum ada/basi
+    versi = artifact_version(SUMBER[nama])
+    meta_path = os.path.join(KOLOM_DIR, nama, META_FILE)
+    for percobaan in range(2):
+        try:
+            tabel = load_artifact(meta_path, loader=TabelKolumnar.load)
+            if tabel.versi_sumber == versi:
+                return tabel
+        except FileNotFoundError:
+            pass
+        if percobaan == 0:
+            with _lock:
+                konversi(nama)
+    raise RuntimeError(f"Gagal memuat tabel kolumnar '{nama}'")
+
+
+def load_dataframe(nama, columns=None):
+    # Fallback ke file sumber jika folder data_kolom tidak bisa ditulis (mis. filesystem read-only)
+    try:
+        return load_tabel(nama).to_pandas(columns)
+    except OSError:
+        df = _baca_sumber(nama)
+        return df if columns is None else df[list(columns)]
+
+
+def load_distribusi(nama, kolom):
+    try:
+        return load_tabel(nama).distribusi(kolom)
+    except OSError:
+        data = _hitung_distribusi(_baca_sumber(nama)[kolom])
+        return pd.Series(data['jumlah'], index=pd.Index(data['nilai'], name=kolom), name='count')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Konversi df_bekas/df_baru/data_mobil ke format kolumnar (mmap).')
+    parser.add_argument('tabel', nargs='*', default=list(SUMBER), help='Nama tabel: ' + ', '.join(SUMBER))
+    args = parser.parse_args()
+
+    for nama in args.tabel:
+        if not os.path.exists(os.path.join(ARTIFACT_DIR, SUMBER[nama])):
+            print(f"Lewati '{nama}': file {SUMBER[nama]} tidak ditemukan")
+            continue
+        mulai = time.perf_counter()
+        folder = konversi(nama)
+        print(f"Selesai! '{SUMBER[nama]}' dikonversi ke '{os.path.relpath(folder, ARTIFACT_DIR)}' "
+              f"dalam {time.perf_counter() - mulai:.2f} detik")
@@ -0,0 +1,202 @@
+import os
+import re
+import threading
+from collections import defaultdict
+
+import numpy as np
+
+from encoder import normalisasi_nama
+
+# Batas ukuran konteks data yang dikirim ke LLM, bisa diatur lewat env
+KONTEKS_TOKEN_BUDGET = int(os.environ.get('KONTEKS_TOKEN_BUDGET', 1500))
+KONTEKS_TOP_K = int(os.environ.get('KONTEKS_TOP_K', 40))
+# Perkiraan kasar jumlah karakter per token (tanpa tokenizer)
+KARAKTER_PER_TOKEN = 4
+# Toleransi harga jika pertanyaan menyebut satu angka harga tanpa "di bawah"/"di atas"
+TOLERANSI_HARGA = 0.2
+
+_RE_TAHUN = re.compile(r'\b(19[89]\d|20[0-4]\d)\b')
+_RE_HARGA = re.compile(
+    r'(di ?bawah|kurang dari|maks(?:imal)?|max|<|di ?atas|lebih dari|min(?:imal)?|>)?\s*'
+    r'(?:rp\.?\s*)?(\d+(?:[.,]\d+)*)\s*(juta|jt|miliar|milyar|m)?\b'
+)
+_SATUAN = {'juta': 1e6, 'jt': 1e6, 'miliar': 1e9, 'milyar': 1e9, 'm': 1e9}
+_BATAS_ATAS = ('bawah', 'kurang', 'maks', 'max', '<')
+_BATAS_BAWAH = ('atas', 'lebih', 'min', '>')
+
+
+def estimasi_token(teks):
+    return len(teks) // KARAKTER_PER_TOKEN + 1
+
+
+def _kata(teks):
+    return re.findall(r'[a-z0-9]+(?:\.[0-9]+)?', teks.lower())
+
+
+def _angka(teks):
+    # "300.000.000" / "1,5" / "150"
+    if re.fullmatch(r'\d{1,3}([.,]\d{3})+', teks):
+        return float(re.sub(r'[.,]', '', teks))
+    return float(teks.replace(',', '.'))
+
+
+def _nilai_harga(angka, satuan):
+    # Rupiah dari angka + satuan; None jika bukan harga (angka kecil tanpa satuan, mis. "1.3" pada nama mobil)
+    try:
+        nilai = _angka(angka)
+    except ValueError:
+        return None
+    if satuan:
+        nilai *= _SATUAN[satuan]
+    return nilai if nilai >= 1e6 else None
+
+
+def teks_nama(pertanyaan):
+    # Pertanyaan tanpa tahun dan harga, agar "300 juta" atau "1,5 m" tidak dicocokkan dengan nama mobil
+    teks = _RE_TAHUN.sub(' ', normalisasi_nama(pertanyaan))
+    return _RE_HARGA.sub(lambda m: m.group(0) if _nilai_harga(m.group(2), m.group(3)) is None else ' ', teks)
+
+
+def ekstrak_kriteria(pertanyaan):
+    """Ambil tahun, rentang harga, dan arah urutan (murah/mahal) dari pertanyaan."""
+    teks = pertanyaan.lower()
+    tahun = sorted({int(t) for t in _RE_TAHUN.findall(teks)})
+
+    harga_min, harga_max = None, None
+    for arah, angka, satuan in _RE_HARGA.findall(_RE_TAHUN.sub(' ', teks)):
+        nilai = _nilai_harga(angka, satuan)
+        if nilai is None:
+            continue
+        if any(k in arah for k in _BATAS_ATAS):
+            harga_max = nilai
+        elif any(k in arah for k in _BATAS_BAWAH):
+            harga_min = nilai
+        else:
+            harga_min, harga_max = nilai * (1 - TOLERANSI_HARGA), nilai * (1 + TOLERANSI_HARGA)
+
+    urutan = None
+    if re.search(r'murah|rendah', teks):
+        urutan = 'naik'
+    elif re.search(r'mahal|tinggi', teks):
+        urutan = 'turun'
+    return {'tahun': tahun, 'harga_min': harga_min, 'harga_max': harga_max, 'urutan': urutan}
+
+
+def _ringkas(nilai, skala=1e6):
+    # Harga ditulis dalam juta dengan satu desimal agar hemat token
+    return '-' if np.isnan(nilai) else f'{nilai / skala:.1f}'
+
+
+class KonteksIndex:
+    """Index atas data_mobil untuk memilih baris yang relevan dengan pertanyaan.
+
+    Nama mobil dipecah menjadi kata; setiap kata pertanyaan yang muncul di nama diberi
+    bobot IDF, sehingga "avanza" lebih menentukan daripada "toyota". Skor per nama unik
+    lalu dipetakan ke baris dan digabung dengan kecocokan tahun dan rentang harga.
+    """
+
+    def __init__(self, df):
+        nama = df['Mobil_Bekas'].astype(str).map(normalisasi_nama)
+        self.codes, self.nama = nama.factorize()
+        self.tahun = df['Tahun'].to_numpy(dtype=np.int64)
+        self.harga_bekas = df['Harga_Bekas'].to_numpy(dtype=float)
+        self.harga_baru = df['Harga_Baru'].to_numpy(dtype=float)
+        self.depresiasi = df['Depresiasi_%'].to_numpy(dtype=float)
+        self.link = df['Link'].astype(str).to_numpy() if 'Link' in df else None
+
+        postings = defaultdict(set)
+        for i, n in enumerate(self.nama):
+            for k in _kata(n):
+                postings[k].add(i)
+        self.postings = {k: np.fromiter(ids, dtype=np.int64) for k, ids in postings.items()}
+        self.idf = {k: np.log(1 + len(self.nama) / len(ids)) for k, ids in self.postings.items()}
+
+    def __len__(self):
+        return len(self.tahun)
+
+    def skor_nama(self, pertanyaan):
+        # Skor 0..1 per nama unik: proporsi bobot IDF kata nama yang disebut di pertanyaan.
+        # Tahun, harga, dan kata satu huruf ("m", "s") tidak ikut dicocokkan.
+        skor = np.zeros(len(self.nama))
+        for k in set(_kata(teks_nama(pertanyaan))):
+            if len(k) < 2:
+                continue
+            ids = self.postings.get(k)
+            if ids is not None:
+                skor[ids] += self.idf[k]
+        if skor.max() > 0:
+            skor /= skor.max()
+        return skor
+
+    def cari(self, pertanyaan, top_k=KONTEKS_TOP_K):
+        """Indeks baris paling relevan (paling relevan dulu) dan kriteria yang terbaca."""
+        kriteria = ekstrak_kriteria(pertanyaan)
+        skor = 3 * self.skor_nama(pertanyaan)[self.codes]
+        ada_nama = bool(skor.any())
+
+        if kriteria['tahun']:
+            jarak = np.min(np.abs(self.tahun[:, None] - np.array(kriteria['tahun'])[None, :]), axis=1)
+            skor += np.where(jarak == 0, 1.0, np.where(jarak == 1, 0.3, 0.0))
+        if kriteria['harga_min'] is not None or kriteria['harga_max'] is not None:
+            lo = kriteria['harga_min'] if kriteria['harga_min'] is not None else -np.inf
+            hi = kriteria['harga_max'] if kriteria['harga_max'] is not None else np.inf
+            dalam_rentang = (self.harga_bekas >= lo) & (self.harga_bekas <= hi)
+            skor += dalam_rentang
+            if not ada_nama:
+                # Tanpa nama mobil, batas harga dianggap syarat, bukan sekadar bonus
+                skor[~dalam_rentang] = 0
+
+        if kriteria['urutan'] == 'naik':
+            sekunder = self.harga_bekas
+        elif kriteria['urutan'] == 'turun':
+            sekunder = -self.harga_bekas
+        else:
+            sekunder = -self.tahun
+        kandidat = np.nonzero(skor > 0)[0]
+        if len(kandidat) == 0:
+            # Tidak ada yang cocok: pakai urutan sekunder saja atas seluruh data
+            kandidat = np.arange(len(self))
+        urutan = np.lexsort((kandidat, sekunder[kandidat], -skor[kandidat]))
+        return kandidat[urutan[:top_k]], kriteria
+
+    def format_baris(self, i, dengan_link=False):
+        teks = (f"{self.nama[self.codes[i]]}|{self.tahun[i]}|{_ringkas(self.harga_bekas[i])}|"
+                f"{_ringkas(self.harga_baru[i])}|{_ringkas(self.depresiasi[i], skala=1)}")
+        if dengan_link and self.link is not None:
+            teks += f"|{self.link[i]}"
+        return teks
+
+    def konteks(self, pertanyaan, token_budget=KONTEKS_TOKEN_BUDGET, top_k=KONTEKS_TOP_K):
+        """Tabel ringkas baris yang relevan, dipotong agar tidak melebihi token_budget."""
+        idx, _ = self.cari(pertanyaan, top_k=top_k)
+        dengan_link = 'link' in pertanyaan.lower()
+        header = "Mobil|Tahun|Harga_Bekas (juta Rp)|Harga_Baru (juta Rp)|Depresiasi_%" + ("|Link" if dengan_link else "")
+        baris = [header]
+        sisa = token_budget - estimasi_token(header)
+        for i in idx:
+            teks = self.format_baris(i, dengan_link)
+            # Listing kembar (nama, tahun, harga sama) cukup ditulis sekali
+            if teks in baris:
+                continue
+            sisa -= estimasi_token(teks)
+            if sisa < 0:
+                break
+            baris.append(teks)
+        return '\n'.join(baris)
+
+
+_lock = threading.Lock()
+_indexes = {}
+
+
+def get_konteks_index(key, df_fn):
+    # Satu index per versi data; dibangun sekali lalu dipakai bersama oleh semua sesi
+    index = _indexes.get(key)
+    if index is None:
+        with _lock:
+            index = _indexes.get(key)
+            if index is None:
+                index = KonteksIndex(df_fn())
+                _indexes.clear()
+                _indexes[key] = index
+    return index
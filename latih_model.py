@@ -0,0 +1,314 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from artifacts import ARTIFACT_DIR, artifact_version
+from encoder import PREFIX_MOBIL, TAHUN_SEKARANG, FeatureEncoder
+
+# Training ulang model tanpa notebook: data_mobil.csv -> model_prediksi_harga.pkl, scaler_X.pkl,
+# scaler_y.pkl, feature_columns.pkl, lalu model_fused.npz dan tabel_prediksi dibangun ulang
+# dari model baru. Setiap run dicatat di model_manifest.json (+ riwayat di model_manifest.jsonl).
+
+DATA_FILE = 'data_mobil.csv'
+MANIFEST_FILE = 'model_manifest.json'
+RIWAYAT_FILE = 'model_manifest.jsonl'
+
+KOLOM_MODEL = ['Mobil_Bekas', 'Tahun', 'Harga_Baru', 'Harga_Bekas']
+# Urutan kolom numerik sama dengan notebook: ['Umur_Mobil'] + kolom get_dummies tanpa Harga_Bekas
+KOLOM_NUMERIK = ['Umur_Mobil', 'Tahun', 'Harga_Baru', 'Umur_Mobil']
+
+HYPERPARAMETER = {
+    'test_size': 0.2,
+    'random_state': 42,
+    'learning_rate': 0.001,
+    'epochs': 100,
+    'batch_size': 32,
+    'validation_split': 0.2,
+    'patience': 5,
+}
+
+
+def _atur_thread(threads):
+    # Harus dipanggil sebelum TensorFlow/Keras diimpor
+    threads = str(threads or os.cpu_count() or 1)
+    for var in ('OMP_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS'):
+        os.environ.setdefault(var, threads)
+    os.environ.setdefault('TF_NUM_INTEROP_THREADS', '2')
+
+
+def siapkan_data(df):
+    # Return (blok, idx, y, feature_columns). Fitur disimpan sebagai blok kolom numerik (n x 4)
+    # + posisi kolom one-hot per baris; matriks lengkapnya sama dengan
+    # pd.get_dummies(..., columns=['Mobil_Bekas']) di notebook (lihat FeatureEncoder.densify).
+    df = df[KOLOM_MODEL].dropna()
+    nama = np.sort(df['Mobil_Bekas'].astype(str).unique())
+    codes = pd.Categorical(df['Mobil_Bekas'].astype(str), categories=nama).codes
+
+    tahun = df['Tahun'].to_numpy(dtype=np.float64)
+    nilai = {'Umur_Mobil': TAHUN_SEKARANG - tahun, 'Tahun': tahun,
+             'Harga_Baru': df['Harga_Baru'].to_numpy(dtype=np.float64)}
+    blok = np.column_stack([nilai[kolom] for kolom in KOLOM_NUMERIK])
+    idx = len(KOLOM_NUMERIK) + codes.astype(np.intp)
+
+    y = df['Harga_Bekas'].to_numpy(dtype=np.float64).reshape(-1, 1)
+    feature_columns = KOLOM_NUMERIK + [PREFIX_MOBIL + n for n in nama]
+    return blok, idx, y, feature_columns
+
+
+def bagi_data(n, params=None):
+    # Pembagian baris sama persis dengan notebook: train_test_split(test_size=0.2, random_state=42)
+    from sklearn.model_selection import train_test_split
+
+    params = {**HYPERPARAMETER, **(params or {})}
+    return train_test_split(np.arange(n), test_size=params['test_size'], random_state=params['random_state'])
+
+
+def fit_scaler_X(encoder, blok, idx, chunk_size=4096):
+    # partial_fit per chunk agar matriks n x 310 tidak pernah dibentuk utuh
+    from sklearn.preprocessing import MinMaxScaler
+
+    scaler_X = MinMaxScaler()
+    buffer = np.zeros((min(chunk_size, len(idx)), encoder.n_features))
+    for start in range(0, len(idx), chunk_size):
+        end = start + chunk_size
+        scaler_X.partial_fit(encoder.densify(blok[start:end], idx[start:end], out=buffer))
+    return scaler_X
+
+
+def _kelas_dataset():
+    from keras.utils import PyDataset
+
+    class BatchFitur(PyDataset):
+        # Batch dense (batch_size x 310) dibentuk dari (blok, idx) saat dibutuhkan oleh worker
+        def __init__(self, encoder, scaler_X, blok, idx, y, rows, batch_size, shuffle=False, seed=None, **kwargs):
+            super().__init__(**kwargs)
+            self.encoder = encoder
+            self.scaler_X = scaler_X
+            self.blok, self.idx, self.y = blok, idx, y
+            self.rows = np.array(rows)
+            self.batch_size = batch_size
+            self.shuffle = shuffle
+            self.rng = np.random.default_rng(seed)
+            if shuffle:
+                self.rng.shuffle(self.rows)
+
+        def __len__(self):
+            return -(-len(self.rows) // self.batch_size)
+
+        def __getitem__(self, i):
+            rows = self.rows[i * self.batch_size:(i + 1) * self.batch_size]
+            X = self.encoder.densify(self.blok[rows], self.idx[rows])
+            X *= self.scaler_X.scale_
+            X += self.scaler_X.min_
+            return X.astype(np.float32), self.y[rows].astype(np.float32)
+
+        def on_epoch_end(self):
+            if self.shuffle:
+                self.rng.shuffle(self.rows)
+
+    return BatchFitur
+
+
+def bangun_model(n_features, learning_rate):
+    from keras import Input, Sequential
+    from keras.layers import Dense, Dropout
+    from keras.optimizers import Adam
+
+    model = Sequential([
+        Input(shape=(n_features,)),
+        Dense(64, activation='relu'),
+        Dense(128, activation='relu'),
+        Dropout(0.2),
+        Dense(64, activation='relu'),
+        Dropout(0.2),
+        Dense(1),
+    ])
+    model.compile(optimizer=Adam(learning_rate=learning_rate), loss='mean_squared_error')
+    return model
+
+
+def latih(df, params=None, verbose=2, dense=False, workers=1):
+    import keras
+    from keras.callbacks import EarlyStopping
+    from sklearn.preprocessing import MinMaxScaler
+
+    params = {**HYPERPARAMETER, **(params or {})}
+    keras.utils.set_random_seed(params['random_state'])
+
+    blok, idx, y, feature_columns = siapkan_data(df)
+    encoder = FeatureEncoder(feature_columns)
+    scaler_y = MinMaxScaler()
+    y_scaled = scaler_y.fit_transform(y)
+
+    # Pembagian baris sama persis untuk kedua mode: test 20%, lalu validasi = 20% terakhir
+    # dari data train (perilaku validation_split Keras)
+    train_rows, test_rows = bagi_data(len(idx), params)
+    early_stopping = EarlyStopping(monitor='val_loss', patience=params['patience'], restore_best_weights=True)
+    model = bangun_model(encoder.n_features, params['learning_rate'])
+
+    if dense:
+        # Jalur notebook: seluruh matriks n x 310 dibentuk di memori
+        # Scaler di-fit pada array (bukan DataFrame), karena nama kolom Umur_Mobil muncul dua kali
+        scaler_X = MinMaxScaler()
+        X_scaled = scaler_X.fit_transform(encoder.densify(blok, idx))
+        history = model.fit(X_scaled[train_rows], y_scaled[train_rows], epochs=params['epochs'],
+                            batch_size=params['batch_size'], validation_split=params['validation_split'],
+                            callbacks=[early_stopping], verbose=verbose)
+        y_pred_scaled = model.predict(X_scaled[test_rows], verbose=0)
+    else:
+        scaler_X = fit_scaler_X(encoder, blok, idx)
+        BatchFitur = _kelas_dataset()
+        split_at = int(np.ceil(len(train_rows) * (1 - params['validation_split'])))
+        data = dict(encoder=encoder, scaler_X=scaler_X, blok=blok, idx=idx, y=y_scaled, workers=workers)
+        train = BatchFitur(rows=train_rows[:split_at], batch_size=params['batch_size'], shuffle=True,
+                           seed=params['random_state'], **data)
+        val = BatchFitur(rows=train_rows[split_at:], batch_size=4096, **data)
+        history = model.fit(train, validation_data=val, epochs=params['epochs'],
+                            callbacks=[early_stopping], verbose=verbose)
+        y_pred_scaled = model.predict(BatchFitur(rows=test_rows, batch_size=4096, **data), verbose=0)
+
+    y_pred = scaler_y.inverse_transform(np.asarray(y_pred_scaled).reshape(-1, 1))
+    y_asli = y[test_rows]
+    metrik = {
+        'mape': float(np.mean(np.abs((y_asli - y_pred) / y_asli)) * 100),
+        'mae': float(np.mean(np.abs(y_asli - y_pred))),
+        'val_loss_terbaik': float(min(history.history['val_loss'])),
+        'epoch_dijalankan': len(history.history['loss']),
+    }
+    ringkasan = {
+        'n_features': encoder.n_features,
+        'n_mobil': encoder.n_features - len(KOLOM_NUMERIK),
+        'n_train': len(train_rows),
+        'n_test': len(test_rows),
+        'mode_fitur': 'dense' if dense else 'sparse',
+    }
+    return model, scaler_X, scaler_y, feature_columns, metrik, ringkasan, params
+
+
+def _sha1(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def simpan_artefak(model, scaler_X, scaler_y, feature_columns, output_dir=ARTIFACT_DIR, fused=True):
+    # Semua file ditulis dulu ke folder sementara, lalu dipindah dengan os.replace satu per satu
+    # (tanpa menulis ulang isi file), sehingga app yang sedang berjalan tidak pernah memuat
+    # file setengah jadi. model_fused.npz ikut dibangun dari model baru sebelum dipindah; tanpa
+    # fused, model_fused.npz lama dihapus agar tidak dipakai bersama model baru. Tabel prediksi
+    # lama selalu dihapus dan dibangun ulang oleh bangun_tabel().
+    from fused_model import FUSED_MODEL_FILE, fuse, selisih_relatif
+    from tabel_prediksi import META_FILE, TABEL_FILE
+
+    files = {
+        'model_prediksi_harga.pkl': model,
+        'scaler_X.pkl': scaler_X,
+        'scaler_y.pkl': scaler_y,
+        'feature_columns.pkl': feature_columns,
+    }
+    turunan = {}
+    staging = tempfile.mkdtemp(prefix='.latih-', dir=output_dir)
+    try:
+        for nama, obj in files.items():
+            joblib.dump(obj, os.path.join(staging, nama))
+        urutan = list(files)
+        if fused:
+            predictor = fuse(model, scaler_X, scaler_y, feature_columns)
+            predictor.save(os.path.join(staging, FUSED_MODEL_FILE))
+            turunan[FUSED_MODEL_FILE] = {
+                'selisih_relatif_maks': float(selisih_relatif(predictor, model, scaler_X, scaler_y))}
+            # model_fused.npz dipindah lebih dulu: isinya berdiri sendiri, jadi selama file .pkl
+            # belum terganti app sudah memakai model baru
+            urutan.insert(0, FUSED_MODEL_FILE)
+
+        usang = [TABEL_FILE, META_FILE] + ([] if fused else [FUSED_MODEL_FILE])
+        for nama in usang:
+            try:
+                os.remove(os.path.join(output_dir, nama))
+            except FileNotFoundError:
+                pass
+        for nama in urutan:
+            os.replace(os.path.join(staging, nama), os.path.join(output_dir, nama))
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return urutan, turunan
+
+
+def bangun_tabel():
+    # tabel_prediksi harus mengikuti model baru, jika tidak app.py akan tetap memakai hasil model lama
+    from tabel_prediksi import META_FILE, TABEL_FILE, build_tabel
+
+    _, meta = build_tabel()
+    return [TABEL_FILE, META_FILE], {TABEL_FILE: {'error_relatif': meta['error_relatif']}}
+
+
+def tulis_manifest(manifest, output_dir=ARTIFACT_DIR):
+    path = os.path.join(output_dir, MANIFEST_FILE)
+    with open(path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(path + '.tmp', path)
+    with open(os.path.join(output_dir, RIWAYAT_FILE), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(manifest, ensure_ascii=False) + '\n')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Training ulang model prediksi harga dan bangun ulang semua artefak.')
+    parser.add_argument('--data', default=DATA_FILE, help='CSV hasil pengolahan_data.py (relatif ke folder aplikasi)')
+    parser.add_argument('--epochs', type=int, default=HYPERPARAMETER['epochs'])
+    parser.add_argument('--patience', type=int, default=HYPERPARAMETER['patience'])
+    parser.add_argument('--threads', type=int, default=None, help='Default: semua core')
+    parser.add_argument('--dense', action='store_true',
+                        help='Bentuk seluruh matriks n x 310 di memori seperti notebook (default: batch dari blok + indeks)')
+    parser.add_argument('--maks-mape', type=float, default=None,
+                        help='Batalkan penyimpanan jika MAPE test di atas nilai ini (artefak lama tetap dipakai)')
+    parser.add_argument('--tanpa-turunan', action='store_true',
+                        help='Jangan bangun ulang model_fused.npz dan tabel_prediksi (versi lama dihapus)')
+    args = parser.parse_args()
+
+    _atur_thread(args.threads)
+    mulai = time.perf_counter()
+    df = pd.read_csv(os.path.join(ARTIFACT_DIR, args.data))
+    model, scaler_X, scaler_y, feature_columns, metrik, ringkasan, params = latih(
+        df, {'epochs': args.epochs, 'patience': args.patience}, dense=args.dense,
+        workers=args.threads or os.cpu_count() or 1)
+    print(f"MAPE test: {metrik['mape']:.2f}% ({metrik['epoch_dijalankan']} epoch, "
+          f"train {ringkasan['n_train']}, test {ringkasan['n_test']}, {ringkasan['n_features']} fitur)")
+
+    if args.maks_mape is not None and metrik['mape'] > args.maks_mape:
+        print(f"MAPE di atas batas {args.maks_mape:.2f}%, artefak tidak diperbarui")
+        sys.exit(1)
+
+    files, turunan = simpan_artefak(model, scaler_X, scaler_y, feature_columns, fused=not args.tanpa_turunan)
+    if not args.tanpa_turunan:
+        files_tabel, turunan_tabel = bangun_tabel()
+        files += files_tabel
+        turunan.update(turunan_tabel)
+
+    waktu = datetime.now(timezone.utc)
+    versi_data = artifact_version(args.data)
+    manifest = {
+        'versi': f"{waktu:%Y%m%d%H%M%S}-{versi_data[:8]}",
+        'waktu': waktu.isoformat(timespec='seconds'),
+        'data': {'file': args.data, 'sha1': versi_data, 'baris': len(df)},
+        'hyperparameter': params,
+        'metrik': metrik,
+        **ringkasan,
+        'turunan': turunan,
+        'artefak': {nama: _sha1(os.path.join(ARTIFACT_DIR, nama)) for nama in files},
+        'durasi_detik': round(time.perf_counter() - mulai, 1),
+    }
+    tulis_manifest(manifest)
+    print(f"Selesai! Model versi {manifest['versi']} disimpan, manifest di '{MANIFEST_FILE}' "
+          f"({manifest['durasi_detik']} detik)")
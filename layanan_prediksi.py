@@ -0,0 +1,235 @@
+import argparse
+import gc
+import json
+import math
+import os
+import signal
+import sys
+from urllib.parse import parse_qs
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from artifacts import artifact_version
+from encoder import get_encoder
+from prediksi import muat_model, predict_many
+from statistik import load_statistik
+from tabel_prediksi import load_tabel
+
+# Layanan prediksi HTTP/JSON tanpa Streamlit, memakai artefak yang sama dengan app.py.
+# Bisa dijalankan dengan server bawaan (`python layanan_prediksi.py --workers 4`) atau server
+# WSGI apa pun, misalnya `gunicorn -w 4 --preload layanan_prediksi:app`.
+
+MAKS_BATCH = int(os.environ.get('PREDIKSI_MAKS_BATCH', 10000))
+MAKS_BODY = int(os.environ.get('PREDIKSI_MAKS_BODY', 8 << 20))
+
+
+class PermintaanTidakValid(Exception):
+    def __init__(self, pesan, status='400 Bad Request'):
+        super().__init__(pesan)
+        self.status = status
+
+
+def muat_artefak():
+    # Dipanggil sebelum worker di-fork, sehingga model, encoder, tabel, dan statistik
+    # dimuat sekali lalu dibagi (copy-on-write) ke semua worker
+    get_encoder()
+    muat_model()  # model_fused.npz, atau model Keras + scaler jika tidak ada
+    load_tabel()
+    return load_statistik()
+
+
+def _angka(nilai):
+    nilai = float(nilai)
+    return None if math.isnan(nilai) else nilai
+
+
+def _harga_baru(statistik, mobil, harga_baru):
+    # Sama seperti chatbot: jika harga baru tidak diisi, dipakai rata-rata harga baru mobil tersebut
+    if harga_baru is not None:
+        harga_baru = float(harga_baru)
+        if not math.isfinite(harga_baru):
+            raise PermintaanTidakValid("Field 'harga_baru' harus berupa angka (bukan NaN/Infinity)")
+        return harga_baru
+    stat_mobil = statistik.mobil(mobil)
+    if stat_mobil is not None:
+        return stat_mobil['Harga_Baru_mean']
+    if get_encoder().index_of(mobil) >= 0:
+        # Mobil dikenal model, tetapi tidak ada data harga baru untuk dijadikan default
+        raise PermintaanTidakValid(f"Tidak ada data harga baru untuk '{mobil}', isi field 'harga_baru'")
+    # Mobil tidak dikenal: hasil prediksi NaN (422 / null)
+    return math.nan
+
+
+def _wajib(data, kunci):
+    if kunci not in data or data[kunci] in (None, ''):
+        raise PermintaanTidakValid(f"Field '{kunci}' wajib diisi")
+    return data[kunci]
+
+
+def prediksi_satu(data):
+    mobil = str(_wajib(data, 'mobil'))
+    try:
+        tahun = int(_wajib(data, 'tahun'))
+        harga_baru = _harga_baru(load_statistik(), mobil, data.get('harga_baru'))
+    except (TypeError, ValueError):
+        raise PermintaanTidakValid("Field 'tahun' dan 'harga_baru' harus berupa angka")
+    # Jalur yang sama dengan /prediksi/batch (tabel_prediksi lalu model), jadi hasil untuk
+    # input yang sama selalu identik di kedua endpoint
+    harga = _angka(predict_many([mobil], [tahun], [harga_baru])[0])
+    if harga is None:
+        raise PermintaanTidakValid(f"Mobil '{mobil}' tidak dikenal", '422 Unprocessable Entity')
+    return {'mobil': mobil, 'tahun': tahun, 'harga_baru': harga_baru, 'harga_bekas': harga}
+
+
+def prediksi_banyak(data):
+    # Menerima {"data": [{"mobil", "tahun", "harga_baru"}, ...]}; hasil null untuk mobil yang tidak dikenal
+    baris = _wajib(data, 'data')
+    if not isinstance(baris, list):
+        raise PermintaanTidakValid("Field 'data' harus berupa list")
+    if len(baris) > MAKS_BATCH:
+        raise PermintaanTidakValid(f"Maksimal {MAKS_BATCH} baris per request", '413 Payload Too Large')
+    statistik = load_statistik()
+    try:
+        mobil = [str(_wajib(b, 'mobil')) for b in baris]
+        tahun = [int(_wajib(b, 'tahun')) for b in baris]
+        harga_baru = [_harga_baru(statistik, m, b.get('harga_baru')) for m, b in zip(mobil, baris)]
+    except (TypeError, ValueError, AttributeError):
+        raise PermintaanTidakValid("Setiap baris harus berisi 'mobil', 'tahun' (angka), dan 'harga_baru' (angka, opsional)")
+    hasil = predict_many(mobil, tahun, harga_baru) if baris else []
+    return {'harga_bekas': [_angka(h) for h in hasil]}
+
+
+def statistik_mobil(query):
+    # GET /statistik?mobil=...&tahun=... (tanpa tahun: statistik semua tahun)
+    mobil = query.get('mobil', [''])[0]
+    if not mobil:
+        raise PermintaanTidakValid("Parameter 'mobil' wajib diisi")
+    statistik = load_statistik()
+    tahun = query.get('tahun', [''])[0]
+    if tahun:
+        try:
+            stat = statistik.get(mobil, int(tahun))
+        except ValueError:
+            raise PermintaanTidakValid("Parameter 'tahun' harus berupa angka")
+    else:
+        stat = statistik.mobil(mobil)
+    if stat is None:
+        raise PermintaanTidakValid(f"Tidak ada data untuk '{mobil}'" + (f" tahun {tahun}" if tahun else ''),
+                                   '404 Not Found')
+    return {'mobil': mobil, 'tahun': int(tahun) if tahun else None,
+            'statistik': {k: _angka(v) for k, v in stat.items()}}
+
+
+def kesehatan(_):
+    return {'status': 'ok', 'versi_model': artifact_version('model_prediksi_harga.pkl'),
+            'versi_data': artifact_version('data_mobil.csv'), 'pid': os.getpid()}
+
+
+RUTE = {
+    ('POST', '/prediksi'): prediksi_satu,
+    ('POST', '/prediksi/batch'): prediksi_banyak,
+    ('GET', '/statistik'): statistik_mobil,
+    ('GET', '/health'): kesehatan,
+}
+
+
+def _baca_json(environ):
+    try:
+        panjang = int(environ.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        panjang = 0
+    if panjang > MAKS_BODY:
+        raise PermintaanTidakValid('Body terlalu besar', '413 Payload Too Large')
+    try:
+        data = json.loads(environ['wsgi.input'].read(panjang) or b'{}')
+    except ValueError:
+        raise PermintaanTidakValid('Body harus berupa JSON')
+    if not isinstance(data, dict):
+        raise PermintaanTidakValid('Body harus berupa objek JSON')
+    return data
+
+
+def app(environ, start_response):
+    metode = environ['REQUEST_METHOD']
+    path = environ.get('PATH_INFO', '').rstrip('/') or '/'
+    handler = RUTE.get((metode, path))
+    try:
+        if handler is None:
+            if any(p == path for _, p in RUTE):
+                raise PermintaanTidakValid(f'Metode {metode} tidak didukung', '405 Method Not Allowed')
+            raise PermintaanTidakValid(f'Endpoint {path} tidak ada', '404 Not Found')
+        argumen = parse_qs(environ.get('QUERY_STRING', '')) if metode == 'GET' else _baca_json(environ)
+        status, hasil = '200 OK', handler(argumen)
+    except PermintaanTidakValid as e:
+        status, hasil = e.status, {'error': str(e)}
+    except Exception as e:
+        status, hasil = '500 Internal Server Error', {'error': f'{type(e).__name__}: {e}'}
+
+    body = json.dumps(hasil).encode('utf-8')
+    start_response(status, [('Content-Type', 'application/json'), ('Content-Length', str(len(body)))])
+    return [body]
+
+
+class _Server(WSGIServer):
+    request_queue_size = 1024
+
+
+class _HandlerSenyap(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def jalankan(host='127.0.0.1', port=8000, workers=1, log=False):
+    # Pre-fork: artefak dimuat dan socket dibuka sekali di proses induk, lalu setiap worker
+    # menerima koneksi dari socket yang sama. Memori model dibagi read-only antar worker.
+    statistik = muat_artefak()
+    server = make_server(host, port, app, server_class=_Server,
+                         handler_class=WSGIRequestHandler if log else _HandlerSenyap)
+    print(f"Layanan prediksi di http://{host}:{server.server_port} ({workers} worker, "
+          f"{len(statistik.per_mobil)} mobil)", flush=True)
+    if workers <= 1:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    # Objek yang sudah dimuat dipindah ke generasi permanen GC agar tidak disentuh (dan disalin) oleh worker
+    gc.freeze()
+    anak = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            try:
+                server.serve_forever()
+            finally:
+                os._exit(0)
+        anak.append(pid)
+
+    def hentikan(signum, frame):
+        for pid in anak:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, hentikan)
+    signal.signal(signal.SIGINT, hentikan)
+    for pid in anak:
+        os.waitpid(pid, 0)
+    server.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Layanan prediksi harga mobil bekas (HTTP/JSON).')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Jumlah proses worker (default: jumlah core)')
+    parser.add_argument('--log', action='store_true', help='Tampilkan log setiap request')
+    args = parser.parse_args()
+
+    if args.workers > 1 and not hasattr(os, 'fork'):
+        print("Peringatan: os.fork tidak tersedia, dijalankan dengan 1 worker", file=sys.stderr)
+        args.workers = 1
+    jalankan(args.host, args.port, args.workers, args.log)
@@ -0,0 +1,223 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from artifacts import ARTIFACT_DIR
+
+# Lokasi, TTL, dan jumlah maksimum jawaban yang disimpan bisa diatur lewat environment variable
+LLM_CACHE_FILE = os.environ.get('LLM_CACHE_FILE', os.path.join(ARTIFACT_DIR, 'llm_cache.sqlite'))
+LLM_CACHE_TTL = float(os.environ.get('LLM_CACHE_TTL', 7 * 24 * 3600))
+LLM_CACHE_MAXSIZE = int(os.environ.get('LLM_CACHE_MAXSIZE', 2000))
+# Batas waktu (detik) menunggu request identik di sesi lain sebelum memanggil upstream sendiri
+LLM_CACHE_TUNGGU = float(os.environ.get('LLM_CACHE_TUNGGU', 120))
+
+_HABIS = object()
+
+
+def normalisasi_prompt(teks):
+    # Huruf kecil + spasi dirapikan, sehingga pertanyaan yang hanya beda spasi/kapital dianggap sama
+    return ' '.join(str(teks).lower().split())
+
+
+def buat_kunci(model, versi_data, *bagian):
+    isi = json.dumps([model, versi_data] + [normalisasi_prompt(b) for b in bagian], ensure_ascii=False)
+    return hashlib.sha256(isi.encode('utf-8')).hexdigest()
+
+
+class _Proses:
+    # Satu request upstream yang sedang berjalan; pemanggil lain dengan kunci sama menunggu hasilnya
+    def __init__(self):
+        self.selesai = threading.Event()
+        self.nilai = None
+        self.error = None
+
+
+class LLMCache:
+    """Cache jawaban LLM di SQLite dengan TTL, batas jumlah entri (LRU), dan penggabungan request.
+
+    Jawaban bertahan walau app di-restart. Jika beberapa sesi menanyakan hal yang sama
+    bersamaan, hanya satu yang memanggil upstream; sisanya menunggu dan memakai hasilnya.
+    Jawaban yang gagal (exception) tidak disimpan.
+    """
+
+    def __init__(self, path=LLM_CACHE_FILE, maxsize=LLM_CACHE_MAXSIZE, ttl=LLM_CACHE_TTL, timer=time.time,
+                 tunggu=LLM_CACHE_TUNGGU):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.tunggu = tunggu
+        self.timer = timer
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._proses = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS jawaban ('
+            'kunci TEXT PRIMARY KEY, nilai TEXT NOT NULL, kedaluwarsa REAL, diakses REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS jawaban_diakses ON jawaban (diakses)')
+
+    def get(self, key, default=None):
+        sekarang = self.timer()
+        with self._lock:
+            row = self._conn.execute('SELECT nilai, kedaluwarsa FROM jawaban WHERE kunci = ?', (key,)).fetchone()
+            if row is not None:
+                nilai, kedaluwarsa = row
+                if kedaluwarsa is None or kedaluwarsa > sekarang:
+                    self._conn.execute('UPDATE jawaban SET diakses = ? WHERE kunci = ?', (sekarang, key))
+                    self.hits += 1
+                    return nilai
+                self._conn.execute('DELETE FROM jawaban WHERE kunci = ?', (key,))
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        sekarang = self.timer()
+        kedaluwarsa = sekarang + self.ttl if self.ttl else None
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO jawaban VALUES (?, ?, ?, ?)', (key, value, kedaluwarsa, sekarang))
+            if self._jumlah() > self.maxsize:
+                # Buang yang kedaluwarsa dulu, lalu yang paling lama tidak diakses
+                self._conn.execute('DELETE FROM jawaban WHERE kedaluwarsa <= ?', (sekarang,))
+                lebih = self._jumlah() - self.maxsize
+                if lebih > 0:
+                    self._conn.execute('DELETE FROM jawaban WHERE kunci IN '
+                                       '(SELECT kunci FROM jawaban ORDER BY diakses LIMIT ?)', (lebih,))
+
+    def _jumlah(self):
+        return self._conn.execute('SELECT COUNT(*) FROM jawaban').fetchone()[0]
+
+    def _mulai(self, key):
+        # -> (proses, True) jika pemanggil ini yang harus memanggil upstream
+        with self._lock:
+            proses = self._proses.get(key)
+            if proses is not None:
+                return proses, False
+            proses = self._proses[key] = _Proses()
+            return proses, True
+
+    def _simpan(self, key, nilai):
+        # Gagal menulis ke SQLite (disk penuh, database terkunci) tidak menggagalkan jawaban
+        try:
+            self.set(key, nilai)
+        except sqlite3.Error:
+            pass
+
+    def _akhiri(self, key, proses, nilai=None, error=None):
+        # Event selalu diset, agar pemanggil yang menunggu tidak tertahan selamanya
+        try:
+            if error is None:
+                self._simpan(key, nilai)
+        finally:
+            proses.nilai, proses.error = nilai, error
+            with self._lock:
+                self._proses.pop(key, None)
+            proses.selesai.set()
+
+    def _tunggu(self, proses):
+        # -> nilai, None jika request pemimpin dibatalkan (pemanggil perlu mencoba sendiri),
+        # atau _HABIS jika pemimpin belum selesai dalam batas waktu
+        if not proses.selesai.wait(self.tunggu):
+            return _HABIS
+        if isinstance(proses.error, Exception):
+            raise proses.error
+        return proses.nilai
+
+    def get_or_compute(self, key, compute):
+        nilai = self.get(key)
+        if nilai is not None:
+            return nilai
+        proses, pemimpin = self._mulai(key)
+        while not pemimpin:
+            nilai = self._tunggu(proses)
+            if nilai is _HABIS:
+                # Request pemimpin macet: panggil upstream sendiri tanpa ikut menunggu
+                nilai = compute()
+                self._simpan(key, nilai)
+                return nilai
+            if nilai is not None:
+                return nilai
+            proses, pemimpin = self._mulai(key)
+        try:
+            nilai = compute()
+        except BaseException as e:
+            self._akhiri(key, proses, error=e)
+            raise
+        self._akhiri(key, proses, nilai)
+        return nilai
+
+    def stream_or_compute(self, key, stream):
+        """Seperti get_or_compute, tetapi untuk generator potongan teks (jawaban streaming).
+
+        Jawaban dari cache atau dari request yang sedang berjalan di sesi lain dikembalikan utuh
+        sebagai satu potongan; jika tidak ada, potongan dari stream() diteruskan sambil dikumpulkan.
+        """
+        nilai = self.get(key)
+        if nilai is not None:
+            yield nilai
+            return
+        proses, pemimpin = self._mulai(key)
+        while not pemimpin:
+            nilai = self._tunggu(proses)
+            if nilai is _HABIS:
+                potongan = []
+                for teks in stream():
+                    potongan.append(teks)
+                    yield teks
+                self._simpan(key, ''.join(potongan))
+                return
+            if nilai is not None:
+                yield nilai
+                return
+            proses, pemimpin = self._mulai(key)
+        potongan = []
+        try:
+            for teks in stream():
+                potongan.append(teks)
+                yield teks
+        except BaseException as e:
+            # Termasuk GeneratorExit jika pembaca berhenti di tengah jalan: jawaban tidak lengkap tidak disimpan
+            self._akhiri(key, proses, error=e)
+            raise
+        self._akhiri(key, proses, ''.join(potongan))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM jawaban')
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        with self._lock:
+            return self._jumlah()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'size': len(self),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+        }
+
+
+_lock = threading.Lock()
+_cache = None
+
+
+def get_llm_cache():
+    # Satu koneksi per proses, dipakai bersama oleh semua sesi
+    global _cache
+    if _cache is None:
+        with _lock:
+            if _cache is None:
+                _cache = LLMCache()
+    return _cache
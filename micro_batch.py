@@ -0,0 +1,234 @@
+import argparse
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+# Jendela pengumpulan request (milidetik) dan ukuran batch maksimum, bisa diatur lewat env.
+# PREDIKSI_BATCH_WINDOW_MS=0 mematikan micro-batching (setiap request langsung ke model).
+BATCH_WINDOW_MS = float(os.environ.get('PREDIKSI_BATCH_WINDOW_MS', 2))
+BATCH_MAKS = int(os.environ.get('PREDIKSI_BATCH_MAKS', 64))
+# Batas waktu (detik) menunggu hasil batch sebelum pemanggil menyerah
+BATCH_TIMEOUT = float(os.environ.get('PREDIKSI_BATCH_TIMEOUT', 30))
+
+
+class MicroBatcher:
+    """Menggabungkan request prediksi satu baris dari banyak thread menjadi satu batch.
+
+    Request yang sudah mengantri saat thread batch siap diambil sekaligus. Jika hanya ada satu
+    (misalnya satu klik di app), request itu langsung diproses tanpa menunggu. Jika ada lebih dari
+    satu (beban bersamaan), jendela max_wait detik dibuka untuk mengumpulkan request berikutnya
+    (maksimal max_batch). Satu batch dijalankan dengan satu pemanggilan proses_batch(mobil, tahun,
+    harga_baru), lalu hasilnya dibagikan kembali ke masing-masing pemanggil. proses_batch harus
+    mengembalikan satu nilai per baris (NaN jika gagal).
+    """
+
+    def __init__(self, proses_batch, max_batch=BATCH_MAKS, max_wait=BATCH_WINDOW_MS / 1000, timeout=BATCH_TIMEOUT):
+        self.proses_batch = proses_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.timeout = timeout
+        self.jumlah_batch = 0
+        self.jumlah_baris = 0
+        self._antrian = queue.SimpleQueue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _mulai(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name='micro-batch', daemon=True)
+                self._thread.start()
+
+    def submit(self, mobil, tahun, harga_baru):
+        # Input dikonversi di thread pemanggil: baris yang tidak valid gagal di sini (ValueError/
+        # TypeError) dan tidak ikut menggagalkan batch milik pemanggil lain
+        baris = (str(mobil), float(tahun), float(harga_baru))
+        if self._thread is None:
+            self._mulai()
+        future = Future()
+        self._antrian.put(baris + (future,))
+        return future
+
+    def predict(self, mobil, tahun, harga_baru):
+        # concurrent.futures.TimeoutError jika batch tidak selesai dalam self.timeout detik
+        return self.submit(mobil, tahun, harga_baru).result(self.timeout)
+
+    def _kumpulkan(self):
+        # Tunggu request pertama, lalu ambil yang sudah mengantri tanpa menunggu
+        batch = [self._antrian.get()]
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._antrian.get_nowait())
+            except queue.Empty:
+                break
+        if len(batch) == 1:
+            return batch
+        # Ada request bersamaan: kumpulkan sisanya sampai jendela habis atau batch penuh
+        batas = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            sisa = batas - time.monotonic()
+            if sisa <= 0:
+                break
+            try:
+                batch.append(self._antrian.get(timeout=sisa))
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._kumpulkan()
+            mobil, tahun, harga_baru, futures = zip(*batch)
+            error = None
+            try:
+                hasil = self.proses_batch(list(mobil), np.array(tahun), np.array(harga_baru))
+                if len(hasil) != len(futures):
+                    raise RuntimeError(f"proses_batch mengembalikan {len(hasil)} hasil untuk {len(futures)} baris")
+                self.jumlah_batch += 1
+                self.jumlah_baris += len(batch)
+                for f, h in zip(futures, hasil):
+                    f.set_result(float(h))
+            except BaseException as e:
+                error = e
+                if not isinstance(e, Exception):
+                    # Thread berhenti; submit berikutnya memulai thread baru
+                    self._thread = None
+                    raise
+            finally:
+                # Setiap future selalu diselesaikan, termasuk saat thread dihentikan (BaseException)
+                for f in futures:
+                    if not f.done():
+                        f.set_exception(error if isinstance(error, Exception)
+                                        else RuntimeError('Thread micro-batch berhenti sebelum batch selesai'))
+
+    def stats(self):
+        return {
+            'batch': self.jumlah_batch,
+            'baris': self.jumlah_baris,
+            'rata2_ukuran_batch': self.jumlah_baris / self.jumlah_batch if self.jumlah_batch else 0.0,
+            'max_batch': self.max_batch,
+            'window_ms': self.max_wait * 1000,
+        }
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def get_batcher():
+    # Satu batcher per proses (None jika micro-batching dimatikan)
+    global _batcher
+    if BATCH_WINDOW_MS <= 0:
+        return None
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                from prediksi import predict_many
+                _batcher = MicroBatcher(lambda m, t, h: predict_many(m, t, h, gunakan_tabel=False))
+    return _batcher
+
+
+def predict_one(mobil, tahun, harga_baru):
+    # Pengganti prediksi.predict_one untuk pemanggil yang berjalan bersamaan (sesi Streamlit,
+    # server multi-thread). Lookup tabel_prediksi (mikrodetik) tetap langsung; hanya input yang
+    # butuh model yang masuk antrian batch. Hasil sama dengan prediksi.predict_one.
+    from encoder import get_encoder
+    from prediksi import MobilTidakDikenal, predict_one as predict_langsung
+    from tabel_prediksi import load_tabel
+
+    batcher = get_batcher()
+    if batcher is None:
+        return predict_langsung(mobil, tahun, harga_baru)
+    tabel = load_tabel()
+    if tabel is not None:
+        harga = tabel.lookup(mobil, tahun, harga_baru)
+        if harga is not None:
+            return harga
+    # Validasi sebelum masuk antrian, sehingga NaN dari batch berarti hasil model tidak valid
+    if get_encoder().index_of(mobil) < 0:
+        raise MobilTidakDikenal(mobil)
+    if not (np.isfinite(float(tahun)) and np.isfinite(float(harga_baru))):
+        raise ValueError(f"Tahun dan harga baru harus berupa angka: {tahun!r}, {harga_baru!r}")
+    harga = batcher.predict(mobil, tahun, harga_baru)
+    if np.isnan(harga):
+        raise ValueError(f"Model tidak menghasilkan prediksi untuk '{mobil}' ({tahun}, {harga_baru})")
+    return harga
+
+
+def _ukur(fungsi, input_, threads):
+    # Jalankan semua input dari beberapa thread sekaligus; return (latensi per request, durasi total, hasil)
+    latensi = np.empty(len(input_))
+    hasil = np.empty(len(input_))
+    berikut = iter(range(len(input_)))
+    kunci = threading.Lock()
+
+    def pekerja():
+        while True:
+            with kunci:
+                i = next(berikut, None)
+            if i is None:
+                return
+            mulai = time.perf_counter()
+            hasil[i] = fungsi(*input_[i])
+            latensi[i] = time.perf_counter() - mulai
+
+    mulai = time.perf_counter()
+    semua = [threading.Thread(target=pekerja) for _ in range(threads)]
+    for t in semua:
+        t.start()
+    for t in semua:
+        t.join()
+    return latensi, time.perf_counter() - mulai, hasil
+
+
+def benchmark(jumlah=5000, threads=32, windows=(0, 0.5, 1, 2, 5), max_batch=BATCH_MAKS, gunakan_tabel=False, seed=0):
+    from encoder import get_encoder
+    from prediksi import predict_many, predict_one as predict_langsung
+
+    rng = np.random.default_rng(seed)
+    nama = list(get_encoder().nama_asli.values())
+    input_ = [(nama[rng.integers(len(nama))], int(rng.integers(2005, 2026)), float(rng.uniform(1.5e8, 1.5e9)))
+              for _ in range(jumlah)]
+    referensi = np.array([predict_langsung(*x, gunakan_tabel=gunakan_tabel) for x in input_])
+
+    def proses(m, t, h):
+        return predict_many(m, t, h, gunakan_tabel=gunakan_tabel)
+
+    baris = []
+    for window in windows:
+        if window <= 0:
+            batcher = None
+            latensi, durasi, hasil = _ukur(lambda *x: predict_langsung(*x, gunakan_tabel=gunakan_tabel), input_, threads)
+        else:
+            batcher = MicroBatcher(proses, max_batch=max_batch, max_wait=window / 1000)
+            latensi, durasi, hasil = _ukur(batcher.predict, input_, threads)
+        baris.append({
+            'window_ms': window,
+            'throughput': jumlah / durasi,
+            'p50_ms': float(np.percentile(latensi, 50) * 1000),
+            'p99_ms': float(np.percentile(latensi, 99) * 1000),
+            'rata2_ukuran_batch': batcher.stats()['rata2_ukuran_batch'] if batcher else 1.0,
+            'selisih_maks': float(np.max(np.abs(hasil - referensi))),
+        })
+    return baris
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Ukur latensi dan throughput prediksi dengan/tanpa micro-batching.')
+    parser.add_argument('--jumlah', type=int, default=5000, help='Jumlah request')
+    parser.add_argument('--threads', type=int, default=32, help='Jumlah pemanggil bersamaan')
+    parser.add_argument('--windows', type=float, nargs='+', default=[0, 0.5, 1, 2, 5],
+                        help='Jendela batch (ms) yang diuji; 0 = tanpa batching')
+    parser.add_argument('--max-batch', type=int, default=BATCH_MAKS)
+    parser.add_argument('--tabel', action='store_true', help='Pakai tabel_prediksi seperti app (default: model langsung)')
+    args = parser.parse_args()
+
+    print(f"{args.jumlah} request dari {args.threads} thread, max batch {args.max_batch}")
+    print(f"{'window':>8} {'req/detik':>10} {'p50 (ms)':>9} {'p99 (ms)':>9} {'batch':>7} {'selisih':>9}")
+    for b in benchmark(args.jumlah, args.threads, args.windows, args.max_batch, args.tabel):
+        print(f"{b['window_ms']:>6.1f}ms {b['throughput']:>10.0f} {b['p50_ms']:>9.2f} {b['p99_ms']:>9.2f} "
+              f"{b['rata2_ukuran_batch']:>7.1f} {b['selisih_maks']:>9.2g}")
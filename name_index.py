@@ -0,0 +1,98 @@
+import threading
+from collections import defaultdict
+
+import numpy as np
+from fuzzywuzzy import fuzz, utils
+
+N_GRAM = 3
+
+
+def _ngrams(teks, n=N_GRAM):
+    # Padding spasi supaya awal/akhir kata juga punya n-gram sendiri
+    teks = f' {teks} '
+    return {teks[i:i + n] for i in range(len(teks) - n + 1)}
+
+
+class NameIndex:
+    """Index n-gram untuk fuzzy matching nama mobil.
+
+    Skornya sama dengan process.extractOne (full_process + fuzz.WRatio, score_cutoff
+    sama), tetapi WRatio hanya dihitung untuk kandidat yang berbagi cukup banyak
+    trigram dengan query, bukan untuk seluruh katalog. Ini pendekatan: nama dengan
+    overlap di bawah `min_overlap`, atau di bawah overlap kandidat ke-`max_kandidat`,
+    tidak dinilai walaupun WRatio-nya bisa lebih tinggi. Kandidat yang overlap-nya
+    seri dengan batas itu tetap dinilai semua (mis. query merek saja seperti "toyota"),
+    dan query yang lebih pendek dari satu trigram dinilai terhadap seluruh katalog.
+    """
+
+    def __init__(self, names, max_kandidat=32, min_overlap=0.3):
+        self.names = list(dict.fromkeys(str(n) for n in names))
+        self.processed = [utils.full_process(n) for n in self.names]
+        self.max_kandidat = max_kandidat
+        self.min_overlap = min_overlap
+
+        self.exact = {}
+        for i, p in enumerate(self.processed):
+            self.exact.setdefault(p, i)
+
+        postings = defaultdict(list)
+        for i, p in enumerate(self.processed):
+            for g in _ngrams(p):
+                postings[g].append(i)
+        self.postings = {g: np.array(ids, dtype=np.int32) for g, ids in postings.items()}
+
+    def __len__(self):
+        return len(self.names)
+
+    def _kandidat(self, q):
+        if len(q) < N_GRAM:
+            # Terlalu pendek untuk disaring dengan trigram
+            return np.arange(len(self.names))
+        grams = [g for g in _ngrams(q) if g in self.postings]
+        if not grams:
+            return np.arange(0)
+        overlap = np.bincount(np.concatenate([self.postings[g] for g in grams]), minlength=len(self.names))
+        batas = max(1, int(self.min_overlap * len(_ngrams(q))))
+        idx = np.nonzero(overlap >= batas)[0]
+        if len(idx) > self.max_kandidat:
+            # Ambil overlap terbanyak; kandidat yang seri dengan kandidat ke-max_kandidat ikut dinilai
+            minimal = np.sort(overlap[idx])[::-1][self.max_kandidat - 1]
+            idx = idx[overlap[idx] >= minimal]
+        return idx
+
+    def extract(self, query, limit=5, score_cutoff=0):
+        q = utils.full_process(query)
+        if not q:
+            return []
+        i = self.exact.get(q)
+        if i is not None and limit == 1:
+            return [(self.names[i], 100)]
+
+        hasil = []
+        for i in self._kandidat(q):
+            score = fuzz.WRatio(q, self.processed[i], full_process=False)
+            if score >= score_cutoff:
+                hasil.append((score, -i))
+        hasil.sort(reverse=True)
+        return [(self.names[-i], score) for score, i in hasil[:limit]]
+
+    def extract_one(self, query, score_cutoff=0):
+        hasil = self.extract(query, limit=1, score_cutoff=score_cutoff)
+        return hasil[0] if hasil else None
+
+
+_lock = threading.Lock()
+_indexes = {}
+
+
+def get_name_index(key, names_fn):
+    # Satu index per versi data; dibangun sekali lalu dipakai bersama oleh semua sesi
+    index = _indexes.get(key)
+    if index is None:
+        with _lock:
+            index = _indexes.get(key)
+            if index is None:
+                index = NameIndex(names_fn())
+                _indexes.clear()
+                _indexes[key] = index
+    return index
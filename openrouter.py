@@ -0,0 +1,143 @@
+import argparse
+import json
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Semua bisa diatur lewat environment variable; base URL bisa diarahkan ke server mock lokal
+OPENROUTER_BASE_URL = os.environ.get('OPENROUTER_BASE_URL', 'https://openrouter.ai/api/v1')
+MODEL_NAME = os.environ.get('OPENROUTER_MODEL', 'microsoft/mai-ds-r1:free')
+CONNECT_TIMEOUT = float(os.environ.get('OPENROUTER_CONNECT_TIMEOUT', 5))
+# Untuk streaming, batas waktu menunggu potongan token berikutnya (bukan total jawaban)
+READ_TIMEOUT = float(os.environ.get('OPENROUTER_READ_TIMEOUT', 60))
+MAX_RETRIES = int(os.environ.get('OPENROUTER_MAX_RETRIES', 3))
+BACKOFF = float(os.environ.get('OPENROUTER_BACKOFF', 1.0))
+
+STATUS_RETRY = (429, 500, 502, 503, 504)
+
+
+class OpenRouterError(Exception):
+    pass
+
+
+class OpenRouterClient:
+    """Client chat completions dengan Session keep-alive, timeout, dan retry.
+
+    Request yang gagal dengan status 429/5xx (atau gagal koneksi) dicoba ulang dengan
+    backoff eksponensial, menghormati header Retry-After. stream() mengembalikan
+    potongan teks satu per satu dari respons SSE.
+    """
+
+    def __init__(self, api_key, base_url=OPENROUTER_BASE_URL, model=MODEL_NAME,
+                 timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), max_retries=MAX_RETRIES, backoff=BACKOFF,
+                 pool_size=8):
+        self.api_key = api_key
+        self.url = base_url.rstrip('/') + '/chat/completions'
+        self.model = model
+        self.timeout = timeout
+
+        retry = Retry(total=max_retries, connect=max_retries, read=0, status=max_retries,
+                      backoff_factor=backoff, status_forcelist=STATUS_RETRY,
+                      allowed_methods=frozenset(['POST']), respect_retry_after_header=True,
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "https://your-site.com",
+            "X-Title": "Chatbot Mobil Bekas",
+        })
+
+    def _post(self, messages, stream):
+        data = {"model": self.model, "messages": messages}
+        if stream:
+            data["stream"] = True
+        try:
+            response = self.session.post(self.url, data=json.dumps(data), timeout=self.timeout, stream=stream)
+        except requests.RequestException as e:
+            raise OpenRouterError(f"Gagal menghubungi OpenRouter: {e}") from e
+        if response.status_code != 200:
+            raise OpenRouterError(f"{response.status_code} - {response.text}")
+        return response
+
+    def chat(self, messages):
+        response = self._post(messages, stream=False)
+        try:
+            return response.json()['choices'][0]['message']['content']
+        except (ValueError, KeyError, IndexError) as e:
+            raise OpenRouterError(f"Respons tidak dikenal: {response.text[:200]}") from e
+
+    def stream(self, messages):
+        response = self._post(messages, stream=True)
+        selesai = False
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                # Baris kosong memisahkan event, baris ":" adalah komentar keep-alive.
+                # Setelah [DONE] sisa body tetap dibaca agar koneksi bisa dipakai ulang.
+                if selesai or not line or not line.startswith('data:'):
+                    continue
+                data = line[len('data:'):].strip()
+                if data == '[DONE]':
+                    selesai = True
+                    continue
+                try:
+                    event = json.loads(data)
+                except ValueError:
+                    continue
+                if 'error' in event:
+                    raise OpenRouterError(str(event['error'].get('message', event['error'])))
+                for choice in event.get('choices', []):
+                    teks = (choice.get('delta') or {}).get('content')
+                    if teks:
+                        yield teks
+        except requests.RequestException as e:
+            raise OpenRouterError(f"Koneksi terputus saat streaming: {e}") from e
+        finally:
+            response.close()
+
+
+def pesan(prompt_awal, pertanyaan):
+    return [
+        {"role": "system", "content": prompt_awal},
+        {"role": "user", "content": pertanyaan},
+    ]
+
+
+_clients = {}
+_lock = threading.Lock()
+
+
+def get_client(api_key, base_url=OPENROUTER_BASE_URL, model=MODEL_NAME):
+    # Satu client (dan pool koneksinya) per proses, dipakai bersama oleh semua sesi
+    key = (api_key, base_url, model)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = OpenRouterClient(api_key, base_url=base_url, model=model)
+    return client
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Uji koneksi ke endpoint chat completions (OpenRouter atau mock lokal).')
+    parser.add_argument('pertanyaan')
+    parser.add_argument('--base-url', default=OPENROUTER_BASE_URL)
+    parser.add_argument('--model', default=MODEL_NAME)
+    parser.add_argument('--tanpa-stream', action='store_true')
+    args = parser.parse_args()
+
+    client = OpenRouterClient(os.environ.get('OPENROUTER_API_KEY', ''), base_url=args.base_url, model=args.model)
+    messages = pesan("Jawab singkat.", args.pertanyaan)
+    if args.tanpa_stream:
+        print(client.chat(messages))
+    else:
+        for teks in client.stream(messages):
+            print(teks, end='', flush=True)
+        print()
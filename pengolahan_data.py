@@ -0,0 +1,177 @@
+import argparse
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from artifacts import ARTIFACT_DIR
+from encoder import TAHUN_SEKARANG
+
+# Pipeline "Pengolahan Data" dari notebook: hasil scraping mentah -> artefak yang dimuat app.py.
+# Semua langkah per baris (apply/lambda) diganti operasi string/NumPy atas seluruh kolom, dan
+# fuzzy matching hanya dijalankan sekali per nama unik, bukan per listing.
+
+BEKAS_FILE = os.path.join('Scraping', 'data_mobil_toyota_semua_halaman.csv')
+BARU_FILE = os.path.join('Scraping', 'data_mobil_toyota_baru_semua_halaman.csv')
+
+HARGA_BEKAS_MINIMUM = 20_000_000
+SKOR_COCOK_MINIMUM = 90
+TAHUN_DEPRESIASI_VALID = 2021
+KOLOM_DATA_MOBIL = ['Mobil_Bekas', 'Tahun', 'Harga_Bekas', 'Harga_Baru', 'Depresiasi_%', 'Link']
+
+# "Rp 455.000.000" / "Rp 1,550,000,000" (regex yang sama dengan notebook)
+_RE_HARGA = r'Rp\s*(\d{1,3}(?:[.,]\d{3})*)'
+# "Rp 150 Juta" / "Rp 1,5 Miliar" / "Rp 95 jt"
+_RE_HARGA_SATUAN = r'(?i)Rp\s*(\d+(?:[.,]\d+)?)\s*(juta|jt|miliar|milyar|m)\b'
+_SATUAN = {'juta': 1e6, 'jt': 1e6, 'miliar': 1e9, 'milyar': 1e9, 'm': 1e9}
+
+
+def parse_harga(harga):
+    # Kolom Harga mentah -> float (NaN jika tidak ada harga)
+    harga = pd.Series(harga).astype('string')
+    angka = harga.str.extract(_RE_HARGA, expand=False).str.replace(r'[.,]', '', regex=True)
+    hasil = pd.to_numeric(angka, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+
+    satuan = harga.str.extract(_RE_HARGA_SATUAN)
+    ada_satuan = satuan[0].notna().to_numpy()
+    if ada_satuan.any():
+        nilai = pd.to_numeric(satuan.loc[ada_satuan, 0].str.replace(',', '.', regex=False), errors='coerce')
+        pengali = satuan.loc[ada_satuan, 1].str.lower().map(_SATUAN)
+        hasil[ada_satuan] = (nilai * pengali).to_numpy(dtype=float, na_value=np.nan)
+    return hasil
+
+
+def bersihkan_judul(judul):
+    # Hapus tahun di awal dan teks setelah tanda "-"
+    return (pd.Series(judul).astype(str)
+            .str.replace(r'^\d{4}\s+', '', regex=True)
+            .str.replace(r'\s*-\s*.*$', '', regex=True))
+
+
+def ekstrak_tahun(df):
+    # Tahun dari kolom Tahun hasil scraping; jika "N/A"/kosong, diambil dari 4 digit awal judul
+    tahun = pd.to_numeric(df['Tahun'], errors='coerce')
+    if tahun.isna().any() and 'Judul' in df:
+        dari_judul = pd.to_numeric(df['Judul'].astype(str).str.extract(r'^(\d{4})', expand=False), errors='coerce')
+        tahun = tahun.fillna(dari_judul)
+    return tahun
+
+
+def normalisasi_listing(df, dedup=True):
+    # Hasil scraping (Judul, Harga, Tahun, Link) -> (Mobil, Harga, Tahun, Link), format df_bekas.pkl/df_baru.pkl
+    df = df.copy()
+    if 'Status' in df:
+        # Hasil scraping inkremental menyimpan listing yang sudah hilang dari situs dengan Status 'dihapus'
+        df = df[df['Status'] != 'dihapus']
+    df['Tahun'] = ekstrak_tahun(df)
+    df = df[df['Tahun'].notna()]
+    df['Tahun'] = df['Tahun'].astype('int64')
+    if 'Judul' in df:
+        df['Judul'] = bersihkan_judul(df['Judul'])
+        df = df.rename(columns={'Judul': 'Mobil'})
+    if dedup:
+        # Listing yang sama bisa muncul di dua halaman jika urutan situs bergeser saat scraping
+        punya_link = df['Link'].notna() & (df['Link'] != 'N/A')
+        df = df[~(punya_link & df.duplicated('Link'))]
+    return df[['Mobil', 'Harga', 'Tahun', 'Link']].reset_index(drop=True)
+
+
+def _extract_one():
+    try:
+        from rapidfuzz import fuzz, process
+    except ImportError:
+        from fuzzywuzzy import fuzz, process
+
+    def cocok(nama, pilihan):
+        hasil = process.extractOne(nama, pilihan, scorer=fuzz.token_sort_ratio)
+        return hasil[0] if hasil and hasil[1] >= SKOR_COCOK_MINIMUM else None
+
+    return cocok
+
+
+def cocokkan_mobil(nama_bekas, nama_baru):
+    # Fuzzy matching nama mobil bekas -> nama mobil baru, dihitung sekali per nama unik
+    cocok = _extract_one()
+    nama_baru = list(nama_baru)
+    codes, unik = pd.factorize(pd.Series(nama_bekas))
+    hasil = np.array([cocok(nama, nama_baru) for nama in unik] + [None], dtype=object)
+    return hasil[codes]
+
+
+def hitung_depresiasi_tahun(df):
+    df_depresiasi_tahun = df.groupby('Tahun')['Depresiasi_%'].mean().reset_index()
+    sebelumnya = df_depresiasi_tahun['Depresiasi_%'].shift(1)
+    perbedaan = (sebelumnya - df_depresiasi_tahun['Depresiasi_%']).abs()
+    # Digeser ke atas satu baris agar lebih mudah dibaca (sama seperti notebook)
+    df_depresiasi_tahun['Perbedaan_Depresiasi'] = perbedaan.shift(-1)
+    df_depresiasi_tahun['Peningkatan_Depresiasi_%'] = (perbedaan / sebelumnya * 100).shift(-1)
+    return df_depresiasi_tahun
+
+
+def bangun_data_mobil(df_bekas, df_baru):
+    # Gabungkan harga bekas dengan harga baru tertinggi per (mobil, tahun), lalu lengkapi
+    # Harga_Baru yang kosong dengan estimasi dari rata-rata depresiasi per tahun
+    bekas = df_bekas.assign(Harga_Bekas=parse_harga(df_bekas['Harga'])).drop(columns='Harga')
+    baru = (df_baru.assign(Harga_Baru=parse_harga(df_baru['Harga']))
+            .groupby(['Mobil', 'Tahun'], as_index=False)['Harga_Baru'].max())
+
+    bekas['Mobil_Cocok'] = cocokkan_mobil(bekas['Mobil'], baru['Mobil'].unique())
+    df = bekas.merge(baru, left_on=['Mobil_Cocok', 'Tahun'], right_on=['Mobil', 'Tahun'], how='left')
+    df = df.rename(columns={'Mobil_x': 'Mobil_Bekas', 'Mobil_y': 'Mobil_Baru'})
+    df['Depresiasi_%'] = (100 * (df['Harga_Baru'] - df['Harga_Bekas']) / df['Harga_Baru']).round(2)
+
+    df = df[df['Harga_Bekas'].notna() & (df['Harga_Bekas'] >= HARGA_BEKAS_MINIMUM)].reset_index(drop=True)
+
+    # Depresiasi tahun 2021-2025 dari data yang punya harga baru; rata-ratanya jadi default tahun lain
+    depresiasi = df.groupby('Tahun')['Depresiasi_%'].mean() / 100
+    depresiasi = depresiasi[depresiasi.index >= TAHUN_DEPRESIASI_VALID]
+    default_depresiasi = np.mean(depresiasi.to_numpy())
+    dep = df['Tahun'].map(depresiasi).fillna(default_depresiasi).to_numpy()
+
+    kosong = df['Harga_Baru'].isna().to_numpy()
+    umur = (TAHUN_SEKARANG - df['Tahun']).to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        estimasi = df['Harga_Bekas'].to_numpy() / ((1 - dep) ** umur)
+    df.loc[kosong, 'Harga_Baru'] = estimasi[kosong]
+
+    dep_kosong = df['Depresiasi_%'].isna()
+    df.loc[dep_kosong, 'Depresiasi_%'] = ((df['Harga_Baru'] - df['Harga_Bekas']) / df['Harga_Baru'] * 100)[dep_kosong]
+    return df
+
+
+def proses(df_bekas_mentah, df_baru_mentah, dedup=True):
+    df_bekas = normalisasi_listing(df_bekas_mentah, dedup=dedup)
+    df_baru = normalisasi_listing(df_baru_mentah, dedup=dedup)
+    df = bangun_data_mobil(df_bekas, df_baru)
+
+    df_model = df[['Mobil_Bekas', 'Tahun', 'Harga_Baru', 'Harga_Bekas']].dropna()
+    return {
+        'df_bekas': df_bekas,
+        'df_baru': df_baru,
+        'data_mobil': df[KOLOM_DATA_MOBIL],
+        'df_depresiasi_tahun': hitung_depresiasi_tahun(df),
+        'nama_mobil_list': df_model['Mobil_Bekas'].str.strip().unique().tolist(),
+    }
+
+
+def simpan(hasil, output_dir=ARTIFACT_DIR):
+    hasil['data_mobil'].to_csv(os.path.join(output_dir, 'data_mobil.csv'), index=False)
+    for nama in ['df_bekas', 'df_baru', 'df_depresiasi_tahun', 'nama_mobil_list']:
+        joblib.dump(hasil[nama], os.path.join(output_dir, nama + '.pkl'))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Olah hasil scraping menjadi artefak yang dimuat app.py.')
+    parser.add_argument('--bekas', default=os.path.join(ARTIFACT_DIR, BEKAS_FILE))
+    parser.add_argument('--baru', default=os.path.join(ARTIFACT_DIR, BARU_FILE))
+    parser.add_argument('--output-dir', default=ARTIFACT_DIR)
+    parser.add_argument('--tanpa-dedup', action='store_true', help='Jangan buang listing dengan Link yang sama')
+    args = parser.parse_args()
+
+    mulai = time.perf_counter()
+    hasil = proses(pd.read_csv(args.bekas), pd.read_csv(args.baru), dedup=not args.tanpa_dedup)
+    simpan(hasil, args.output_dir)
+    print(f"Selesai! {len(hasil['df_bekas'])} listing bekas dan {len(hasil['df_baru'])} listing baru diolah menjadi "
+          f"{len(hasil['data_mobil'])} baris data_mobil.csv dalam {time.perf_counter() - mulai:.2f} detik")
@@ -0,0 +1,184 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from artifacts import load_artifact
+from encoder import MobilTidakDikenal, get_encoder
+from fused_model import FUSED_MODEL_FILE, FusedPredictor
+from tabel_prediksi import load_tabel
+
+KOLOM_HASIL = 'Prediksi_Harga_Bekas'
+
+
+def _scale(scaler, X):
+    # MinMaxScaler: X * scale_ + min_, dikerjakan in-place pada buffer yang sudah ada
+    if hasattr(scaler, 'scale_') and hasattr(scaler, 'min_'):
+        X *= scaler.scale_
+        X += scaler.min_
+        return X
+    return scaler.transform(X)
+
+
+_cocok_cache = {}
+
+
+def _fused_predictor():
+    # model_fused.npz (hasil `python fused_model.py`) dipakai jika ada, sehingga TensorFlow tidak perlu diimpor.
+    # File yang dibuat dari feature_columns lain (basi, mis. setelah training ulang) diabaikan
+    # dan prediksi kembali ke model Keras, sama seperti load_tabel() mengecek versi_model.
+    try:
+        fused = load_artifact(FUSED_MODEL_FILE, loader=FusedPredictor.load)
+    except FileNotFoundError:
+        return None
+    feature_columns = load_artifact('feature_columns.pkl')
+    # Registry mengembalikan objek yang sama selama file tidak berubah, jadi hasil perbandingan cukup disimpan per pasangan objek
+    key = (id(fused), id(feature_columns))
+    cocok = _cocok_cache.get(key)
+    if cocok is None:
+        cocok = fused.feature_columns is not None and list(fused.feature_columns) == list(feature_columns)
+        _cocok_cache.clear()
+        _cocok_cache[key] = cocok
+    return fused if cocok else None
+
+
+def muat_model():
+    # Memuat model yang dipakai prediksi tanpa menjalankan prediksi: model_fused.npz, atau
+    # model Keras + scaler jika file fused tidak ada/basi
+    if _fused_predictor() is None:
+        for nama in ('model_prediksi_harga.pkl', 'scaler_X.pkl', 'scaler_y.pkl'):
+            load_artifact(nama)
+
+
+def _predict_scaled(X):
+    fused = _fused_predictor()
+    if fused is not None:
+        return fused.predict(X)
+
+    model = load_artifact('model_prediksi_harga.pkl')
+    scaler_X = load_artifact('scaler_X.pkl')
+    scaler_y = load_artifact('scaler_y.pkl')
+
+    X = _scale(scaler_X, X)
+    pred_scaled = model.predict(X, batch_size=len(X), verbose=0)
+    return scaler_y.inverse_transform(np.asarray(pred_scaled).reshape(-1, 1))[:, 0]
+
+
+def _predict_index(encoder, blok, idx, buffer=None):
+    fused = _fused_predictor()
+    if fused is not None:
+        return fused.predict_index(blok, idx, encoder.posisi_dense)
+    # Model Keras butuh matriks lengkap, dibentuk per chunk saja
+    return _predict_scaled(encoder.densify(blok, idx, out=buffer))
+
+
+def predict_one(mobil, tahun, harga_baru, gunakan_tabel=True):
+    # Raise MobilTidakDikenal jika nama mobil tidak ada di feature_columns.
+    # Jika tabel_prediksi.npy tersedia, hasil diambil dari tabel (interpolasi) dan model
+    # langsung hanya dipakai untuk input di luar jangkauan tabel.
+    if gunakan_tabel:
+        tabel = load_tabel()
+        if tabel is not None:
+            harga = tabel.lookup(mobil, tahun, harga_baru)
+            if harga is not None:
+                return harga
+
+    X = get_encoder().encode_one(mobil, tahun, harga_baru)
+    return float(_predict_scaled(X)[0])
+
+
+def predict_many(mobil, tahun, harga_baru, gunakan_tabel=True):
+    # Versi batch dari predict_one dengan jalur yang sama (tabel dulu, lalu model dense),
+    # sehingga setiap baris memberi hasil yang sama dengan predict_one. NaN untuk mobil tidak dikenal.
+    mobil = list(mobil)
+    tahun = np.asarray(tahun, dtype=np.float64)
+    harga_baru = np.asarray(harga_baru, dtype=np.float64)
+    hasil = np.full(len(mobil), np.nan)
+
+    sisa = np.arange(len(mobil))
+    tabel = load_tabel() if gunakan_tabel else None
+    if tabel is not None and len(mobil):
+        hasil[:] = tabel.lookup_batch(mobil, tahun, harga_baru)
+        sisa = np.nonzero(np.isnan(hasil))[0]
+
+    if len(sisa):
+        X, idx = get_encoder().encode([mobil[i] for i in sisa], tahun[sisa], harga_baru[sisa])
+        dikenal = idx >= 0
+        if dikenal.any():
+            hasil[sisa[dikenal]] = _predict_scaled(X[dikenal])
+    return hasil
+
+
+def predict_batch(mobil, tahun, harga_baru, chunk_size=4096):
+    # Selalu memakai model langsung (tanpa tabel_prediksi), dipakai build_tabel sebagai acuan.
+    # Baris dengan nama mobil yang tidak dikenal menghasilkan NaN
+    encoder = get_encoder()
+
+    mobil = list(mobil)
+    tahun = np.asarray(tahun)
+    harga_baru = np.asarray(harga_baru)
+    n = len(mobil)
+
+    hasil = np.empty(n, dtype=np.float64)
+    buffer = None
+    if _fused_predictor() is None:
+        buffer = np.zeros((min(chunk_size, max(n, 1)), encoder.n_features), dtype=np.float64)
+
+    # Satu pemanggilan model per chunk, urutan hasil sama dengan urutan input.
+    # Fitur disimpan sebagai blok numerik + indeks mobil (n x 4), bukan one-hot n x 310.
+    for start in range(0, n, chunk_size):
+        end = min(start + chunk_size, n)
+        blok, idx = encoder.encode_index(mobil[start:end], tahun[start:end], harga_baru[start:end])
+        hasil[start:end] = _predict_index(encoder, blok, idx, buffer)
+        hasil[start:end][idx < 0] = np.nan
+    return hasil
+
+
+def predict_dataframe(df, chunk_size=4096, gunakan_tabel=True):
+    # Jalur sama dengan predict_one/predict_many (tabel dulu, lalu model), sehingga hasil
+    # CSV sama dengan aplikasi dan layanan HTTP. gunakan_tabel=False: model langsung.
+    kolom_mobil = 'Mobil_Bekas' if 'Mobil_Bekas' in df.columns else 'Mobil'
+    mobil = df[kolom_mobil].astype(str).tolist()
+    tahun = df['Tahun'].to_numpy(dtype=np.float64)
+    harga_baru = df['Harga_Baru'].to_numpy(dtype=np.float64)
+    if not gunakan_tabel:
+        return predict_batch(mobil, tahun, harga_baru, chunk_size=chunk_size)
+
+    hasil = np.empty(len(mobil), dtype=np.float64)
+    for start in range(0, len(mobil), chunk_size):
+        end = min(start + chunk_size, len(mobil))
+        hasil[start:end] = predict_many(mobil[start:end], tahun[start:end], harga_baru[start:end])
+    return hasil
+
+
+def predict_csv(input_path, output_path, chunk_size=4096, gunakan_tabel=True):
+    # CSV dibaca per chunk agar inventaris besar tidak perlu dimuat sekaligus
+    total = 0
+    tidak_dikenal = 0
+    header = True
+    for df in pd.read_csv(input_path, chunksize=chunk_size):
+        df[KOLOM_HASIL] = predict_dataframe(df, chunk_size=chunk_size, gunakan_tabel=gunakan_tabel)
+        df.to_csv(output_path, mode='w' if header else 'a', header=header, index=False)
+        header = False
+        total += len(df)
+        tidak_dikenal += int(df[KOLOM_HASIL].isna().sum())
+    return total, tidak_dikenal
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Prediksi harga mobil bekas secara batch dari file CSV.')
+    parser.add_argument('input', help='CSV dengan kolom Mobil_Bekas (atau Mobil), Tahun, Harga_Baru')
+    parser.add_argument('output', help='CSV hasil dengan kolom tambahan ' + KOLOM_HASIL)
+    parser.add_argument('--chunk-size', type=int, default=4096)
+    parser.add_argument('--tanpa-tabel', action='store_true',
+                        help='Selalu pakai model langsung, bukan interpolasi tabel_prediksi.npy')
+    args = parser.parse_args()
+
+    mulai = time.perf_counter()
+    jumlah, tidak_dikenal = predict_csv(args.input, args.output, chunk_size=args.chunk_size,
+                                        gunakan_tabel=not args.tanpa_tabel)
+    durasi = time.perf_counter() - mulai
+    print(f"Selesai! {jumlah} baris diprediksi dalam {durasi:.2f} detik, disimpan ke '{args.output}'")
+    if tidak_dikenal:
+        print(f"Peringatan: {tidak_dikenal} baris memiliki nama mobil yang tidak dikenal (hasil kosong)")
@@ -0,0 +1,108 @@
+import argparse
+import os
+import threading
+import time
+
+import joblib
+import pandas as pd
+
+from artifacts import ARTIFACT_DIR, artifact_version, load_artifact
+from encoder import normalisasi_nama
+
+DATA_FILE = 'data_mobil.csv'
+STATISTIK_FILE = 'statistik_mobil.pkl'
+
+KOLOM_HARGA = ['Harga_Bekas', 'Harga_Baru']
+AGREGASI = {
+    'count': 'count',
+    'mean': 'mean',
+    'median': 'median',
+    'min': 'min',
+    'max': 'max',
+    'q25': lambda s: s.quantile(0.25),
+    'q75': lambda s: s.quantile(0.75),
+}
+
+
+def _agregasi(df, keys):
+    hasil = df.groupby(keys)[KOLOM_HARGA].agg(list(AGREGASI.values()))
+    hasil.columns = [f'{kolom}_{nama}' for kolom in KOLOM_HARGA for nama in AGREGASI]
+    return hasil
+
+
+def build_statistik(df):
+    # Statistik harga per (mobil, tahun) dan per mobil (semua tahun)
+    df = df[['Mobil_Bekas', 'Tahun'] + KOLOM_HARGA].copy()
+    df['Mobil_Bekas'] = df['Mobil_Bekas'].astype(str).map(normalisasi_nama)
+    return {
+        'per_tahun': _agregasi(df, ['Mobil_Bekas', 'Tahun']),
+        'per_mobil': _agregasi(df, ['Mobil_Bekas']),
+    }
+
+
+class StatistikIndex:
+    """Lookup statistik harga per (mobil, tahun) tanpa filter boolean atas seluruh data."""
+
+    def __init__(self, data):
+        self.versi_sumber = data.get('versi_sumber')
+        self.per_tahun = data['per_tahun']
+        self.per_mobil = data['per_mobil']
+        self._tahun = {(nama, int(tahun)): baris for (nama, tahun), baris
+                       in zip(self.per_tahun.index, self.per_tahun.to_dict('records'))}
+        self._mobil = dict(zip(self.per_mobil.index, self.per_mobil.to_dict('records')))
+
+    @classmethod
+    def load(cls, path):
+        return cls(joblib.load(path))
+
+    def get(self, mobil, tahun):
+        return self._tahun.get((normalisasi_nama(mobil), int(tahun)))
+
+    def mobil(self, mobil):
+        return self._mobil.get(normalisasi_nama(mobil))
+
+
+def simpan_statistik(df, versi_sumber, output=STATISTIK_FILE):
+    data = build_statistik(df)
+    data['versi_sumber'] = versi_sumber
+    joblib.dump(data, os.path.join(ARTIFACT_DIR, output))
+    return StatistikIndex(data)
+
+
+_lock = threading.Lock()
+
+
+def load_statistik(df=None, data_file=DATA_FILE):
+    # Memakai statistik_mobil.pkl jika dibangun dari versi data_mobil.csv yang sama.
+    # Jika belum ada/basi, dibangun ulang dari df (atau CSV) lalu disimpan di samping artefak lain.
+    versi = artifact_version(data_file)
+    try:
+        index = load_artifact(STATISTIK_FILE, loader=StatistikIndex.load)
+        if index.versi_sumber == versi:
+            return index
+    except FileNotFoundError:
+        pass
+
+    with _lock:
+        try:
+            index = load_artifact(STATISTIK_FILE, loader=StatistikIndex.load)
+            if index.versi_sumber == versi:
+                return index
+        except FileNotFoundError:
+            pass
+        if df is None:
+            df = pd.read_csv(os.path.join(ARTIFACT_DIR, data_file))
+        simpan_statistik(df, versi)
+        return load_artifact(STATISTIK_FILE, loader=StatistikIndex.load)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bangun index statistik harga per (mobil, tahun).')
+    parser.add_argument('--data', default=DATA_FILE)
+    args = parser.parse_args()
+
+    mulai = time.perf_counter()
+    df = pd.read_csv(os.path.join(ARTIFACT_DIR, args.data))
+    index = simpan_statistik(df, artifact_version(args.data))
+    print(f"Selesai! {len(index.per_tahun)} kombinasi (mobil, tahun) dan {len(index.per_mobil)} mobil "
+          f"disimpan ke '{STATISTIK_FILE}' dalam {time.perf_counter() - mulai:.2f} detik")
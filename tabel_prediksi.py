@@ -0,0 +1,153 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from artifacts import ARTIFACT_DIR, artifact_version, load_artifact
+from encoder import get_encoder, normalisasi_nama
+from fused_model import FUSED_MODEL_FILE
+
+TABEL_FILE = 'tabel_prediksi.npy'
+META_FILE = 'tabel_prediksi.json'
+
+TAHUN_MIN, TAHUN_MAX = 2005, 2025
+HARGA_MIN, HARGA_MAX = 100_000_000, 5_000_000_000
+JUMLAH_KNOT = 64
+
+
+def _model_file():
+    # Tabel dibangun dari model yang dipakai prediksi.py (fused jika ada)
+    if os.path.exists(os.path.join(ARTIFACT_DIR, FUSED_MODEL_FILE)):
+        return FUSED_MODEL_FILE
+    return 'model_prediksi_harga.pkl'
+
+
+class TabelPrediksi:
+    """Tabel prediksi untuk setiap (mobil, tahun) pada sejumlah knot harga baru.
+
+    Nilai di antara dua knot diinterpolasi linear (jaringan ReLU bersifat piecewise
+    linear terhadap harga baru). Array disimpan sebagai .npy dan dibaca dengan mmap.
+    """
+
+    def __init__(self, tabel, meta):
+        self.tabel = tabel
+        self.meta = meta
+        self.knots = np.asarray(meta['knots'], dtype=np.float64)
+        self.tahun_min = meta['tahun_min']
+        self.tahun_max = meta['tahun_max']
+        self.index_mobil = {normalisasi_nama(nama): i for i, nama in enumerate(meta['mobil'])}
+
+    @classmethod
+    def load(cls, path=TABEL_FILE):
+        path = os.path.join(ARTIFACT_DIR, path)
+        with open(os.path.splitext(path)[0] + '.json', encoding='utf-8') as f:
+            meta = json.load(f)
+        return cls(np.load(path, mmap_mode='r'), meta)
+
+    def lookup(self, mobil, tahun, harga_baru):
+        # Return None jika di luar jangkauan tabel, pemanggil harus memakai model langsung
+        i = self.index_mobil.get(normalisasi_nama(mobil))
+        tahun = int(tahun)
+        if i is None or not (self.tahun_min <= tahun <= self.tahun_max):
+            return None
+        knots = self.knots
+        if not (knots[0] <= harga_baru <= knots[-1]):
+            return None
+
+        j = min(int(np.searchsorted(knots, harga_baru, side='right')) - 1, len(knots) - 2)
+        w = (harga_baru - knots[j]) / (knots[j + 1] - knots[j])
+        baris = self.tabel[i, tahun - self.tahun_min]
+        return float(baris[j] * (1 - w) + baris[j + 1] * w)
+
+    def lookup_batch(self, mobil, tahun, harga_baru):
+        # Versi vektor; NaN untuk baris di luar jangkauan tabel
+        tahun = np.asarray(tahun, dtype=np.int64)
+        harga_baru = np.asarray(harga_baru, dtype=np.float64)
+        i = np.fromiter((self.index_mobil.get(normalisasi_nama(m), -1) for m in mobil), dtype=np.intp, count=len(tahun))
+        knots = self.knots
+        ok = (i >= 0) & (tahun >= self.tahun_min) & (tahun <= self.tahun_max) \
+            & (harga_baru >= knots[0]) & (harga_baru <= knots[-1])
+
+        hasil = np.full(len(tahun), np.nan)
+        idx = np.nonzero(ok)[0]
+        j = np.clip(np.searchsorted(knots, harga_baru[idx], side='right') - 1, 0, len(knots) - 2)
+        w = (harga_baru[idx] - knots[j]) / (knots[j + 1] - knots[j])
+        t = tahun[idx] - self.tahun_min
+        hasil[idx] = self.tabel[i[idx], t, j] * (1 - w) + self.tabel[i[idx], t, j + 1] * w
+        return hasil
+
+
+def load_tabel():
+    # None jika tabel belum dibangun atau dibangun dari model yang berbeda
+    try:
+        tabel = load_artifact(TABEL_FILE, loader=TabelPrediksi.load)
+    except FileNotFoundError:
+        return None
+    if tabel.meta.get('versi_model') != artifact_version(_model_file()):
+        return None
+    return tabel
+
+
+def build_tabel(jumlah_knot=JUMLAH_KNOT, harga_min=HARGA_MIN, harga_max=HARGA_MAX,
+                sampel_evaluasi=20000, output=TABEL_FILE):
+    from prediksi import predict_batch
+
+    encoder = get_encoder()
+    mobil = [encoder.nama_asli[key] for key in encoder.kolom_mobil]
+    tahun = np.arange(TAHUN_MIN, TAHUN_MAX + 1)
+    knots = np.geomspace(harga_min, harga_max, jumlah_knot)
+
+    grid_mobil = np.repeat(mobil, len(tahun))
+    grid_tahun = np.tile(tahun, len(mobil))
+    n = len(grid_mobil)
+
+    tabel = np.empty((len(mobil), len(tahun), jumlah_knot), dtype=np.float32)
+    for k, harga in enumerate(knots):
+        tabel[:, :, k] = predict_batch(grid_mobil, grid_tahun, np.full(n, harga)).reshape(len(mobil), len(tahun))
+
+    meta = {
+        'mobil': mobil,
+        'tahun_min': TAHUN_MIN,
+        'tahun_max': TAHUN_MAX,
+        'knots': knots.tolist(),
+        'versi_model': artifact_version(_model_file()),
+    }
+
+    # Error aproksimasi terhadap model langsung pada titik acak di antara knot
+    rng = np.random.default_rng(42)
+    pilih = rng.integers(0, n, sampel_evaluasi)
+    harga_acak = np.exp(rng.uniform(np.log(harga_min), np.log(harga_max), sampel_evaluasi))
+    live = predict_batch(grid_mobil[pilih], grid_tahun[pilih], harga_acak)
+    approx = TabelPrediksi(tabel, meta).lookup_batch(grid_mobil[pilih], grid_tahun[pilih], harga_acak)
+    # Penyebut minimal Rp 1 juta agar prediksi yang mendekati nol tidak membesar-besarkan error
+    rel = np.abs(approx - live) / np.maximum(np.abs(live), 1e6)
+    meta['error_relatif'] = {
+        'mean': float(rel.mean()),
+        'p99': float(np.percentile(rel, 99)),
+        'max': float(rel.max()),
+        'sampel': sampel_evaluasi,
+    }
+
+    path = os.path.join(ARTIFACT_DIR, output)
+    np.save(path, tabel)
+    with open(os.path.splitext(path)[0] + '.json', 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    return tabel, meta
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Bangun tabel prediksi (mobil x tahun x knot harga baru).')
+    parser.add_argument('--knot', type=int, default=JUMLAH_KNOT)
+    parser.add_argument('--harga-min', type=float, default=HARGA_MIN)
+    parser.add_argument('--harga-max', type=float, default=HARGA_MAX)
+    args = parser.parse_args()
+
+    mulai = time.perf_counter()
+    tabel, meta = build_tabel(args.knot, args.harga_min, args.harga_max)
+    err = meta['error_relatif']
+    print(f"Selesai! Tabel {tabel.shape} ({tabel.nbytes / 1e6:.1f} MB) disimpan ke '{TABEL_FILE}' "
+          f"dalam {time.perf_counter() - mulai:.1f} detik")
+    print(f"Error relatif terhadap model langsung ({err['sampel']} sampel): "
+          f"mean {err['mean']:.4%}, p99 {err['p99']:.4%}, max {err['max']:.4%}")
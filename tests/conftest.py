@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Modul aplikasi berada di folder utama dan Scraping/ (bukan package), jadi keduanya ditambahkan ke sys.path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'Scraping'))
+sys.path.insert(0, ROOT)
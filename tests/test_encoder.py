@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from encoder import TAHUN_SEKARANG, FeatureEncoder, MobilTidakDikenal
+
+# Urutan kolom sama seperti feature_columns.pkl: Umur_Mobil muncul dua kali
+FEATURE_COLUMNS = ['Umur_Mobil', 'Tahun', 'Harga_Baru', 'Umur_Mobil', 'Mobil_Bekas_Toyota Avanza 1.3 E MPV',
+                   'Mobil_Bekas_Toyota Fortuner 2.4 VRZ SUV', 'Mobil_Bekas_Toyota Yaris 1.5 G Hatchback']
+
+
+def _baseline(mobil, tahun, harga_baru, feature_columns=FEATURE_COLUMNS):
+    # Jalur asli notebook: get_dummies lalu reindex ke feature_columns
+    df = pd.DataFrame({'Mobil_Bekas': mobil, 'Tahun': tahun, 'Harga_Baru': harga_baru})
+    df['Umur_Mobil'] = TAHUN_SEKARANG - df['Tahun']
+    X = pd.get_dummies(df, columns=['Mobil_Bekas']).reindex(columns=feature_columns, fill_value=0)
+    return X.to_numpy(dtype=np.float64)
+
+
+MOBIL = ['Toyota Avanza 1.3 E MPV', 'Toyota Yaris 1.5 G Hatchback', 'Toyota Fortuner 2.4 VRZ SUV',
+         'Toyota Alphard 2.5 G MPV', 'Toyota Avanza 1.3 E MPV']
+TAHUN = [2018, 2021, 2015, 2020, 2010]
+HARGA = [2.3e8, 2.9e8, 5.6e8, 1.1e9, 2.1e8]
+
+
+def test_encode_sama_dengan_get_dummies():
+    encoder = FeatureEncoder(FEATURE_COLUMNS)
+    X, idx = encoder.encode(MOBIL, TAHUN, HARGA)
+    np.testing.assert_array_equal(X, _baseline(MOBIL, TAHUN, HARGA))
+    # Kedua kolom Umur_Mobil terisi
+    np.testing.assert_array_equal(X[:, 0], X[:, 3])
+    assert idx.tolist() == [4, 6, 5, -1, 4]
+
+
+def test_encode_index_dan_densify():
+    encoder = FeatureEncoder(FEATURE_COLUMNS)
+    blok, idx = encoder.encode_index(MOBIL, TAHUN, HARGA)
+    assert blok.shape == (5, 4)
+    np.testing.assert_array_equal(encoder.densify(blok, idx), _baseline(MOBIL, TAHUN, HARGA))
+
+    # Buffer yang dipakai ulang dikosongkan dulu
+    buffer = np.full((8, len(FEATURE_COLUMNS)), 7.0)
+    np.testing.assert_array_equal(encoder.densify(blok, idx, out=buffer), _baseline(MOBIL, TAHUN, HARGA))
+    np.testing.assert_array_equal(encoder.to_sparse(blok, idx).toarray(), _baseline(MOBIL, TAHUN, HARGA))
+
+
+def test_nama_tidak_peka_huruf_besar_dan_spasi():
+    encoder = FeatureEncoder(FEATURE_COLUMNS)
+    variasi = ['toyota avanza 1.3 e mpv', '  TOYOTA  Yaris 1.5 g   Hatchback', 'Toyota Fortuner 2.4 VRZ SUV']
+    X, _ = encoder.encode(variasi, TAHUN[:3], HARGA[:3])
+    np.testing.assert_array_equal(X, _baseline(MOBIL[:3], TAHUN[:3], HARGA[:3]))
+    assert encoder.canonical_name('toyota  yaris 1.5 g hatchback') == 'Toyota Yaris 1.5 G Hatchback'
+
+
+def test_encode_one():
+    encoder = FeatureEncoder(FEATURE_COLUMNS)
+    np.testing.assert_array_equal(encoder.encode_one('toyota fortuner 2.4 vrz suv', 2015, 5.6e8),
+                                  _baseline(['Toyota Fortuner 2.4 VRZ SUV'], [2015], [5.6e8]))
+    with pytest.raises(MobilTidakDikenal):
+        encoder.encode_one('Toyota Alphard 2.5 G MPV', 2020, 1.1e9)
+
+
+def test_feature_columns_asli():
+    from artifacts import load_artifact
+
+    feature_columns = load_artifact('feature_columns.pkl')
+    encoder = FeatureEncoder(feature_columns)
+    mobil = [c[len('Mobil_Bekas_'):] for c in feature_columns[4::37]] + ['Toyota Tidak Ada']
+    rng = np.random.default_rng(0)
+    tahun = rng.integers(2005, 2026, len(mobil))
+    harga = rng.uniform(1e8, 2e9, len(mobil))
+    X, _ = encoder.encode(mobil, tahun, harga)
+    np.testing.assert_array_equal(X, _baseline(mobil, tahun, harga, feature_columns))
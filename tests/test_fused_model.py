@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.preprocessing import MinMaxScaler
+
+from encoder import FeatureEncoder
+from fused_model import FusedPredictor, fuse
+
+FEATURE_COLUMNS = ['Umur_Mobil', 'Tahun', 'Harga_Baru', 'Umur_Mobil'] + [f'Mobil_Bekas_Toyota {i}' for i in range(12)]
+
+
+class _Dense:
+    # Tiruan layer Keras: hanya get_weights/get_config yang dipakai fuse()
+    def __init__(self, W, b, activation, name):
+        self.W, self.b, self.activation, self.name = W, b, activation, name
+
+    def get_weights(self):
+        return [self.W, self.b]
+
+    def get_config(self):
+        return {'activation': self.activation}
+
+
+class _Dropout:
+    name = 'dropout'
+
+    def get_weights(self):
+        return []
+
+    def get_config(self):
+        return {'rate': 0.2}
+
+
+class _Model:
+    def __init__(self, layers):
+        self.layers = layers
+
+
+def _model(rng, ukuran=(len(FEATURE_COLUMNS), 64, 128, 64, 1)):
+    layers = []
+    for i, (masuk, keluar) in enumerate(zip(ukuran, ukuran[1:])):
+        act = 'linear' if i == len(ukuran) - 2 else 'relu'
+        layers.append(_Dense(rng.normal(0, 0.3, (masuk, keluar)).astype(np.float32),
+                             rng.normal(0, 0.1, keluar).astype(np.float32), act, f'dense_{i}'))
+        if act == 'relu':
+            layers.append(_Dropout())
+    return _Model(layers)
+
+
+def _data(rng, n=300):
+    encoder = FeatureEncoder(FEATURE_COLUMNS)
+    mobil = [f'Toyota {i}' for i in rng.integers(0, 12, n)]
+    tahun = rng.integers(2005, 2026, n)
+    harga = rng.uniform(1e8, 2e9, n)
+    blok, idx = encoder.encode_index(mobil, tahun, harga)
+    return encoder, blok, idx, encoder.densify(blok, idx)
+
+
+def _tanpa_fuse(model, scaler_X, scaler_y, X):
+    # Jalur asli: scaler_X -> Dense (Dropout dilewati) -> inverse scaler_y
+    h = scaler_X.transform(X)
+    for layer in model.layers:
+        if not layer.get_weights():
+            continue
+        h = h @ layer.W.astype(np.float64) + layer.b
+        if layer.activation == 'relu':
+            h = np.maximum(h, 0)
+    return scaler_y.inverse_transform(h)[:, 0]
+
+
+@pytest.fixture
+def kasus():
+    rng = np.random.default_rng(7)
+    encoder, blok, idx, X = _data(rng)
+    scaler_X = MinMaxScaler().fit(X)
+    scaler_y = MinMaxScaler().fit(rng.uniform(2e7, 1.5e9, (500, 1)))
+    model = _model(rng)
+    return encoder, blok, idx, X, model, scaler_X, scaler_y
+
+
+def _rel(a, b):
+    return np.max(np.abs(a - b) / np.maximum(np.abs(b), 1.0))
+
+
+def test_predict_sama_dengan_jalur_tanpa_fuse(kasus):
+    encoder, blok, idx, X, model, scaler_X, scaler_y = kasus
+    fused = fuse(model, scaler_X, scaler_y, FEATURE_COLUMNS)
+    ref = _tanpa_fuse(model, scaler_X, scaler_y, X)
+
+    assert len(fused.weights) == 4 and fused.n_features == len(FEATURE_COLUMNS)
+    assert _rel(fused.predict(X), ref) < 1e-9
+    assert _rel(fused.predict(sparse.csr_matrix(X)), ref) < 1e-9
+    assert _rel(fused.predict_index(blok, idx, encoder.posisi_dense), ref) < 1e-9
+
+
+def test_predict_index_mobil_tidak_dikenal(kasus):
+    encoder, blok, idx, X, model, scaler_X, scaler_y = kasus
+    fused = fuse(model, scaler_X, scaler_y)
+    idx = idx.copy()
+    idx[::3] = -1
+    ref = _tanpa_fuse(model, scaler_X, scaler_y, encoder.densify(blok, idx))
+    assert _rel(fused.predict_index(blok, idx, encoder.posisi_dense), ref) < 1e-9
+
+
+def test_simpan_dan_muat(kasus, tmp_path):
+    _, _, _, X, model, scaler_X, scaler_y = kasus
+    fused = fuse(model, scaler_X, scaler_y, FEATURE_COLUMNS)
+    path = str(tmp_path / 'model_fused.npz')
+    fused.save(path)
+    dimuat = FusedPredictor.load(path)
+    assert dimuat.feature_columns == FEATURE_COLUMNS and dimuat.activations == fused.activations
+    np.testing.assert_array_equal(dimuat.predict(X), fused.predict(X))
+
+
+def test_aktivasi_tidak_didukung(kasus):
+    _, _, _, _, model, scaler_X, scaler_y = kasus
+    model.layers[0].activation = 'tanh'
+    with pytest.raises(ValueError):
+        fuse(model, scaler_X, scaler_y)
@@ -0,0 +1,54 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from kolumnar import META_FILE, TabelKolumnar, simpan_kolumnar
+
+
+def _df():
+    return pd.DataFrame({
+        'Mobil_Bekas': ['toyota avanza', 'toyota yaris', None, 'toyota avanza'],
+        'Tahun': [2018, 2020, 2021, 2018],
+        'Harga_Bekas': [1.5e8, 2.1e8, 3.0e8, 1.4e8],
+    })
+
+
+def test_to_pandas_dibangun_sekali_tanpa_salin(tmp_path):
+    folder = str(tmp_path / 'data_mobil')
+    simpan_kolumnar(_df(), folder, 'v1')
+    tabel = TabelKolumnar.load(os.path.join(folder, META_FILE))
+
+    df = tabel.to_pandas()
+    assert tabel.to_pandas() is df
+    assert tabel.to_pandas(['Tahun']) is tabel.to_pandas(('Tahun',))
+    assert np.shares_memory(df['Tahun'].to_numpy(), tabel.kolom('Tahun'))
+    asli = _df()
+    assert list(df.columns) == list(asli.columns)
+    for col in asli.columns:
+        assert df[col].tolist() == asli[col].tolist()
+    assert tabel.distribusi('Tahun').to_dict() == {2018: 2, 2020: 1, 2021: 1}
+
+
+def test_konversi_tidak_menimpa_file_yang_sedang_dipetakan(tmp_path, monkeypatch):
+    import kolumnar
+
+    monkeypatch.setattr(kolumnar, 'ARTIFACT_DIR', str(tmp_path))
+    monkeypatch.setattr(kolumnar, 'SUMBER', {'data_mobil': 'data_mobil.csv'})
+    monkeypatch.setattr(kolumnar, 'artifact_version', lambda nama: str(os.path.getmtime(tmp_path / nama)))
+    sumber = tmp_path / 'data_mobil.csv'
+
+    _df().to_csv(sumber, index=False)
+    folder = kolumnar.konversi('data_mobil')
+    lama = TabelKolumnar.load(os.path.join(folder, META_FILE))
+    tahun_lama = lama.kolom('Tahun')
+
+    baru_df = _df().assign(Tahun=[2000, 2001, 2002, 2003])
+    pd.concat([baru_df, baru_df]).to_csv(sumber, index=False)
+    assert kolumnar.konversi('data_mobil') == folder
+
+    # Array mmap lama tetap utuh, folder baru berisi data baru, tidak ada folder sementara tersisa
+    assert tahun_lama.tolist() == [2018, 2020, 2021, 2018]
+    baru = TabelKolumnar.load(os.path.join(folder, META_FILE))
+    assert len(baru) == 8 and baru.kolom('Tahun')[:4].tolist() == [2000, 2001, 2002, 2003]
+    assert os.listdir(os.path.dirname(folder)) == ['data_mobil']
@@ -0,0 +1,42 @@
+import pandas as pd
+
+from konteks_prompt import KonteksIndex, ekstrak_kriteria, teks_nama
+
+
+def _index():
+    baris = [
+        ('toyota fortuner 2.4 vrz suv', 2021, 320e6),
+        ('toyota fortuner 2.8 gr sport suv', 2023, 1.4e9),
+        ('toyota land cruiser 3.3 300 vx suv', 2022, 2.4e9),
+        ('toyota avanza 1.3 e mpv', 2018, 140e6),
+        ('toyota alphard 2.5 g mpv', 2020, 1.3e9),
+    ]
+    df = pd.DataFrame(baris, columns=['Mobil_Bekas', 'Tahun', 'Harga_Bekas'])
+    df['Harga_Baru'] = df['Harga_Bekas'] * 1.3
+    df['Depresiasi_%'] = 23.0
+    return KonteksIndex(df)
+
+
+def test_tahun_dan_harga_tidak_dicocokkan_dengan_nama():
+    assert teks_nama('Harga 1,5 M Fortuner 2020').split() == ['harga', 'fortuner']
+    assert teks_nama('avanza 1.3 e di bawah 150 juta').split() == ['avanza', '1.3', 'e']
+
+
+def test_harga_dengan_satuan_m_memilih_nama_yang_disebut():
+    index = _index()
+    baris, kriteria = index.cari('harga 1,5 m fortuner', top_k=2)
+    assert kriteria['harga_min'] == 1.2e9 and kriteria['harga_max'] == 1.8e9
+    assert [index.nama[index.codes[i]] for i in baris] == ['toyota fortuner 2.8 gr sport suv',
+                                                          'toyota fortuner 2.4 vrz suv']
+
+
+def test_angka_harga_tidak_cocok_dengan_nama_mobil():
+    index = _index()
+    assert not index.skor_nama('mobil 300 juta').any()
+    baris, _ = index.cari('mobil 300 juta', top_k=1)
+    assert index.nama[index.codes[baris[0]]] == 'toyota fortuner 2.4 vrz suv'
+
+
+def test_ekstrak_kriteria():
+    assert ekstrak_kriteria('avanza di bawah 150 juta tahun 2018 yang paling murah') == {
+        'tahun': [2018], 'harga_min': None, 'harga_max': 150e6, 'urutan': 'naik'}
@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('sklearn')
+
+from artifacts import ARTIFACT_DIR
+from encoder import FeatureEncoder
+from latih_model import DATA_FILE, bagi_data, siapkan_data
+
+
+def _notebook(df):
+    # Potongan notebook (Project_Assignment.ipynb) sebelum training, tanpa scaler
+    from sklearn.model_selection import train_test_split
+
+    df_model = df[['Mobil_Bekas', 'Tahun', 'Harga_Baru', 'Harga_Bekas']].dropna().copy()
+    df_model['Umur_Mobil'] = 2025 - df_model['Tahun']
+    df_model_encoded = pd.get_dummies(df_model, columns=['Mobil_Bekas'], drop_first=False)
+    X = df_model_encoded[['Umur_Mobil'] + [col for col in df_model_encoded.columns if col != 'Harga_Bekas']]
+    y = df_model_encoded['Harga_Bekas']
+    X_train, X_test, y_train, y_test = train_test_split(X.to_numpy(dtype=np.float64), y.to_numpy(),
+                                                        test_size=0.2, random_state=42)
+    return list(X.columns), X_train, X_test, y_train, y_test
+
+
+def _cek_sama_dengan_notebook(df):
+    kolom, X_train, X_test, y_train, y_test = _notebook(df)
+    blok, idx, y, feature_columns = siapkan_data(df)
+    assert feature_columns == kolom
+
+    train_rows, test_rows = bagi_data(len(idx))
+    X = FeatureEncoder(feature_columns).densify(blok, idx)
+    np.testing.assert_array_equal(X[train_rows], X_train)
+    np.testing.assert_array_equal(X[test_rows], X_test)
+    np.testing.assert_array_equal(y[train_rows, 0], y_train)
+    np.testing.assert_array_equal(y[test_rows, 0], y_test)
+    return len(train_rows), len(test_rows)
+
+
+def test_kolom_dan_split_sama_dengan_notebook_data_sintetis():
+    rng = np.random.default_rng(0)
+    nama = ['Toyota Avanza 1.3 E MPV', 'Toyota 86 2.0 Coupe', 'Toyota Yaris 1.5 G Hatchback', 'Toyota Agya 1.2 GR']
+    n = 500
+    df = pd.DataFrame({
+        'Mobil_Bekas': rng.choice(nama, n),
+        'Tahun': rng.integers(2005, 2026, n),
+        'Harga_Bekas': rng.uniform(5e7, 1e9, n).round(-6),
+        'Harga_Baru': rng.uniform(1e8, 2e9, n).round(-6),
+    })
+    df.loc[[3, 77], 'Harga_Baru'] = np.nan
+    assert _cek_sama_dengan_notebook(df) == (398, 100)
+
+
+def test_split_data_asli_sama_dengan_notebook():
+    path = os.path.join(ARTIFACT_DIR, DATA_FILE)
+    if not os.path.exists(path):
+        pytest.skip(f'{DATA_FILE} belum ada (jalankan pengolahan_data.py)')
+    df = pd.read_csv(path)
+    n_train, n_test = _cek_sama_dengan_notebook(df)
+    if len(df[['Mobil_Bekas', 'Tahun', 'Harga_Baru', 'Harga_Bekas']].dropna()) == 26545:
+        # Ukuran X_train/X_test yang tercetak di notebook
+        assert (n_train, n_test) == (21236, 5309)
+
+
+def test_simpan_artefak_hapus_turunan_lama(tmp_path):
+    import joblib
+
+    from latih_model import simpan_artefak
+
+    for nama in ('model_fused.npz', 'tabel_prediksi.npy', 'tabel_prediksi.json', 'scaler_X.pkl'):
+        (tmp_path / nama).write_bytes(b'lama')
+    files, turunan = simpan_artefak({'model': 1}, 'sx', 'sy', ['Umur_Mobil'], output_dir=str(tmp_path), fused=False)
+
+    assert sorted(os.listdir(tmp_path)) == sorted(files)
+    assert turunan == {}
+    assert joblib.load(tmp_path / 'scaler_X.pkl') == 'sx'
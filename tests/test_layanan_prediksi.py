@@ -0,0 +1,83 @@
+import io
+import json
+import os
+
+import pytest
+
+from artifacts import ARTIFACT_DIR
+
+if not os.path.exists(os.path.join(ARTIFACT_DIR, 'data_mobil.csv')):
+    pytest.skip('data_mobil.csv belum ada (jalankan pengolahan_data.py)', allow_module_level=True)
+
+from layanan_prediksi import app  # noqa: E402
+
+AVANZA = 'Toyota Avanza 1.3 E MPV'
+
+
+def _panggil(metode, path, body=None, query=''):
+    data = b'' if body is None else (body if isinstance(body, bytes) else json.dumps(body).encode())
+    environ = {'REQUEST_METHOD': metode, 'PATH_INFO': path, 'QUERY_STRING': query,
+               'CONTENT_LENGTH': str(len(data)), 'wsgi.input': io.BytesIO(data)}
+    status = []
+    hasil = app(environ, lambda s, headers: status.append(s))
+    return int(status[0].split()[0]), json.loads(b''.join(hasil))
+
+
+@pytest.mark.parametrize('tahun, harga_baru', [(2020, 250e6), (2018, 312_345_678), (1999, 250e6), (2020, 9e9)])
+def test_satu_dan_batch_memberi_hasil_sama(tahun, harga_baru):
+    # Termasuk input di luar jangkauan tabel_prediksi (tahun 1999, harga 9 miliar) yang dihitung model
+    status, satu = _panggil('POST', '/prediksi', {'mobil': AVANZA, 'tahun': tahun, 'harga_baru': harga_baru})
+    assert status == 200
+    status, batch = _panggil('POST', '/prediksi/batch',
+                             {'data': [{'mobil': AVANZA, 'tahun': tahun, 'harga_baru': harga_baru}] * 2})
+    assert status == 200
+    # Jalur sama; selisih hanya pembulatan floating point BLAS karena ukuran batch berbeda
+    assert batch['harga_bekas'] == pytest.approx([satu['harga_bekas']] * 2, rel=1e-12)
+
+
+@pytest.mark.parametrize('harga_baru', ['NaN', 'Infinity', '-Infinity'])
+def test_harga_baru_tidak_hingga_ditolak(harga_baru):
+    body = ('{"mobil": "%s", "tahun": 2020, "harga_baru": %s}' % (AVANZA, harga_baru)).encode()
+    status, hasil = _panggil('POST', '/prediksi', body)
+    assert status == 400 and 'harga_baru' in hasil['error']
+    body = ('{"data": [{"mobil": "%s", "tahun": 2020, "harga_baru": %s}]}' % (AVANZA, harga_baru)).encode()
+    status, _ = _panggil('POST', '/prediksi/batch', body)
+    assert status == 400
+
+
+def test_mobil_tidak_dikenal():
+    status, _ = _panggil('POST', '/prediksi', {'mobil': 'Toyota Tidak Ada', 'tahun': 2020, 'harga_baru': 3e8})
+    assert status == 422
+    status, hasil = _panggil('POST', '/prediksi/batch', {'data': [
+        {'mobil': 'Toyota Tidak Ada', 'tahun': 2020, 'harga_baru': 3e8},
+        {'mobil': AVANZA, 'tahun': 2020, 'harga_baru': 3e8},
+    ]})
+    assert status == 200
+    assert hasil['harga_bekas'][0] is None and hasil['harga_bekas'][1] > 0
+
+
+def test_input_tidak_valid():
+    assert _panggil('POST', '/prediksi', {'mobil': AVANZA})[0] == 400
+    assert _panggil('POST', '/prediksi', {'mobil': AVANZA, 'tahun': 'baru'})[0] == 400
+    assert _panggil('POST', '/prediksi', b'bukan json')[0] == 400
+    assert _panggil('GET', '/prediksi')[0] == 405
+    assert _panggil('GET', '/tidak-ada')[0] == 404
+
+
+def test_tanpa_statistik_harga_baru_wajib_diisi(monkeypatch):
+    import layanan_prediksi
+
+    statistik = layanan_prediksi.load_statistik()
+
+    class _TanpaAvanza:
+        def mobil(self, mobil):
+            return None if mobil == AVANZA else statistik.mobil(mobil)
+
+    monkeypatch.setattr(layanan_prediksi, 'load_statistik', _TanpaAvanza)
+    status, hasil = _panggil('POST', '/prediksi', {'mobil': AVANZA, 'tahun': 2020})
+    assert status == 400 and 'harga_baru' in hasil['error']
+    status, _ = _panggil('POST', '/prediksi/batch', {'data': [{'mobil': AVANZA, 'tahun': 2020}]})
+    assert status == 400
+    # Dengan harga_baru tetap bisa diprediksi; mobil tidak dikenal tetap 422
+    assert _panggil('POST', '/prediksi', {'mobil': AVANZA, 'tahun': 2020, 'harga_baru': 3e8})[0] == 200
+    assert _panggil('POST', '/prediksi', {'mobil': 'Toyota Tidak Ada', 'tahun': 2020})[0] == 422
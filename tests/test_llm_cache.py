@@ -0,0 +1,87 @@
+import sqlite3
+import threading
+
+from llm_cache import LLMCache
+
+
+def _jalankan_bersamaan(fungsi, jumlah):
+    hasil = [None] * jumlah
+    error = [None] * jumlah
+
+    def pekerja(i):
+        try:
+            hasil[i] = fungsi()
+        except Exception as e:
+            error[i] = e
+
+    semua = [threading.Thread(target=pekerja, args=(i,)) for i in range(jumlah)]
+    for t in semua:
+        t.start()
+    for t in semua:
+        t.join(10)
+    assert not any(t.is_alive() for t in semua)
+    return hasil, error
+
+
+def test_request_identik_digabung():
+    cache = LLMCache(':memory:')
+    panggilan = []
+
+    def compute():
+        panggilan.append(1)
+        threading.Event().wait(0.2)
+        return 'jawaban'
+
+    hasil, error = _jalankan_bersamaan(lambda: cache.get_or_compute('k', compute), 5)
+    assert hasil == ['jawaban'] * 5 and error == [None] * 5
+    assert len(panggilan) == 1
+    assert cache.get('k') == 'jawaban'
+
+
+def test_gagal_menyimpan_tidak_menahan_pemanggil_lain(monkeypatch):
+    cache = LLMCache(':memory:')
+    def set_gagal(key, value):
+        raise sqlite3.OperationalError('database is locked')
+
+    monkeypatch.setattr(cache, 'set', set_gagal)
+
+    def compute():
+        threading.Event().wait(0.2)
+        return 'jawaban'
+
+    hasil, error = _jalankan_bersamaan(lambda: cache.get_or_compute('k', compute), 3)
+    assert hasil == ['jawaban'] * 3 and error == [None] * 3
+    assert not cache._proses
+
+
+def test_error_pemimpin_diteruskan_ke_pengikut():
+    cache = LLMCache(':memory:')
+
+    def compute():
+        threading.Event().wait(0.2)
+        raise RuntimeError('upstream 503')
+
+    hasil, error = _jalankan_bersamaan(lambda: cache.get_or_compute('k', compute), 3)
+    assert all(isinstance(e, RuntimeError) for e in error)
+    assert cache.get('k') is None
+
+
+def test_pengikut_tidak_menunggu_melewati_batas():
+    cache = LLMCache(':memory:', tunggu=0.05)
+    proses, pemimpin = cache._mulai('k')
+    assert pemimpin
+
+    assert cache.get_or_compute('k', lambda: 'sendiri') == 'sendiri'
+    assert list(cache.stream_or_compute('k2', lambda: iter(['a', 'b']))) == ['a', 'b']
+    cache._akhiri('k', proses, 'pemimpin')
+    assert cache.get('k') == 'pemimpin'
+
+
+def test_stream_dibatalkan_tidak_disimpan():
+    cache = LLMCache(':memory:')
+    gen = cache.stream_or_compute('k', lambda: iter(['a', 'b', 'c']))
+    assert next(gen) == 'a'
+    gen.close()
+    assert cache.get('k') is None
+    assert list(cache.stream_or_compute('k', lambda: iter(['x', 'y']))) == ['x', 'y']
+    assert cache.get('k') == 'xy'
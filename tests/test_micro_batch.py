@@ -0,0 +1,96 @@
+import threading
+import time
+from concurrent.futures import TimeoutError
+
+import numpy as np
+import pytest
+
+from micro_batch import MicroBatcher
+
+
+def _bersamaan(batcher, input_):
+    hasil = [None] * len(input_)
+
+    def pekerja(i):
+        try:
+            hasil[i] = batcher.predict(*input_[i])
+        except Exception as e:
+            hasil[i] = e
+
+    semua = [threading.Thread(target=pekerja, args=(i,)) for i in range(len(input_))]
+    for t in semua:
+        t.start()
+    for t in semua:
+        t.join(10)
+    return hasil
+
+
+def test_request_tunggal_tidak_menunggu_jendela():
+    batcher = MicroBatcher(lambda m, t, h: t + h, max_wait=1.0)
+    mulai = time.perf_counter()
+    assert batcher.predict('Avanza', 2020, 5) == 2025
+    assert time.perf_counter() - mulai < 0.5
+
+
+def test_hasil_dibagikan_sesuai_urutan():
+    batcher = MicroBatcher(lambda m, t, h: t * 1000 + h, max_wait=0.01)
+    input_ = [('Avanza', 2000 + i, i) for i in range(40)]
+    assert _bersamaan(batcher, input_) == [t * 1000 + h for _, t, h in input_]
+    assert batcher.stats()['baris'] == 40
+
+
+def test_baris_tidak_valid_ditolak_sebelum_antrian():
+    panggilan = []
+
+    def proses(m, t, h):
+        panggilan.append(len(m))
+        return t
+
+    batcher = MicroBatcher(proses)
+    with pytest.raises(ValueError):
+        batcher.submit('Avanza', 'dua ribu', 1e8)
+    with pytest.raises(TypeError):
+        batcher.submit('Avanza', None, 1e8)
+    assert panggilan == []
+    assert batcher.predict('Avanza', 2020, 1e8) == 2020
+
+
+def test_error_batch_diteruskan_ke_semua_pemanggil():
+    def proses(m, t, h):
+        raise RuntimeError('model gagal')
+
+    hasil = _bersamaan(MicroBatcher(proses, max_wait=0.01), [('Avanza', 2020, 1)] * 5)
+    assert all(isinstance(h, RuntimeError) for h in hasil)
+
+
+def test_hasil_kurang_tidak_menggantung():
+    # Batch berisi satu baris mendapat hasil, batch yang lebih besar mendapat RuntimeError; tidak ada yang None
+    hasil = _bersamaan(MicroBatcher(lambda m, t, h: np.zeros(1), max_wait=0.05), [('Avanza', 2020, 1)] * 4)
+    assert all(h == 0.0 or isinstance(h, RuntimeError) for h in hasil)
+
+
+@pytest.mark.filterwarnings('ignore::pytest.PytestUnhandledThreadExceptionWarning')
+def test_base_exception_menyelesaikan_future_dan_thread_dimulai_ulang():
+    jumlah = []
+
+    def proses(m, t, h):
+        jumlah.append(1)
+        if len(jumlah) == 1:
+            raise SystemExit
+        return t
+
+    batcher = MicroBatcher(proses)
+    future = batcher.submit('Avanza', 2020, 1)
+    thread = batcher._thread
+    with pytest.raises(RuntimeError):
+        future.result(1)
+    thread.join(1)
+    assert batcher.predict('Avanza', 2021, 1) == 2021
+
+
+def test_timeout_hasil():
+    lepas = threading.Event()
+    batcher = MicroBatcher(lambda m, t, h: lepas.wait(5) and t, timeout=0.05)
+    with pytest.raises(TimeoutError):
+        batcher.predict('Avanza', 2020, 1)
+    lepas.set()
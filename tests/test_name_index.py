@@ -0,0 +1,41 @@
+import os
+
+import joblib
+import pytest
+from fuzzywuzzy import process
+
+from artifacts import ARTIFACT_DIR
+from name_index import NameIndex
+
+NAMA = joblib.load(os.path.join(ARTIFACT_DIR, 'nama_mobil_list.pkl'))
+
+QUERY = [
+    # Merek saja / query pendek: banyak kandidat dengan overlap trigram yang sama
+    'toyota', 'Toyota ', 'TOYOTA', 'a', 'ab', 'g', 'mpv', 'suv', '1.5', 'trd',
+    # Model dan varian
+    'avanza', 'innova', 'fortuner', 'yaris', 'camry', 'alphard', 'kijang', 'land cruiser',
+    'innova venturer', 'avanza 1.3 g', 'fortuner vrz 2020', 'yaris trd sportivo', 'toyota c',
+    # Salah ketik
+    'avansa', 'inova reborn', 'kjang innova',
+]
+
+
+@pytest.fixture(scope='module')
+def index():
+    return NameIndex(NAMA)
+
+
+@pytest.mark.parametrize('query', QUERY)
+def test_sama_dengan_extract_one(index, query):
+    assert index.extract_one(query) == process.extractOne(query, NAMA)
+
+
+@pytest.mark.parametrize('query', NAMA[::40])
+def test_nama_lengkap_dan_potongannya(index, query):
+    for q in (query, query.lower(), query[:8]):
+        assert index.extract_one(q) == process.extractOne(q, NAMA)
+
+
+def test_score_cutoff(index):
+    assert index.extract_one('zzzz qqqq', score_cutoff=80) is None
+    assert process.extractOne('zzzz qqqq', NAMA, score_cutoff=80) is None
@@ -0,0 +1,134 @@
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from openrouter import OpenRouterClient, OpenRouterError, pesan
+
+
+class MockLLM(ThreadingHTTPServer):
+    # Server chat completions tiruan: status per request diambil dari daftar `gagal`
+    # (sisanya 200), setiap request dicatat bersama port klien (untuk cek keep-alive)
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.gagal = []
+        self.events = None
+        self.requests = []
+
+    @property
+    def base_url(self):
+        return f'http://127.0.0.1:{self.server_port}/api/v1'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _kirim(self, status, body, content_type='application/json', headers=()):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for k, v in headers:
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        data = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        server.requests.append({'path': self.path, 'data': data, 'port': self.client_address[1],
+                                'auth': self.headers.get('Authorization')})
+        if server.gagal:
+            self._kirim(server.gagal.pop(0), b'{"error": "sibuk"}', headers=[('Retry-After', '0')])
+            return
+        if not data.get('stream'):
+            jawaban = {'choices': [{'message': {'content': 'Halo ' + data['messages'][-1]['content']}}]}
+            self._kirim(200, json.dumps(jawaban).encode())
+            return
+        events = server.events or [{'choices': [{'delta': {'content': k}}]} for k in ('Ha', 'lo', '!')]
+        baris = [': OPENROUTER PROCESSING', '', 'data: bukan json', '']
+        for event in events:
+            baris += ['data: ' + json.dumps(event), '']
+        baris += ['data: [DONE]', '', ': sisa setelah DONE', '']
+        self._kirim(200, '\n'.join(baris).encode(), 'text/event-stream')
+
+
+@pytest.fixture
+def server():
+    server = MockLLM()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(server, **kwargs):
+    return OpenRouterClient('kunci-uji', base_url=server.base_url, model='mock', backoff=0, **kwargs)
+
+
+def test_chat(server):
+    assert _client(server).chat(pesan('sistem', 'dunia')) == 'Halo dunia'
+    req = server.requests[0]
+    assert req['path'] == '/api/v1/chat/completions'
+    assert req['auth'] == 'Bearer kunci-uji'
+    assert req['data']['model'] == 'mock' and 'stream' not in req['data']
+
+
+def test_chat_dicoba_ulang_untuk_429_dan_5xx(server):
+    server.gagal = [429, 503, 500]
+    assert _client(server, max_retries=3).chat(pesan('s', 'x')) == 'Halo x'
+    assert len(server.requests) == 4
+
+
+def test_chat_gagal_setelah_batas_retry(server):
+    server.gagal = [503] * 5
+    with pytest.raises(OpenRouterError, match='503'):
+        _client(server, max_retries=2).chat(pesan('s', 'x'))
+    assert len(server.requests) == 3
+
+
+def test_status_lain_tidak_dicoba_ulang(server):
+    server.gagal = [401]
+    with pytest.raises(OpenRouterError, match='401'):
+        _client(server).chat(pesan('s', 'x'))
+    assert len(server.requests) == 1
+
+
+def test_gagal_koneksi():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    client = OpenRouterClient('k', base_url=f'http://127.0.0.1:{port}/v1', max_retries=1, backoff=0)
+    with pytest.raises(OpenRouterError, match='Gagal menghubungi'):
+        client.chat(pesan('s', 'x'))
+
+
+def test_stream_dan_koneksi_dipakai_ulang(server):
+    client = _client(server)
+    assert list(client.stream(pesan('s', 'x'))) == ['Ha', 'lo', '!']
+    assert list(client.stream(pesan('s', 'y'))) == ['Ha', 'lo', '!']
+    assert server.requests[0]['data']['stream'] is True
+    # Body dibaca sampai habis setelah [DONE], jadi request kedua memakai koneksi yang sama
+    assert server.requests[0]['port'] == server.requests[1]['port']
+
+
+def test_stream_dicoba_ulang_sebelum_mulai(server):
+    server.gagal = [429]
+    assert ''.join(_client(server).stream(pesan('s', 'x'))) == 'Halo!'
+    assert len(server.requests) == 2
+
+
+def test_stream_event_error(server):
+    server.events = [{'choices': [{'delta': {'content': 'Ha'}}]}, {'error': {'message': 'kuota habis'}}]
+    potongan = []
+    with pytest.raises(OpenRouterError, match='kuota habis'):
+        for teks in _client(server).stream(pesan('s', 'x')):
+            potongan.append(teks)
+    assert potongan == ['Ha']
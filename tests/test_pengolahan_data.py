@@ -0,0 +1,22 @@
+import pandas as pd
+
+from pengolahan_data import normalisasi_listing
+
+
+def test_listing_dihapus_tidak_ikut_diolah():
+    df = pd.DataFrame({
+        'Judul': ['2020 Toyota Avanza 1.3 E MPV - Murah', '2019 Toyota Yaris 1.5 G Hatchback', '2018 Toyota Agya 1.2 G'],
+        'Harga': ['Rp 180.000.000', 'Rp 200.000.000', 'Rp 120.000.000'],
+        'Tahun': ['2020', '2019', 'N/A'],
+        'Link': ['https://a/1', 'https://a/2', 'https://a/3'],
+        'Status': ['aktif', 'dihapus', 'aktif'],
+    })
+    hasil = normalisasi_listing(df)
+    assert hasil['Link'].tolist() == ['https://a/1', 'https://a/3']
+    assert hasil['Mobil'].tolist() == ['Toyota Avanza 1.3 E MPV', 'Toyota Agya 1.2 G']
+    assert hasil['Tahun'].tolist() == [2020, 2018]
+
+
+def test_tanpa_kolom_status_semua_listing_dipakai():
+    df = pd.DataFrame({'Judul': ['2020 Toyota Avanza'], 'Harga': ['Rp 1'], 'Tahun': ['2020'], 'Link': ['N/A']})
+    assert len(normalisasi_listing(df)) == 1
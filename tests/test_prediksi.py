@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from encoder import get_encoder
+from prediksi import KOLOM_HASIL, predict_batch, predict_csv, predict_one
+from tabel_prediksi import load_tabel
+
+
+def _inventaris():
+    encoder = get_encoder()
+    nama = list(encoder.nama_asli.values())
+    rng = np.random.default_rng(3)
+    n = 50
+    return pd.DataFrame({
+        'Mobil_Bekas': [nama[k] for k in rng.integers(0, len(nama), n - 1)] + ['Toyota Tidak Ada'],
+        'Tahun': rng.integers(2000, 2026, n),
+        # Sebagian di luar knot tabel agar jalur model juga terpakai
+        'Harga_Baru': rng.uniform(5e7, 6e9, n),
+    })
+
+
+def test_csv_sama_dengan_predict_one(tmp_path):
+    if load_tabel() is None:
+        pytest.skip('tabel_prediksi.npy belum dibangun untuk model saat ini')
+    df = _inventaris()
+    df.to_csv(tmp_path / 'inventaris.csv', index=False)
+
+    total, tidak_dikenal = predict_csv(str(tmp_path / 'inventaris.csv'), str(tmp_path / 'hasil.csv'), chunk_size=16)
+    hasil = pd.read_csv(tmp_path / 'hasil.csv')[KOLOM_HASIL]
+    assert (total, tidak_dikenal) == (50, 1) and np.isnan(hasil.iloc[-1])
+    for row, harga in zip(df.iloc[:-1].itertuples(), hasil):
+        assert harga == pytest.approx(predict_one(row.Mobil_Bekas, row.Tahun, row.Harga_Baru), rel=1e-12)
+
+
+def test_csv_tanpa_tabel_memakai_model_langsung(tmp_path):
+    df = _inventaris()
+    df.to_csv(tmp_path / 'inventaris.csv', index=False)
+    predict_csv(str(tmp_path / 'inventaris.csv'), str(tmp_path / 'hasil.csv'), gunakan_tabel=False)
+    hasil = pd.read_csv(tmp_path / 'hasil.csv')[KOLOM_HASIL].to_numpy()
+    np.testing.assert_allclose(hasil, predict_batch(df['Mobil_Bekas'], df['Tahun'], df['Harga_Baru']), rtol=1e-12)
+
+
+def test_muat_model_tanpa_fused_memuat_model_keras(monkeypatch):
+    import prediksi
+
+    dimuat = []
+    monkeypatch.setattr(prediksi, '_fused_predictor', lambda: None)
+    monkeypatch.setattr(prediksi, 'load_artifact', dimuat.append)
+    prediksi.muat_model()
+    assert dimuat == ['model_prediksi_harga.pkl', 'scaler_X.pkl', 'scaler_y.pkl']
@@ -0,0 +1,187 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+import scraper
+
+ARTIKEL = ('<article {atribut}><h2 class="listing__title"><a href="https://www.mobil123.com/dijual/{i}">'
+           '{tahun} Toyota Avanza 1.3 E MPV - Mulus</a></h2><div class="listing__price">Rp {harga}</div></article>')
+
+
+def halaman(jumlah, mulai=0, atribut='class="listing"'):
+    artikel = ''.join(ARTIKEL.format(atribut=atribut, i=mulai + i, tahun=2015 + i % 10, harga='150.000.000')
+                      for i in range(jumlah))
+    return f'<html><body><div class="hasil">{artikel}</div></body></html>'
+
+
+@pytest.mark.parametrize('atribut', ['class="listing"', "class='card listing'", 'class=listing',
+                                     'id=a class = listing data-x=1'])
+def test_listing_dengan_atribut_class_apa_pun_diparse(atribut):
+    rows = scraper.parse_listing(halaman(2, atribut=atribut))
+    assert [r['Link'] for r in rows] == ['https://www.mobil123.com/dijual/0', 'https://www.mobil123.com/dijual/1']
+    assert rows[0] == {'Judul': '2015 Toyota Avanza 1.3 E MPV - Mulus', 'Harga': 'Rp 150.000.000',
+                       'Tahun': '2015', 'Link': 'https://www.mobil123.com/dijual/0'}
+
+
+@pytest.mark.parametrize('atribut', ['class="my-listing"', 'class="listing__title"', 'data-listing="1"'])
+def test_halaman_tanpa_listing(atribut):
+    assert scraper.parse_listing(halaman(2, atribut=atribut)) == []
+
+
+def test_lxml_dan_bs4_sama():
+    html = halaman(5, atribut='class=listing')
+    assert scraper._parse_bs4(html) == scraper.parse_listing(html)
+
+
+class _SitusTersimpan(ThreadingHTTPServer):
+    # Menyajikan halaman HTML tersimpan (<folder>/<n>.html untuk ?page_number=n). `gagal` berisi
+    # jumlah respons 503 yang masih harus dikirim per halaman (None = selalu gagal), `kosong` sama
+    # tetapi untuk respons 200 tanpa listing (seperti browser yang timeout menunggu selector).
+    daemon_threads = True
+
+    def __init__(self, folder):
+        super().__init__(('127.0.0.1', 0), _HandlerSitus)
+        self.folder = folder
+        self.gagal = {}
+        self.kosong = {}
+        self.diminta = []
+
+    @property
+    def base_url(self):
+        return f'http://127.0.0.1:{self.server_port}/mobil-dijual/toyota?page_number='
+
+
+class _HandlerSitus(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        page = int(parse_qs(urlparse(self.path).query)['page_number'][0])
+        server.diminta.append(page)
+        sisa = server.gagal.get(page, 0)
+        kosong = server.kosong.get(page, 0)
+        if sisa is None or sisa > 0:
+            if sisa:
+                server.gagal[page] = sisa - 1
+            status, body = 503, b'sibuk'
+        elif kosong is None or kosong > 0:
+            if kosong:
+                server.kosong[page] = kosong - 1
+            status, body = 200, b'<html><body>memuat...</body></html>'
+        else:
+            path = os.path.join(server.folder, f'{page}.html')
+            status = 200
+            body = open(path, 'rb').read() if os.path.exists(path) else b'<html><body>kosong</body></html>'
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def situs(tmp_path):
+    folder = tmp_path / 'situs'
+    folder.mkdir()
+    for page in range(1, 7):
+        (folder / f'{page}.html').write_text(halaman(3, mulai=page * 100), encoding='utf-8')
+    server = _SitusTersimpan(str(folder))
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _crawl(situs, output, **kwargs):
+    return scraper.crawl(situs.base_url, 6, str(output), workers=3, max_retries=3, backoff=0,
+                         fetcher_factory=scraper.HTTPFetcher, batch_rows=4, **kwargs)
+
+
+def _link_halaman(df):
+    return sorted({int(link.rsplit('/', 1)[1]) // 100 for link in df['Link']})
+
+
+def test_crawl_mencoba_ulang_halaman_yang_gagal_sementara(situs, tmp_path):
+    situs.gagal = {2: 1, 5: 2}
+    df, gagal = _crawl(situs, tmp_path / 'hasil.csv')
+
+    assert gagal == {}
+    assert len(df) == 18 and _link_halaman(df) == [1, 2, 3, 4, 5, 6]
+    assert situs.diminta.count(2) == 2 and situs.diminta.count(5) == 3
+    # Urutan hasil sama dengan scraping berurutan per halaman
+    assert df['Link'].tolist() == [f'https://www.mobil123.com/dijual/{p * 100 + i}' for p in range(1, 7) for i in range(3)]
+    # Crawl selesai tanpa gagal: checkpoint dan chunk dibersihkan
+    assert sorted(os.listdir(tmp_path)) == ['hasil.csv', 'situs']
+
+
+def test_crawl_dilanjutkan_dari_checkpoint(situs, tmp_path):
+    output = tmp_path / 'hasil.csv'
+    situs.gagal = {4: None}
+    df, gagal = _crawl(situs, output)
+
+    assert sorted(gagal) == [4]
+    assert _link_halaman(df) == [1, 2, 3, 5, 6]
+    assert situs.diminta.count(4) == 3
+    assert os.path.exists(str(output) + '.checkpoint.jsonl')
+
+    # Run berikutnya hanya mengambil halaman yang belum berhasil
+    situs.gagal = {}
+    situs.diminta = []
+    df, gagal = _crawl(situs, output)
+    assert gagal == {}
+    assert situs.diminta == [4]
+    assert len(df) == 18 and _link_halaman(df) == [1, 2, 3, 4, 5, 6]
+    assert pd.read_csv(output)['Link'].tolist() == df['Link'].tolist()
+    assert not os.path.exists(str(output) + '.checkpoint.jsonl')
+
+
+def test_halaman_kosong_dicoba_ulang_dan_tidak_masuk_checkpoint(situs, tmp_path):
+    output = tmp_path / 'hasil.csv'
+    situs.kosong = {3: 1, 4: None}
+    df, gagal = _crawl(situs, output)
+
+    assert sorted(gagal) == [4] and isinstance(gagal[4], scraper.HalamanKosong)
+    assert situs.diminta.count(3) == 2 and situs.diminta.count(4) == 3
+    assert _link_halaman(df) == [1, 2, 3, 5, 6]
+
+    # Halaman 4 tidak dianggap selesai, jadi diambil lagi pada run berikutnya
+    situs.kosong = {}
+    situs.diminta = []
+    df, gagal = _crawl(situs, output)
+    assert gagal == {} and situs.diminta == [4]
+    assert len(df) == 18 and _link_halaman(df) == [1, 2, 3, 4, 5, 6]
+
+
+def test_halaman_terakhir_boleh_kosong(situs, tmp_path):
+    situs.kosong = {6: None}
+    df, gagal = _crawl(situs, tmp_path / 'hasil.csv')
+    assert gagal == {} and situs.diminta.count(6) == 1
+    assert _link_halaman(df) == [1, 2, 3, 4, 5]
+
+
+def test_inkremental_harga_na_tidak_dianggap_berubah(situs, tmp_path):
+    # Listing tanpa harga tersimpan sebagai "N/A"; run berikutnya tidak boleh menganggapnya berubah
+    for page in range(1, 7):
+        html = halaman(3, mulai=page * 100).replace('<div class="listing__price">Rp 150.000.000</div>', '')
+        (tmp_path / 'situs' / f'{page}.html').write_text(html, encoding='utf-8')
+    output = str(tmp_path / 'hasil.csv')
+
+    def jalankan():
+        return scraper.crawl_incremental(situs.base_url, 6, output, workers=3, backoff=0,
+                                         fetcher_factory=scraper.HTTPFetcher)
+
+    state, ringkasan = jalankan()
+    assert ringkasan['baru'] == 18 and (state['Harga'] == 'N/A').all()
+
+    state, ringkasan = jalankan()
+    assert ringkasan['baru'] == 0 and ringkasan['berubah'] == 0
+    assert (state['Harga'] == 'N/A').all() and (state['Status'] == 'aktif').all()
+    assert (pd.read_csv(output, dtype=str, keep_default_na=False)['Harga'] == 'N/A').all()
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from tabel_prediksi import TabelPrediksi
+
+MOBIL = ['Toyota Avanza 1.3 E MPV', 'Toyota Fortuner 2.4 VRZ SUV']
+TAHUN_MIN, TAHUN_MAX = 2010, 2020
+KNOTS = np.geomspace(1e8, 5e9, 64)
+
+
+def _harga(i, tahun, harga_baru):
+    # Fungsi mulus (cekung) terhadap harga baru, jadi interpolasi linear punya error yang bisa dihitung
+    return (0.5 + 0.1 * i) * harga_baru ** 0.9 * 0.97 ** (2025 - np.asarray(tahun))
+
+
+def _tabel():
+    tahun = np.arange(TAHUN_MIN, TAHUN_MAX + 1)
+    tabel = np.array([[_harga(i, t, KNOTS) for t in tahun] for i in range(len(MOBIL))])
+    meta = {'mobil': MOBIL, 'tahun_min': TAHUN_MIN, 'tahun_max': TAHUN_MAX, 'knots': KNOTS.tolist()}
+    return TabelPrediksi(tabel, meta)
+
+
+def test_nilai_di_knot_tepat():
+    tabel = _tabel()
+    for k in (0, 17, 63):
+        assert tabel.lookup(MOBIL[1], 2015, KNOTS[k]) == pytest.approx(_harga(1, 2015, KNOTS[k]), rel=1e-12)
+
+
+def test_error_interpolasi_dalam_batas():
+    tabel = _tabel()
+    rng = np.random.default_rng(0)
+    n = 5000
+    i = rng.integers(0, len(MOBIL), n)
+    tahun = rng.integers(TAHUN_MIN, TAHUN_MAX + 1, n)
+    harga_baru = np.exp(rng.uniform(np.log(KNOTS[0]), np.log(KNOTS[-1]), n))
+
+    hasil = tabel.lookup_batch([MOBIL[k] for k in i], tahun, harga_baru)
+    ref = _harga(i, tahun, harga_baru)
+    # Batas error interpolasi linear: max|f''| * h^2 / 8 per interval knot
+    j = np.searchsorted(KNOTS, harga_baru, side='right') - 1
+    h = KNOTS[j + 1] - KNOTS[j]
+    f2 = np.abs(_harga(i, tahun, 1.0)) * 0.9 * 0.1 * KNOTS[j] ** -1.1
+    assert np.all(np.abs(hasil - ref) <= f2 * h ** 2 / 8 * (1 + 1e-9))
+    assert np.max(np.abs(hasil - ref) / ref) < 1e-3
+
+    # lookup satu baris sama dengan versi batch
+    for k in range(20):
+        assert tabel.lookup(MOBIL[i[k]], tahun[k], harga_baru[k]) == pytest.approx(hasil[k], rel=1e-12)
+
+
+def test_di_luar_jangkauan_kembali_ke_model():
+    tabel = _tabel()
+    kasus = [
+        ('Toyota Alphard 2.5 G MPV', 2015, 1e9),   # mobil tidak ada di tabel
+        (MOBIL[0], TAHUN_MIN - 1, 1e9),             # tahun di luar jangkauan
+        (MOBIL[0], TAHUN_MAX + 1, 1e9),
+        (MOBIL[0], 2015, KNOTS[0] * 0.99),          # harga di luar knot
+        (MOBIL[0], 2015, KNOTS[-1] * 1.01),
+    ]
+    for mobil, tahun, harga in kasus:
+        assert tabel.lookup(mobil, tahun, harga) is None
+    hasil = tabel.lookup_batch(*zip(*kasus))
+    assert np.isnan(hasil).all()
+
+    # Nama tidak peka huruf besar/spasi
+    assert tabel.lookup(' toyota  avanza 1.3 e mpv', 2015, 3e8) == tabel.lookup(MOBIL[0], 2015, 3e8)
+
+
+def test_tabel_asli_mendekati_model():
+    from prediksi import predict_batch
+    from tabel_prediksi import load_tabel
+
+    tabel = load_tabel()
+    if tabel is None:
+        pytest.skip('tabel_prediksi.npy belum dibangun untuk model saat ini')
+    rng = np.random.default_rng(1)
+    n = 2000
+    mobil = [tabel.meta['mobil'][k] for k in rng.integers(0, len(tabel.meta['mobil']), n)]
+    tahun = rng.integers(tabel.tahun_min, tabel.tahun_max + 1, n)
+    harga_baru = np.exp(rng.uniform(np.log(tabel.knots[0]), np.log(tabel.knots[-1]), n))
+
+    approx = tabel.lookup_batch(mobil, tahun, harga_baru)
+    live = predict_batch(mobil, tahun, harga_baru)
+    rel = np.abs(approx - live) / np.maximum(np.abs(live), 1e6)
+    # Error yang dicatat build_tabel (sampel 20000) berlaku juga untuk sampel lain
+    err = tabel.meta['error_relatif']
+    assert np.percentile(rel, 99) <= 2 * err['p99'] and rel.max() <= 2 * err['max']